@@ -0,0 +1,280 @@
+"""Stores load-test results per deployment target and compares runs.
+
+Results are the JSON records written by ``loadgen.py --save``. They live under
+``benchmarks/<target>/`` (or ``$A2A_BENCH_DIR``), one file per run, so
+comparisons work offline. Targets name where the agent ran: ``cloudrun``,
+``aca``, ``aci``, ``lightsail`` or ``local``.
+
+``compare`` runs a one-sided Mann-Whitney U test on the two latency
+histograms. It reports a regression when the new run is significantly slower
+(p below ``--alpha``) and its median or p99 grew by more than
+``--threshold`` percent. Large runs make tiny shifts significant, and the
+threshold keeps those from being flagged. A throughput drop beyond the
+threshold is also reported. The command exits with status 1 on any
+regression, so CI can gate on it.
+
+Usage:
+    python bench.py list [--target cloudrun]
+    python bench.py compare cloudrun:previous cloudrun:latest
+    python bench.py compare local:latest cloudrun:latest --threshold 10
+    python bench.py compare old.json new.json
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Iterable, Optional
+
+from hdrhist import Histogram
+
+SCHEMA_VERSION = 1
+TARGETS = ("cloudrun", "aca", "aci", "lightsail", "local")
+
+
+def bench_dir() -> str:
+    return os.environ.get("A2A_BENCH_DIR", "benchmarks")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_result(
+    result: dict[str, Any],
+    target: str,
+    label: Optional[str] = None,
+    directory: Optional[str] = None,
+) -> str:
+    """Adds run metadata to a ``loadgen`` result and stores it.
+
+    Returns:
+        str: The path of the stored result.
+    """
+    recorded_at = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    record = dict(
+        result,
+        schema=SCHEMA_VERSION,
+        target=target,
+        label=label,
+        revision=git_revision(),
+        recorded_at=recorded_at,
+    )
+    path = os.path.join(directory or bench_dir(), target)
+    os.makedirs(path, exist_ok=True)
+    name = f"{recorded_at}-{label}.json" if label else f"{recorded_at}.json"
+    filename = os.path.join(path, name)
+    with open(filename, "w") as f:
+        json.dump(record, f, indent=2)
+    return filename
+
+
+def list_results(target: str, directory: Optional[str] = None) -> list[str]:
+    """Returns the stored results of ``target``, oldest first."""
+    path = os.path.join(directory or bench_dir(), target)
+    if not os.path.isdir(path):
+        return []
+    return [
+        os.path.join(path, name)
+        for name in sorted(os.listdir(path))
+        if name.endswith(".json")
+    ]
+
+
+def resolve(ref: str, directory: Optional[str] = None) -> str:
+    """Resolves a file path or ``target:latest|previous|<index>|<label>``."""
+    if os.path.exists(ref) or ":" not in ref:
+        return ref
+    target, which = ref.split(":", 1)
+    results = list_results(target, directory)
+    if not results:
+        raise SystemExit(f"No stored results for target {target!r}")
+    if which == "latest":
+        return results[-1]
+    if which == "previous":
+        if len(results) < 2:
+            raise SystemExit(f"Target {target!r} has only one stored result")
+        return results[-2]
+    if which.lstrip("-").isdigit():
+        try:
+            return results[int(which)]
+        except (IndexError, ValueError):
+            raise SystemExit(
+                f"No result {which!r} for target {target!r},"
+                f" which has {len(results)} stored results"
+            ) from None
+    labelled = [r for r in results if r.endswith(f"-{which}.json")]
+    if not labelled:
+        raise SystemExit(f"No result labelled {which!r} for target {target!r}")
+    return labelled[-1]
+
+
+def load(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def mann_whitney(
+    base: Iterable[tuple[int, int]], new: Iterable[tuple[int, int]]
+) -> tuple[float, float]:
+    """One-sided Mann-Whitney U test that ``new`` tends to be larger.
+
+    Works on grouped ``(value, count)`` data such as histogram buckets, with
+    the usual tie correction and normal approximation.
+
+    Returns:
+        tuple[float, float]: The probability that a random ``new`` value
+        exceeds a random ``base`` value (ties count half), and the p-value.
+    """
+    counts: dict[int, list[int]] = {}
+    for index, values in enumerate((base, new)):
+        for value, count in values:
+            counts.setdefault(value, [0, 0])[index] += count
+    n1 = sum(c[0] for c in counts.values())
+    n2 = sum(c[1] for c in counts.values())
+    if not n1 or not n2:
+        return 0.5, 1.0
+
+    rank_sum = 0.0
+    ties = 0.0
+    seen = 0
+    for value in sorted(counts):
+        c1, c2 = counts[value]
+        tied = c1 + c2
+        rank_sum += c2 * (seen + (tied + 1) / 2)
+        ties += tied**3 - tied
+        seen += tied
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0
+    effect = u / (n1 * n2)
+    if variance <= 0:
+        return effect, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return effect, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def change(base: float, new: float) -> float:
+    """Returns the relative change from ``base`` to ``new`` in percent."""
+    if not base:
+        return 0.0 if not new else math.inf
+    return (new - base) / base * 100
+
+
+def compare(
+    base: dict[str, Any],
+    new: dict[str, Any],
+    alpha: float = 0.01,
+    threshold: float = 5.0,
+) -> dict[str, Any]:
+    """Compares two stored results.
+
+    Returns:
+        dict: Per-metric changes, the test statistics and a list of
+        regressions (empty when the new run is not worse).
+    """
+    base_hist = Histogram.from_dict(base["histogram"])
+    new_hist = Histogram.from_dict(new["histogram"])
+    effect, p_value = mann_whitney(base_hist.values(), new_hist.values())
+    metrics = {}
+    for name, percentile in (("p50", 50), ("p90", 90), ("p99", 99)):
+        before = base_hist.percentile(percentile) / 1000
+        after = new_hist.percentile(percentile) / 1000
+        metrics[f"{name}_ms"] = (before, after, change(before, after))
+    metrics["throughput_rps"] = (
+        base["throughput_rps"],
+        new["throughput_rps"],
+        change(base["throughput_rps"], new["throughput_rps"]),
+    )
+    metrics["error_rate"] = (base["error_rate"], new["error_rate"], None)
+
+    regressions = []
+    slower = [name for name in ("p50_ms", "p99_ms") if metrics[name][2] > threshold]
+    if p_value < alpha and slower:
+        regressions.append(
+            f"latency: {', '.join(slower)} up (p={p_value:.2g}, "
+            f"P(new > base)={effect:.2f})"
+        )
+    if metrics["throughput_rps"][2] < -threshold:
+        regressions.append(f"throughput: down {-metrics['throughput_rps'][2]:.1f}%")
+    if new["error_rate"] > base["error_rate"] + threshold / 100:
+        regressions.append(
+            f"error rate: {base['error_rate']:.2%} -> {new['error_rate']:.2%}"
+        )
+    return {
+        "metrics": metrics,
+        "p_value": p_value,
+        "effect": effect,
+        "regressions": regressions,
+    }
+
+
+def describe(record: dict[str, Any], path: str) -> str:
+    return (
+        f"{path} [{record.get('target')}] {record.get('method')} "
+        f"rev={record.get('revision')} n={record['histogram']['total']}"
+    )
+
+
+def print_report(
+    report: dict[str, Any], base: tuple[str, dict], new: tuple[str, dict]
+) -> None:
+    print(f"base: {describe(base[1], base[0])}")
+    print(f"new:  {describe(new[1], new[0])}")
+    print(f"{'metric':<16}{'base':>12}{'new':>12}{'change':>10}")
+    for name, (before, after, delta) in report["metrics"].items():
+        shown = "" if delta is None else f"{delta:+9.1f}%"
+        print(f"{name:<16}{before:>12.3f}{after:>12.3f}{shown:>10}")
+    print(
+        f"Mann-Whitney: P(new > base)={report['effect']:.3f} "
+        f"p={report['p_value']:.3g}"
+    )
+    if report["regressions"]:
+        for regression in report["regressions"]:
+            print(f"❌ Regression: {regression}")
+    else:
+        print("✅ No significant regression")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", help="Results directory (default: benchmarks/).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="List stored results.")
+    listing.add_argument("--target", choices=TARGETS)
+    comparing = commands.add_parser("compare", help="Compare two results.")
+    comparing.add_argument("base", help="File or target:latest|previous|<label>.")
+    comparing.add_argument("new", help="File or target:latest|previous|<label>.")
+    comparing.add_argument("--alpha", type=float, default=0.01)
+    comparing.add_argument(
+        "--threshold", type=float, default=5.0, help="Smallest change, in %%."
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for target in [args.target] if args.target else TARGETS:
+            for path in list_results(target, args.dir):
+                print(describe(load(path), path))
+        return 0
+
+    base_path, new_path = resolve(args.base, args.dir), resolve(args.new, args.dir)
+    base, new = load(base_path), load(new_path)
+    report = compare(base, new, alpha=args.alpha, threshold=args.threshold)
+    print_report(report, (base_path, base), (new_path, new))
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""A small pure-Python HDR (high dynamic range) latency histogram.
+
+Values are integers (microseconds by convention) kept to three significant
+digits: each value is counted in a bucket no wider than 1/1024 of its
+magnitude, so the memory used does not grow with the number of samples.
+Histograms can be merged, saved as JSON and exported in the HdrHistogram
+percentile-distribution (``.hgrm``) format understood by the HdrHistogram
+plotter.
+"""
+
+import math
+from typing import Iterator, Optional
+
+SUB_BUCKET_BITS = 11  # 2048 sub-buckets: three significant digits.
+
+
+def lowest_equivalent(value: int) -> int:
+    """Returns the smallest value counted in the same bucket as ``value``."""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+    return (value >> shift) << shift
+
+
+def highest_equivalent(value: int) -> int:
+    """Returns the largest value counted in the same bucket as ``value``."""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+    return lowest_equivalent(value) + (1 << shift) - 1
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integer values."""
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+        self._sum = 0
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        key = lowest_equivalent(value)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.total += count
+        self._sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self._sum += other._sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    def stddev(self) -> float:
+        if not self.total:
+            return 0.0
+        mean = self.mean()
+        variance = sum(count * (key - mean) ** 2 for key, count in self.counts.items())
+        return math.sqrt(variance / self.total)
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the value at ``percentile`` (0-100); 0 when empty."""
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total))
+        cumulative = 0
+        for key in sorted(self.counts):
+            cumulative += self.counts[key]
+            if cumulative >= target:
+                return min(highest_equivalent(key), self.max)
+        return self.max
+
+    def values(self) -> Iterator[tuple[int, int]]:
+        """Yields ``(value, count)`` pairs in increasing value order."""
+        for key in sorted(self.counts):
+            yield key, self.counts[key]
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "sum": self._sum,
+            "counts": [[key, count] for key, count in self.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls()
+        histogram.counts = {int(key): int(count) for key, count in data["counts"]}
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        histogram._sum = data["sum"]
+        return histogram
+
+    def percentile_distribution(
+        self, ticks_per_half_distance: int = 5, scale: float = 1000.0
+    ) -> str:
+        """Renders the ``.hgrm`` text HdrHistogram tools read.
+
+        Args:
+            ticks_per_half_distance (int): Rows per halving of the distance
+                to 100%.
+            scale (float): Divisor applied to values; 1000 turns the recorded
+                microseconds into milliseconds.
+        """
+        lines = [
+            f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} "
+            f"{'1/(1-Percentile)':>14}",
+            "",
+        ]
+        ordered = list(self.values())
+        cumulative = 0
+        index = 0
+        percentile = 0.0
+        fraction = 0.0
+        while self.total and percentile < 100:
+            target = max(1, math.ceil(percentile / 100 * self.total))
+            while cumulative < target:
+                cumulative += ordered[index][1]
+                index += 1
+            value = min(highest_equivalent(ordered[index - 1][0]), self.max)
+            fraction = cumulative / self.total
+            lines.append(self._row(value / scale, fraction, cumulative))
+            if cumulative == self.total:
+                break
+            half_distance = 2 ** (math.floor(math.log2(100 / (100 - percentile))) + 1)
+            percentile += 100 / (half_distance * ticks_per_half_distance)
+        if self.total and fraction < 1:
+            lines.append(self._row(self.max / scale, 1.0, self.total))
+        lines.append(
+            f"#[Mean    = {self.mean() / scale:12.3f}, "
+            f"StdDeviation   = {self.stddev() / scale:12.3f}]"
+        )
+        lines.append(
+            f"#[Max     = {self.max / scale:12.3f}, Total count    = {self.total:12d}]"
+        )
+        lines.append(
+            f"#[Buckets = {len(self.counts):12d}, "
+            f"SubBuckets     = {2 ** SUB_BUCKET_BITS:12d}]"
+        )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _row(value: float, fraction: float, count: int) -> str:
+        inverse = f"{1 / (1 - fraction):14.2f}" if fraction < 1 else f"{'inf':>14}"
+        return f"{value:12.3f} {fraction:14.12f} {count:10d} {inverse}"
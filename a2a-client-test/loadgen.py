@@ -0,0 +1,331 @@
+"""Load generator for any A2A JSON-RPC endpoint.
+
+Drives an agent through ``tasks/send`` (the Rust servers), ``message/send``
+or the streaming ``message/stream`` and ``tasks/sendSubscribe`` methods.
+
+*   Closed loop (default): ``--concurrency`` workers each send a request, wait
+    for the answer and send the next one.
+*   Open loop: ``--rate`` requests per second arrive as a Poisson process no
+    matter how fast the agent answers. Latency is measured from each
+    request's scheduled start, so a stalled server is not hidden by requests
+    that were never sent (coordinated omission). ``--concurrency`` then caps
+    the requests in flight (default 1000); arrivals beyond it are counted as
+    dropped.
+
+Requests started during the ``--warmup`` seconds are not recorded. Latencies
+go into HDR histograms, printed as percentiles and optionally exported with
+``--hgrm`` (HdrHistogram percentile distribution) or ``--json``. ``--save``
+stores the result for ``--target`` so ``bench.py compare`` can compare runs.
+
+Usage:
+    python loadgen.py http://localhost:8084 --method message/send \\
+        --concurrency 8 --duration 60 --warmup 10
+    python loadgen.py http://localhost:8080 --method tasks/send --rate 50
+    python loadgen.py $CLOUD_RUN_URL --method tasks/send --save --target cloudrun
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import random
+import time
+from typing import Any, Optional
+from uuid import uuid4
+
+import httpx
+
+import bench
+from hdrhist import Histogram
+
+try:
+    # Keeps the generator's own JSON work small next to the server's.
+    from orjson import dumps as json_dumps
+    from orjson import loads as json_loads
+except ImportError:
+
+    def json_dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    json_loads = json.loads
+
+METHODS = ("message/send", "message/stream", "tasks/send", "tasks/sendSubscribe")
+STREAMING_METHODS = ("message/stream", "tasks/sendSubscribe")
+PERCENTILES = (50, 90, 99, 99.9)
+JSON_HEADERS = {"Content-Type": "application/json"}
+SSE_HEADERS = {**JSON_HEADERS, "Accept": "text/event-stream"}
+
+
+def build_payload(method: str, text: str) -> dict[str, Any]:
+    """Builds one JSON-RPC request with fresh message and task ids."""
+    message = {
+        "kind": "message",
+        "messageId": str(uuid4()),
+        "role": "user",
+        "parts": [{"kind": "text", "text": text}],
+    }
+    params: dict[str, Any] = {"message": message}
+    if method.startswith("tasks/"):
+        # The pre-0.2 methods used by the Rust servers name the task up front.
+        params["id"] = str(uuid4())
+    return {"jsonrpc": "2.0", "id": str(uuid4()), "method": method, "params": params}
+
+
+def rpc_error(body: dict[str, Any]) -> Optional[str]:
+    """Returns an error label if a JSON-RPC response or event failed."""
+    if "error" in body:
+        return f"rpc_{body['error'].get('code', 'error')}"
+    state = (body.get("result") or {}).get("status", {}).get("state")
+    if state in ("failed", "rejected"):
+        return f"task_{state}"
+    return None
+
+
+class Recorder:
+    """Collects latencies and outcomes once the warm-up is over."""
+
+    def __init__(self, warmup_until: float) -> None:
+        self.warmup_until = warmup_until
+        self.latency = Histogram()
+        self.first_event = Histogram()
+        self.errors: collections.Counter = collections.Counter()
+        self.ok = 0
+        self.dropped = 0
+        self.measure_start: Optional[float] = None
+        self.measure_end: Optional[float] = None
+
+    def counts(self, started: float) -> bool:
+        return started >= self.warmup_until
+
+    def record(
+        self,
+        started: float,
+        error: Optional[str],
+        first_event: Optional[float] = None,
+    ) -> None:
+        now = time.monotonic()
+        if not self.counts(started):
+            return
+        if self.measure_start is None:
+            self.measure_start = started
+        self.measure_end = now
+        if error:
+            self.errors[error] += 1
+            return
+        self.ok += 1
+        self.latency.record(int((now - started) * 1e6))
+        if first_event is not None:
+            self.first_event.record(int((first_event - started) * 1e6))
+
+
+async def send_one(
+    client: httpx.AsyncClient,
+    url: str,
+    method: str,
+    text: str,
+    recorder: Recorder,
+    started: float,
+) -> None:
+    """Sends one request and records its outcome.
+
+    Args:
+        started (float): When the request was scheduled to start; latency is
+            measured from here.
+    """
+    payload = build_payload(method, text)
+    error = None
+    first_event = None
+    try:
+        if method in STREAMING_METHODS:
+            async with client.stream(
+                "POST", url, content=json_dumps(payload), headers=SSE_HEADERS
+            ) as r:
+                if r.status_code != 200:
+                    error = f"http_{r.status_code}"
+                elif not r.headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    # Errors such as "streaming not supported" come back as JSON.
+                    error = rpc_error(json_loads(await r.aread())) or "not_a_stream"
+                else:
+                    async for line in r.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        if first_event is None:
+                            first_event = time.monotonic()
+                        error = error or rpc_error(json_loads(line[5:]))
+                    if first_event is None:
+                        error = "no_events"
+        else:
+            response = await client.post(
+                url, content=json_dumps(payload), headers=JSON_HEADERS
+            )
+            if response.status_code != 200:
+                error = f"http_{response.status_code}"
+            else:
+                error = rpc_error(json_loads(response.content))
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    recorder.record(started, error, first_event)
+
+
+async def closed_loop(
+    client: httpx.AsyncClient, args: argparse.Namespace, recorder: Recorder
+) -> None:
+    deadline = time.monotonic() + args.warmup + args.duration
+    remaining = [args.requests] if args.requests else None
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.monotonic()
+            await send_one(client, args.url, args.method, args.text, recorder, started)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def open_loop(
+    client: httpx.AsyncClient, args: argparse.Namespace, recorder: Recorder
+) -> None:
+    start = time.monotonic()
+    deadline = start + args.warmup + args.duration
+    in_flight: set[asyncio.Task] = set()
+    scheduled = start
+    sent = 0
+    while scheduled < deadline and not (args.requests and sent >= args.requests):
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= args.concurrency:
+            if recorder.counts(scheduled):
+                recorder.dropped += 1
+        else:
+            task = asyncio.create_task(
+                send_one(client, args.url, args.method, args.text, recorder, scheduled)
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            sent += 1
+        scheduled += random.expovariate(args.rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+def summarize(args: argparse.Namespace, recorder: Recorder) -> dict[str, Any]:
+    """Builds the result record printed and saved by ``--json``."""
+    elapsed = (
+        (recorder.measure_end - recorder.measure_start)
+        if recorder.measure_start is not None
+        else 0.0
+    )
+    errors = sum(recorder.errors.values())
+
+    def percentiles(histogram: Histogram) -> dict[str, float]:
+        values = {f"p{p:g}": histogram.percentile(p) / 1000 for p in PERCENTILES}
+        values["max"] = histogram.max / 1000
+        values["mean"] = round(histogram.mean() / 1000, 3)
+        return values
+
+    result = {
+        "url": args.url,
+        "method": args.method,
+        "mode": "open" if args.rate else "closed",
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 3),
+        "ok": recorder.ok,
+        "errors": dict(recorder.errors),
+        "dropped": recorder.dropped,
+        "error_rate": (
+            round(errors / (errors + recorder.ok), 4) if errors + recorder.ok else 0.0
+        ),
+        "throughput_rps": round(recorder.ok / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": percentiles(recorder.latency),
+        "histogram": recorder.latency.to_dict(),
+    }
+    if recorder.first_event.total:
+        result["first_event_ms"] = percentiles(recorder.first_event)
+        result["first_event_histogram"] = recorder.first_event.to_dict()
+    return result
+
+
+def print_summary(result: dict[str, Any]) -> None:
+    target = f"{result['method']} against {result['url']}"
+    print(f"--- 📊 {target} ({result['mode']} loop)")
+    print(
+        f"ok={result['ok']} errors={sum(result['errors'].values())} "
+        f"dropped={result['dropped']} throughput={result['throughput_rps']} req/s"
+    )
+    for name in ("latency_ms", "first_event_ms"):
+        if name in result:
+            row = " ".join(f"{k}={v:.1f}" for k, v in result[name].items())
+            print(f"{name}: {row}")
+    for error, count in sorted(result["errors"].items()):
+        print(f"  ❌ {error}: {count}")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    recorder = Recorder(warmup_until=time.monotonic() + args.warmup)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        if args.rate:
+            await open_loop(client, args, recorder)
+        else:
+            await closed_loop(client, args, recorder)
+    return summarize(args, recorder)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="JSON-RPC endpoint, e.g. http://localhost:8084/")
+    parser.add_argument("--method", choices=METHODS, default="message/send")
+    parser.add_argument("--text", default="hello", help="Message text to send.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Workers (closed loop, default 4) or max requests in flight "
+        "(open loop, default 1000).",
+    )
+    parser.add_argument(
+        "--rate", type=float, help="Open-loop Poisson arrival rate in requests/s."
+    )
+    parser.add_argument("--duration", type=float, default=30, help="Seconds measured.")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds discarded.")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--hgrm", help="Write the HdrHistogram distribution here.")
+    parser.add_argument("--json", help="Write the result record here.")
+    parser.add_argument(
+        "--save", action="store_true", help="Store the result for bench.py."
+    )
+    parser.add_argument("--target", choices=bench.TARGETS, default="local")
+    parser.add_argument("--label", help="Label for the stored result, e.g. a build.")
+    args = parser.parse_args(argv)
+    if args.concurrency is None:
+        args.concurrency = 1000 if args.rate else 4
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    print_summary(result)
+    if args.hgrm:
+        with open(args.hgrm, "w") as f:
+            f.write(Histogram.from_dict(result["histogram"]).percentile_distribution())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.save:
+        print(f"Saved {bench.save_result(result, args.target, args.label)}")
+
+
+if __name__ == "__main__":
+    main()
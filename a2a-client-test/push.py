@@ -0,0 +1,261 @@
+"""Submits a long-running message without holding a connection open.
+
+The message is sent with ``configuration.blocking`` false, so the agent
+answers at once with a submitted task and keeps working in the background.
+The finished task then arrives in one of two ways:
+
+*   With ``--webhook-port``, a local ``WebhookReceiver`` is started and its
+    URL is sent as the task's ``pushNotificationConfig``. The agent POSTs the
+    task to it once the task completes, fails or needs input. Python agents
+    only call private addresses listed in ``A2A_PUSH_ALLOWED_HOSTS``, so start
+    them with ``A2A_PUSH_ALLOWED_HOSTS=127.0.0.1`` for a local receiver.
+*   Otherwise the task is polled with ``tasks/get`` every ``--poll-interval``
+    seconds.
+
+``WebhookReceiver`` only needs the standard library, so tests can use it
+against any A2A server that supports push notifications.
+
+Usage:
+    python push.py http://localhost:8082 "Find tech events in Paris next week"
+    python push.py http://localhost:8082 "Events in NYC" --webhook-port 9099
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+import sys
+import time
+from typing import Any, Optional
+from uuid import uuid4
+
+import httpx
+
+from loadgen import rpc_error
+
+FINAL_STATES = frozenset(
+    {"completed", "failed", "canceled", "rejected", "input-required", "auth-required"}
+)
+TOKEN_HEADER = "X-A2A-Notification-Token"
+
+
+def task_state(task: dict[str, Any]) -> Optional[str]:
+    return (task.get("status") or {}).get("state")
+
+
+class WebhookReceiver:
+    """A minimal HTTP server that collects A2A push notifications.
+
+    Every POST body is parsed as a task and kept by task id. Requests whose
+    ``X-A2A-Notification-Token`` header does not match ``token`` get a 401.
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The port to listen on; 0 picks a free one.
+        token (str): The token the agent must send back.
+    """
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, token: Optional[str] = None
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.token = token
+        self.tasks: dict[str, dict[str, Any]] = {}
+        self.received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    async def start(self) -> "WebhookReceiver":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "WebhookReceiver":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def wait(
+        self, task_id: str, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        """Returns the task once a notification reports a final state."""
+
+        def done() -> bool:
+            return task_state(self.tasks.get(task_id, {})) in FINAL_STATES
+
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(done), timeout)
+        return self.tasks[task_id]
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            if not request_line.startswith(b"POST"):
+                status = "405 Method Not Allowed"
+            elif self.token and headers.get(TOKEN_HEADER.lower()) != self.token:
+                status = "401 Unauthorized"
+            else:
+                status = await self._accept(body)
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n"
+                "Connection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            logging.warning("Bad push notification request: %s", e)
+        finally:
+            writer.close()
+
+    async def _accept(self, body: bytes) -> str:
+        try:
+            task = json.loads(body)
+        except ValueError:
+            return "400 Bad Request"
+        if not isinstance(task, dict) or "id" not in task:
+            return "400 Bad Request"
+        async with self._changed:
+            self.tasks[task["id"]] = task
+            self.received += 1
+            self._changed.notify_all()
+        return "200 OK"
+
+
+def build_submit(
+    text: str, webhook_url: Optional[str] = None, token: Optional[str] = None
+) -> dict[str, Any]:
+    """Builds a non-blocking ``message/send`` request."""
+    configuration: dict[str, Any] = {"blocking": False}
+    if webhook_url:
+        configuration["pushNotificationConfig"] = {"url": webhook_url}
+        if token:
+            configuration["pushNotificationConfig"]["token"] = token
+    return {
+        "jsonrpc": "2.0",
+        "id": str(uuid4()),
+        "method": "message/send",
+        "params": {
+            "message": {
+                "kind": "message",
+                "messageId": str(uuid4()),
+                "role": "user",
+                "parts": [{"kind": "text", "text": text}],
+            },
+            "configuration": configuration,
+        },
+    }
+
+
+async def call(client: httpx.AsyncClient, url: str, payload: dict) -> dict:
+    """Sends one JSON-RPC request and returns its result."""
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    body = response.json()
+    error = rpc_error(body)
+    if error:
+        raise RuntimeError(error)
+    return body["result"]
+
+
+async def submit(
+    client: httpx.AsyncClient,
+    url: str,
+    text: str,
+    webhook_url: Optional[str] = None,
+    token: Optional[str] = None,
+) -> dict[str, Any]:
+    """Submits ``text`` and returns the task without waiting for it."""
+    return await call(client, url, build_submit(text, webhook_url, token))
+
+
+async def poll(
+    client: httpx.AsyncClient,
+    url: str,
+    task_id: str,
+    interval: float = 1.0,
+    timeout: Optional[float] = None,
+) -> dict[str, Any]:
+    """Polls ``tasks/get`` until the task reaches a final state."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        task = await call(
+            client,
+            url,
+            {
+                "jsonrpc": "2.0",
+                "id": str(uuid4()),
+                "method": "tasks/get",
+                "params": {"id": task_id},
+            },
+        )
+        if task_state(task) in FINAL_STATES:
+            return task
+        if deadline is not None and time.monotonic() + interval > deadline:
+            raise asyncio.TimeoutError(f"Task {task_id} is still {task_state(task)}")
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with httpx.AsyncClient(timeout=30) as client:
+        if args.webhook_port is None:
+            task = await submit(client, args.url, args.text)
+            logging.info("Submitted task %s; polling", task["id"])
+            return await poll(
+                client, args.url, task["id"], args.poll_interval, args.timeout
+            )
+        token = secrets.token_urlsafe(16)
+        async with WebhookReceiver(
+            args.webhook_host, args.webhook_port, token
+        ) as receiver:
+            task = await submit(client, args.url, args.text, receiver.url, token)
+            logging.info("Submitted task %s; waiting on %s", task["id"], receiver.url)
+            return await receiver.wait(task["id"], args.timeout)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="JSON-RPC endpoint, e.g. http://localhost:8082")
+    parser.add_argument("text", help="Message to send.")
+    parser.add_argument(
+        "--webhook-port",
+        type=int,
+        help="Receive the result as a push notification on this port "
+        "(0 picks one) instead of polling.",
+    )
+    parser.add_argument(
+        "--webhook-host",
+        default="127.0.0.1",
+        help="Interface and host name the agent uses to reach the webhook.",
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    task = asyncio.run(run(args))
+    json.dump(task, sys.stdout, indent=2)
+    print()
+    return 0 if task_state(task) == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Replays a JSONL corpus of A2A messages against any agent.
+
+The corpus is read lazily, one line at a time, so it can be larger than
+memory. Each line is one of:
+
+*   A JSON-RPC request (``{"jsonrpc": "2.0", "method": ..., "params": ...}``).
+    Its message gets a fresh ``messageId``, any ``taskId`` is dropped and each
+    original ``contextId`` is mapped to a new one, so a replayed conversation
+    stays one conversation without colliding with earlier runs.
+*   Any other object, such as the backlog in the repository's
+    ``requests.jsonl``. Its ``text``, ``body``, ``message`` or ``title`` field
+    is sent with ``--method``.
+
+Lines are sent at their original timing, taken from an ``offset_s`` field
+(seconds since the first request) or a ``timestamp`` field (epoch seconds or
+ISO 8601), and sped up by ``--speed``. ``--rate`` ignores the timing and sends
+Poisson arrivals instead; without timing or rate, lines are sent back to back.
+At most ``--concurrency`` requests are in flight; later lines wait, and that
+wait counts towards their latency, which is measured from the scheduled send
+time.
+
+Every response is written to ``--out`` (or stdout) as one JSON line with its
+corpus line number, latency and error, in completion order. Lines that are not
+JSON objects are skipped and counted in the summary.
+
+Usage:
+    python replay.py http://localhost:8084 ../requests.jsonl --out replies.jsonl
+    python replay.py http://localhost:8080 traffic.jsonl --speed 10 \\
+        --method tasks/send
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Iterator, Optional, TextIO
+from uuid import uuid4
+
+import httpx
+
+from loadgen import (
+    JSON_HEADERS,
+    METHODS,
+    PERCENTILES,
+    SSE_HEADERS,
+    STREAMING_METHODS,
+    Recorder,
+    json_dumps,
+    json_loads,
+    rpc_error,
+)
+
+TEXT_FIELDS = ("text", "body", "message", "title")
+# Corpus fields that only drive the replay; they are never sent.
+TIMING_FIELDS = ("offset_s", "timestamp")
+
+logger = logging.getLogger(__name__)
+
+
+def read_corpus(
+    path: str, skipped: Optional[list[int]] = None
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yields ``(line number, entry)`` pairs, skipping blank lines.
+
+    Lines that are not JSON objects, or whose send time cannot be parsed, are
+    logged and skipped; their numbers are appended to ``skipped``.
+    """
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError("not a JSON object")
+                entry_time(entry)
+            except (TypeError, ValueError) as e:
+                logger.warning("Skipping line %d: %s", number, e)
+                if skipped is not None:
+                    skipped.append(number)
+                continue
+            yield number, entry
+
+
+def entry_time(entry: dict[str, Any]) -> Optional[float]:
+    """Returns the entry's original send time in seconds, if it has one.
+
+    Raises:
+        ValueError: If ``offset_s`` or ``timestamp`` cannot be parsed.
+        TypeError: If ``offset_s`` is not a number or a string.
+    """
+    if "offset_s" in entry:
+        seconds = float(entry["offset_s"])
+    else:
+        value = entry.get("timestamp")
+        if isinstance(value, (int, float)):
+            seconds = float(value)
+        elif isinstance(value, str):
+            # Python before 3.11 does not parse the "Z" suffix.
+            if value.endswith("Z"):
+                value = value[:-1] + "+00:00"
+            seconds = datetime.fromisoformat(value).timestamp()
+        else:
+            return None
+    if not math.isfinite(seconds):
+        raise ValueError(f"send time {seconds} is not finite")
+    return seconds
+
+
+class PayloadBuilder:
+    """Turns corpus entries into fresh JSON-RPC requests."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.contexts: dict[str, str] = {}
+
+    def build(self, entry: dict[str, Any]) -> dict[str, Any]:
+        if "method" in entry and "params" in entry:
+            params = json.loads(json.dumps(entry["params"]))
+            for field in TIMING_FIELDS:
+                params.pop(field, None)
+            message = params.get("message")
+            if isinstance(message, dict):
+                message["messageId"] = str(uuid4())
+                message.pop("taskId", None)
+                if "contextId" in message:
+                    message["contextId"] = self.contexts.setdefault(
+                        message["contextId"], str(uuid4())
+                    )
+            if entry["method"].startswith("tasks/"):
+                params["id"] = str(uuid4())
+            return {
+                "jsonrpc": entry.get("jsonrpc", "2.0"),
+                "id": str(uuid4()),
+                "method": entry["method"],
+                "params": params,
+            }
+        text = next((entry[f] for f in TEXT_FIELDS if entry.get(f)), None)
+        if text is None:
+            raise ValueError(f"Entry has none of the fields {TEXT_FIELDS}")
+        params: dict[str, Any] = {
+            "message": {
+                "kind": "message",
+                "messageId": str(uuid4()),
+                "role": "user",
+                "parts": [{"kind": "text", "text": str(text)}],
+            }
+        }
+        if self.method.startswith("tasks/"):
+            params["id"] = str(uuid4())
+        return {
+            "jsonrpc": "2.0",
+            "id": str(uuid4()),
+            "method": self.method,
+            "params": params,
+        }
+
+
+def schedule(
+    corpus: Iterator[tuple[int, dict[str, Any]]],
+    speed: float = 1.0,
+    rate: Optional[float] = None,
+) -> Iterator[tuple[float, int, dict[str, Any]]]:
+    """Yields ``(seconds after start, line number, entry)`` lazily."""
+    offset = 0.0
+    first: Optional[float] = None
+    for number, entry in corpus:
+        if rate:
+            yield offset, number, entry
+            offset += random.expovariate(rate)
+            continue
+        at = entry_time(entry)
+        if at is None:
+            yield offset, number, entry
+            continue
+        if first is None:
+            first = at
+        offset = max(offset, (at - first) / speed)
+        yield offset, number, entry
+
+
+async def replay_one(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict[str, Any],
+) -> tuple[Optional[str], Any]:
+    """Sends one request and returns its error label and response body."""
+    try:
+        if payload["method"] in STREAMING_METHODS:
+            async with client.stream(
+                "POST", url, content=json_dumps(payload), headers=SSE_HEADERS
+            ) as r:
+                if r.status_code != 200:
+                    return f"http_{r.status_code}", (await r.aread()).decode()
+                if not r.headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    body = json_loads(await r.aread())
+                    return rpc_error(body) or "not_a_stream", body
+                events = [
+                    json_loads(line[5:])
+                    async for line in r.aiter_lines()
+                    if line.startswith("data:")
+                ]
+                error = next(filter(None, map(rpc_error, events)), None)
+                return error or (None if events else "no_events"), events
+        response = await client.post(
+            url, content=json_dumps(payload), headers=JSON_HEADERS
+        )
+        if response.status_code != 200:
+            return f"http_{response.status_code}", response.text
+        body = json_loads(response.content)
+        return rpc_error(body), body
+    except httpx.HTTPError as e:
+        return type(e).__name__, str(e)
+
+
+async def run(
+    args: argparse.Namespace, out: TextIO, skipped: Optional[list[int]] = None
+) -> Recorder:
+    recorder = Recorder(warmup_until=0)
+    builder = PayloadBuilder(args.method)
+    slots = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    entries = schedule(read_corpus(args.corpus, skipped), args.speed, args.rate)
+    if args.limit:
+        entries = itertools.islice(entries, args.limit)
+    start = time.monotonic()
+
+    async def send(
+        client: httpx.AsyncClient, number: int, entry: dict, started: float
+    ) -> None:
+        try:
+            payload = builder.build(entry)
+        except ValueError as e:
+            error, body = "bad_entry", str(e)
+        else:
+            error, body = await replay_one(client, args.url, payload)
+        finally:
+            slots.release()
+        recorder.record(started, error)
+        record = {
+            "line": number,
+            "id": entry.get("id", entry.get("request_id")),
+            "scheduled_s": round(started - start, 3),
+            "latency_ms": round((time.monotonic() - started) * 1000, 3),
+            "error": error,
+        }
+        if not args.omit_responses:
+            record["response"] = body
+        out.write(json.dumps(record) + "\n")
+
+    in_flight: set[asyncio.Task] = set()
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for offset, number, entry in entries:
+            scheduled = start + offset
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()
+            task = asyncio.create_task(send(client, number, entry, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    return recorder
+
+
+def print_summary(
+    recorder: Recorder, file: TextIO = sys.stdout, skipped: int = 0
+) -> None:
+    errors = sum(recorder.errors.values())
+    print(
+        f"--- 🔁 Replayed {recorder.ok + errors} requests, {errors} errors", file=file
+    )
+    if skipped:
+        print(f"  ⚠️ skipped {skipped} malformed lines", file=file)
+    row = " ".join(
+        f"p{p:g}={recorder.latency.percentile(p) / 1000:.1f}" for p in PERCENTILES
+    )
+    print(f"latency_ms: {row}", file=file)
+    for error, count in sorted(recorder.errors.items()):
+        print(f"  ❌ {error}: {count}", file=file)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="JSON-RPC endpoint, e.g. http://localhost:8084/")
+    parser.add_argument("corpus", help="JSONL file of messages to replay.")
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default="message/send",
+        help="Method for entries that are not JSON-RPC requests.",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Speed-up of the original timing."
+    )
+    parser.add_argument(
+        "--rate", type=float, help="Ignore the timing; Poisson arrivals per second."
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--limit", type=int, help="Replay at most this many lines.")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--out", help="Responses JSONL (default: stdout).")
+    parser.add_argument(
+        "--omit-responses", action="store_true", help="Record latencies only."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    skipped: list[int] = []
+    if args.out:
+        with open(args.out, "w") as out:
+            recorder = asyncio.run(run(args, out, skipped))
+        print_summary(recorder, skipped=len(skipped))
+    else:
+        # Responses go to stdout, so the summary goes to stderr.
+        recorder = asyncio.run(run(args, sys.stdout, skipped))
+        print_summary(recorder, sys.stderr, len(skipped))
+    return 1 if recorder.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Soak test: steady traffic for hours while watching the server for leaks.
+
+Sends open-loop Poisson traffic at ``--rate`` requests per second for
+``--duration`` seconds (default one hour). Every ``--interval`` seconds it
+closes a window and records that window's latency percentiles, throughput and
+errors together with a sample of the server process:
+
+*   ``--pid`` reads RSS, open descriptors and sockets from ``/proc/<pid>``
+    when the agent runs on the same Linux host.
+*   Otherwise it reads ``GET /debug/process`` from the agent (the Python
+    agents served by ``a2a_runtime.server``), or ``--process-url``. Servers
+    without it are soaked for latency drift only.
+
+Each window is appended to ``--out`` as one JSON line. At the end, least-squares
+slopes per hour are fitted to RSS, sockets, descriptors, p50 and p99, skipping
+windows that started during ``--warmup``. The run fails (exit status 1) when
+RSS grows faster than ``--max-rss-mb-per-hour``, sockets faster than
+``--max-sockets-per-hour`` or p99 faster than ``--max-p99-drift`` percent of
+its starting value per hour.
+
+Usage:
+    python soak.py http://localhost:8084 --rate 5 --duration 14400 \\
+        --out soak.jsonl
+    python soak.py http://localhost:8080 --method tasks/send --pid 4242
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Optional, Sequence
+from urllib.parse import urljoin
+
+import httpx
+
+from loadgen import METHODS, Recorder, send_one
+
+# Window fields fitted for leaks, with the unit shown in the report.
+TRENDS = {
+    "rss_mb": "MB",
+    "sockets": "sockets",
+    "open_fds": "fds",
+    "p50_ms": "ms",
+    "p99_ms": "ms",
+}
+
+
+def fit_slope(points: Sequence[tuple[float, float]]) -> Optional[tuple[float, float]]:
+    """Fits ``y = slope * x + intercept`` by least squares.
+
+    Returns:
+        tuple[float, float]: The slope and intercept, or None with fewer than
+        two distinct ``x`` values.
+    """
+    n = len(points)
+    if n < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if not sxx:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+    return slope, mean_y - slope * mean_x
+
+
+def read_proc(pid: int) -> dict[str, Any]:
+    """Samples RSS, threads, descriptors and sockets of a local process."""
+    with open(f"/proc/{pid}/status") as f:
+        status = dict(line.split(":", 1) for line in f if ":" in line)
+    path = f"/proc/{pid}/fd"
+    links = []
+    for name in os.listdir(path):
+        try:
+            links.append(os.readlink(os.path.join(path, name)))
+        except OSError:
+            continue
+    return {
+        "rss_bytes": int(status["VmRSS"].split()[0]) * 1024,
+        "threads": int(status["Threads"]),
+        "open_fds": len(links),
+        "sockets": sum(link.startswith("socket:") for link in links),
+    }
+
+
+class Windows:
+    """Routes results to the current window's ``Recorder``."""
+
+    def __init__(self) -> None:
+        self.current = Recorder(warmup_until=0)
+
+    def record(
+        self, started: float, error: Optional[str], first_event: Optional[float] = None
+    ) -> None:
+        self.current.record(started, error, first_event)
+
+    def rotate(self) -> Recorder:
+        """Starts a new window and returns the finished one."""
+        finished, self.current = self.current, Recorder(warmup_until=0)
+        return finished
+
+
+def window_row(recorder: Recorder, elapsed: float, length: float) -> dict[str, Any]:
+    errors = sum(recorder.errors.values())
+    return {
+        "t_s": round(elapsed, 1),
+        "ok": recorder.ok,
+        "errors": errors,
+        "dropped": recorder.dropped,
+        "throughput_rps": round(recorder.ok / length, 2),
+        "p50_ms": recorder.latency.percentile(50) / 1000,
+        "p99_ms": recorder.latency.percentile(99) / 1000,
+        "max_ms": recorder.latency.max / 1000,
+    }
+
+
+async def sample_process(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Returns the server process sample, or an empty dict if unavailable."""
+    try:
+        if args.pid:
+            stats = read_proc(args.pid)
+        else:
+            response = await client.get(args.process_url)
+            response.raise_for_status()
+            stats = response.json()
+    except (OSError, KeyError, ValueError, httpx.HTTPError) as e:
+        logging.debug("Process sample failed: %s", e)
+        return {}
+    sample = {
+        key: stats[key]
+        for key in ("sockets", "open_fds", "threads", "asyncio_tasks")
+        if stats.get(key) is not None
+    }
+    if "rss_bytes" in stats:
+        sample["rss_mb"] = round(stats["rss_bytes"] / 2**20, 2)
+    return sample
+
+
+def analyze(rows: list[dict[str, Any]], args: argparse.Namespace) -> dict[str, Any]:
+    """Fits per-hour slopes to the windows after the warm-up and flags leaks."""
+    measured = [row for row in rows if row["t_s"] - args.interval >= args.warmup]
+    slopes: dict[str, dict[str, float]] = {}
+    for field in TRENDS:
+        points = [
+            (row["t_s"] / 3600, row[field])
+            for row in measured
+            if row.get(field) is not None and (row["ok"] or "_ms" not in field)
+        ]
+        fit = fit_slope(points)
+        if fit is not None:
+            slope, intercept = fit
+            slopes[field] = {
+                "per_hour": round(slope, 3),
+                "start": round(slope * points[0][0] + intercept, 3),
+            }
+
+    leaks = []
+    rss = slopes.get("rss_mb")
+    if rss and rss["per_hour"] > args.max_rss_mb_per_hour:
+        leaks.append(f"RSS grows {rss['per_hour']:.1f} MB/h")
+    sockets = slopes.get("sockets")
+    if sockets and sockets["per_hour"] > args.max_sockets_per_hour:
+        leaks.append(f"sockets grow {sockets['per_hour']:.1f}/h")
+    p99 = slopes.get("p99_ms")
+    if p99 and p99["start"] > 0:
+        drift = p99["per_hour"] / p99["start"] * 100
+        if drift > args.max_p99_drift:
+            leaks.append(f"p99 drifts {drift:+.1f}%/h ({p99['per_hour']:+.1f} ms/h)")
+    return {"windows": len(measured), "slopes": slopes, "leaks": leaks}
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"--- 🧪 Soak report over {report['windows']} windows")
+    for field, fit in report["slopes"].items():
+        unit = TRENDS[field]
+        start, slope = fit["start"], fit["per_hour"]
+        print(f"{field:<10} start={start:.2f} {unit}  {slope:+.3f} {unit}/h")
+    if report["windows"] < 3:
+        print("⚠️  Fewer than 3 windows measured; slopes are unreliable.")
+    for leak in report["leaks"]:
+        print(f"❌ Leak: {leak}")
+    if not report["leaks"]:
+        print("✅ No growth beyond the thresholds")
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    windows = Windows()
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    rows: list[dict[str, Any]] = []
+    out = open(args.out, "a") if args.out else None
+    start = time.monotonic()
+    deadline = start + args.duration
+    async with httpx.AsyncClient(
+        timeout=args.timeout, limits=limits
+    ) as client, httpx.AsyncClient(timeout=10) as probe:
+
+        async def sampler() -> None:
+            window_start = start
+            while window_start < deadline:
+                window_end = min(window_start + args.interval, deadline)
+                await asyncio.sleep(window_end - time.monotonic())
+                row = window_row(
+                    windows.rotate(), window_end - start, window_end - window_start
+                )
+                row.update(await sample_process(probe, args))
+                rows.append(row)
+                print(" ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+                if out:
+                    out.write(json.dumps(row) + "\n")
+                    out.flush()
+                window_start = window_end
+
+        sampling = asyncio.create_task(sampler())
+        in_flight: set[asyncio.Task] = set()
+        scheduled = start
+        try:
+            while scheduled < deadline:
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(in_flight) >= args.concurrency:
+                    windows.current.dropped += 1
+                else:
+                    task = asyncio.create_task(
+                        send_one(
+                            client, args.url, args.method, args.text, windows, scheduled
+                        )
+                    )
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                scheduled += random.expovariate(args.rate)
+            await sampling
+        finally:
+            sampling.cancel()
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(sampling, *in_flight, return_exceptions=True)
+            if out:
+                out.close()
+    return rows
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="JSON-RPC endpoint, e.g. http://localhost:8084/")
+    parser.add_argument("--method", choices=METHODS, default="message/send")
+    parser.add_argument("--text", default="hello", help="Message text to send.")
+    parser.add_argument("--rate", type=float, default=5, help="Requests per second.")
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="Max requests in flight."
+    )
+    parser.add_argument("--duration", type=float, default=3600, help="Seconds.")
+    parser.add_argument(
+        "--interval", type=float, default=60, help="Seconds per sample window."
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=300, help="Seconds excluded from the fit."
+    )
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--pid", type=int, help="Sample this local process.")
+    parser.add_argument(
+        "--process-url", help="Process stats URL (default: <url>/debug/process)."
+    )
+    parser.add_argument("--out", help="Append each window as JSON lines here.")
+    parser.add_argument("--max-rss-mb-per-hour", type=float, default=10)
+    parser.add_argument("--max-sockets-per-hour", type=float, default=5)
+    parser.add_argument(
+        "--max-p99-drift", type=float, default=10, help="Percent per hour."
+    )
+    args = parser.parse_args(argv)
+    if not args.process_url:
+        args.process_url = urljoin(args.url, "/debug/process")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    rows = asyncio.run(run(args))
+    report = analyze(rows, args)
+    print_report(report)
+    return 1 if report["leaks"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
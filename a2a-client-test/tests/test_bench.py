@@ -0,0 +1,95 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bench  # noqa: E402
+from hdrhist import Histogram  # noqa: E402
+
+
+def result(latencies_ms, throughput=100.0, error_rate=0.0):
+    histogram = Histogram()
+    for value in latencies_ms:
+        histogram.record(int(value * 1000))
+    return {
+        "method": "message/send",
+        "throughput_rps": throughput,
+        "error_rate": error_rate,
+        "histogram": histogram.to_dict(),
+    }
+
+
+class TestMannWhitney(unittest.TestCase):
+
+    def test_identical_samples_are_not_significant(self):
+        values = [(v, 1) for v in range(100)]
+        effect, p_value = bench.mann_whitney(values, values)
+        self.assertAlmostEqual(effect, 0.5)
+        self.assertGreater(p_value, 0.4)
+
+    def test_shifted_sample_is_significant(self):
+        base = [(v, 1) for v in range(100)]
+        new = [(v + 30, 1) for v in range(100)]
+        effect, p_value = bench.mann_whitney(base, new)
+        self.assertGreater(effect, 0.7)
+        self.assertLess(p_value, 1e-6)
+
+    def test_faster_sample_is_not_a_regression(self):
+        base = [(v + 30, 1) for v in range(100)]
+        new = [(v, 1) for v in range(100)]
+        self.assertGreater(bench.mann_whitney(base, new)[1], 0.99)
+
+
+class TestCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def sample(self, mean):
+        return [self.rng.gauss(mean, mean / 10) for _ in range(500)]
+
+    def test_slower_run_is_flagged(self):
+        report = bench.compare(result(self.sample(100)), result(self.sample(130)))
+        self.assertEqual(len(report["regressions"]), 1)
+        self.assertIn("latency", report["regressions"][0])
+
+    def test_noise_is_not_flagged(self):
+        report = bench.compare(result(self.sample(100)), result(self.sample(100)))
+        self.assertEqual(report["regressions"], [])
+
+    def test_throughput_drop_is_flagged(self):
+        base = result(self.sample(100), throughput=100)
+        new = result(self.sample(100), throughput=80)
+        self.assertIn("throughput", bench.compare(base, new)["regressions"][0])
+
+
+class TestStore(unittest.TestCase):
+
+    def test_save_and_resolve(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = bench.save_result(result([1]), "aca", "v1", directory)
+            second = bench.save_result(result([2]), "aca", "v2", directory)
+            self.assertEqual(bench.resolve("aca:latest", directory), second)
+            self.assertEqual(bench.resolve("aca:v1", directory), first)
+            self.assertEqual(len(bench.list_results("aca", directory)), 2)
+            self.assertEqual(bench.load(second)["target"], "aca")
+            with self.assertRaises(SystemExit):
+                bench.resolve("aci:latest", directory)
+
+    def test_resolve_by_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = bench.save_result(result([1]), "aca", "v1", directory)
+            bench.save_result(result([2]), "aca", "v2", directory)
+            self.assertEqual(bench.resolve("aca:0", directory), first)
+            self.assertEqual(bench.resolve("aca:-2", directory), first)
+            for ref in ("aca:2", "aca:-3", "aca:--1"):
+                with self.assertRaisesRegex(SystemExit, "2 stored results"):
+                    bench.resolve(ref, directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
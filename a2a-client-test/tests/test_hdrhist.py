@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from hdrhist import Histogram, highest_equivalent, lowest_equivalent  # noqa: E402
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets_keep_three_significant_digits(self):
+        for value in (0, 1, 2047, 2048, 123456, 98765432):
+            low, high = lowest_equivalent(value), highest_equivalent(value)
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+            self.assertLessEqual(high - low, max(1, value) / 1000)
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 500)
+        self.assertEqual(histogram.percentile(99), 990)
+        self.assertEqual(histogram.percentile(100), 1000)
+        self.assertAlmostEqual(histogram.mean(), 500.5)
+
+    def test_merge_and_round_trip(self):
+        first, second = Histogram(), Histogram()
+        first.record(100, count=3)
+        second.record(5000)
+        first.merge(second)
+        copy = Histogram.from_dict(first.to_dict())
+        self.assertEqual(copy.total, 4)
+        self.assertEqual(copy.min, 100)
+        self.assertEqual(copy.max, 5000)
+        self.assertEqual(copy.percentile(75), 100)
+
+    def test_percentile_distribution(self):
+        histogram = Histogram()
+        for value in range(1000, 2000):
+            histogram.record(value)
+        text = histogram.percentile_distribution()
+        self.assertTrue(text.startswith("       Value"))
+        self.assertIn("#[Max     =        1.999, Total count    =         1000]", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import unittest
+
+try:
+    import httpx
+except ImportError:
+    raise unittest.SkipTest("needs httpx; pip install -r requirements.txt")
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import push  # noqa: E402
+
+
+def task(state, task_id="t1"):
+    return {"kind": "task", "id": task_id, "status": {"state": state}}
+
+
+class TestWebhookReceiver(unittest.IsolatedAsyncioTestCase):
+
+    async def test_wait_returns_the_final_task(self):
+        async with push.WebhookReceiver(token="secret") as receiver:
+            async with httpx.AsyncClient() as client:
+                headers = {push.TOKEN_HEADER: "secret"}
+                for state in ("working", "completed"):
+                    response = await client.post(
+                        receiver.url, json=task(state), headers=headers
+                    )
+                    self.assertEqual(response.status_code, 200)
+            result = await receiver.wait("t1", timeout=1)
+        self.assertEqual(result["status"]["state"], "completed")
+        self.assertEqual(receiver.received, 2)
+
+    async def test_rejects_a_wrong_token(self):
+        async with push.WebhookReceiver(token="secret") as receiver:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    receiver.url,
+                    json=task("completed"),
+                    headers={push.TOKEN_HEADER: "guess"},
+                )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(receiver.tasks, {})
+
+
+class TestPolling(unittest.IsolatedAsyncioTestCase):
+
+    async def test_submit_then_poll_until_final(self):
+        states = iter(["submitted", "working", "completed"])
+        methods = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            methods.append(body["method"])
+            if body["method"] == "message/send":
+                self.assertIs(body["params"]["configuration"]["blocking"], False)
+            result = task(next(states))
+            return httpx.Response(
+                200, json={"jsonrpc": "2.0", "id": 1, "result": result}
+            )
+
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            submitted = await push.submit(client, "http://agent/", "hello")
+            done = await push.poll(client, "http://agent/", submitted["id"], 0)
+        self.assertEqual(done["status"]["state"], "completed")
+        self.assertEqual(methods, ["message/send", "tasks/get", "tasks/get"])
+
+    def test_build_submit_with_webhook(self):
+        payload = push.build_submit("hi", "http://127.0.0.1:9099/", "tok")
+        config = payload["params"]["configuration"]
+        self.assertEqual(
+            config["pushNotificationConfig"],
+            {"url": "http://127.0.0.1:9099/", "token": "tok"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
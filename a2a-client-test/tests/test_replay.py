@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import httpx  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("needs httpx; pip install -r requirements.txt")
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import replay  # noqa: E402
+
+
+def rpc(text, context_id):
+    return {
+        "jsonrpc": "2.0",
+        "id": 7,
+        "method": "message/send",
+        "params": {
+            "message": {
+                "kind": "message",
+                "messageId": "m1",
+                "taskId": "t1",
+                "contextId": context_id,
+                "role": "user",
+                "parts": [{"kind": "text", "text": text}],
+            }
+        },
+    }
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_read_corpus_skips_blank_lines(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write('{"text": "a"}\n\n{"text": "b"}\n')
+        self.addCleanup(os.remove, f.name)
+        corpus = replay.read_corpus(f.name)
+        self.assertEqual(next(corpus), (1, {"text": "a"}))
+        self.assertEqual(list(corpus), [(3, {"text": "b"})])
+
+    def test_read_corpus_skips_malformed_lines(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write('{"text": "a"}\n{"text": \n[1, 2]\n{"text": "b"}\n')
+        self.addCleanup(os.remove, f.name)
+        skipped = []
+        with self.assertLogs(replay.logger, "WARNING"):
+            corpus = list(replay.read_corpus(f.name, skipped))
+        self.assertEqual(corpus, [(1, {"text": "a"}), (4, {"text": "b"})])
+        self.assertEqual(skipped, [2, 3])
+
+    def test_read_corpus_skips_bad_send_times(self):
+        lines = [
+            {"text": "a", "offset_s": 0},
+            {"text": "b", "offset_s": "soon"},
+            {"text": "c", "offset_s": None},
+            {"text": "d", "timestamp": "yesterday"},
+            {"text": "e", "offset_s": "nan"},
+            {"text": "f", "timestamp": "2025-01-01T00:00:10Z"},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+        self.addCleanup(os.remove, f.name)
+        skipped = []
+        with self.assertLogs(replay.logger, "WARNING"):
+            corpus = list(replay.read_corpus(f.name, skipped))
+        self.assertEqual([number for number, _ in corpus], [1, 6])
+        self.assertEqual(skipped, [2, 3, 4, 5])
+
+    def test_entry_time_accepts_utc_suffix(self):
+        self.assertEqual(
+            replay.entry_time({"timestamp": "2025-01-01T00:00:10Z"}),
+            replay.entry_time({"timestamp": "2025-01-01T00:00:10+00:00"}),
+        )
+
+    def test_schedule_keeps_original_timing(self):
+        corpus = enumerate(
+            [
+                {"timestamp": "2025-01-01T00:00:10+00:00"},
+                {"text": "no timing"},
+                {"timestamp": "2025-01-01T00:00:14+00:00"},
+                {"timestamp": "2025-01-01T00:00:12+00:00"},
+            ],
+            1,
+        )
+        offsets = [offset for offset, _, _ in replay.schedule(corpus, speed=2)]
+        # Out-of-order timestamps never move the schedule backwards.
+        self.assertEqual(offsets, [0.0, 0.0, 2.0, 2.0])
+
+    def test_schedule_at_fixed_rate(self):
+        corpus = enumerate([{"offset_s": 100}] * 50, 1)
+        offsets = [offset for offset, _, _ in replay.schedule(corpus, rate=10)]
+        self.assertEqual(offsets[0], 0.0)
+        self.assertLess(offsets[-1], 20)
+
+    def test_builds_message_from_text_fields(self):
+        builder = replay.PayloadBuilder("tasks/send")
+        payload = builder.build({"request_id": "r1", "body": "hello"})
+        self.assertEqual(payload["method"], "tasks/send")
+        self.assertIn("id", payload["params"])
+        parts = payload["params"]["message"]["parts"]
+        self.assertEqual(parts, [{"kind": "text", "text": "hello"}])
+        with self.assertRaises(ValueError):
+            builder.build({"unrelated": 1})
+
+    def test_refreshes_ids_of_json_rpc_requests(self):
+        builder = replay.PayloadBuilder("message/send")
+        first = builder.build(rpc("one", "c1"))
+        second = builder.build(rpc("two", "c1"))
+        other = builder.build(rpc("three", "c2"))
+        message = first["params"]["message"]
+        self.assertNotEqual(message["messageId"], "m1")
+        self.assertNotIn("taskId", message)
+        self.assertNotEqual(message["contextId"], "c1")
+        self.assertEqual(message["contextId"], second["params"]["message"]["contextId"])
+        self.assertNotEqual(
+            message["contextId"], other["params"]["message"]["contextId"]
+        )
+
+    def test_timing_fields_are_not_sent(self):
+        entry = rpc("one", "c1")
+        entry["offset_s"] = 1.5
+        entry["params"]["timestamp"] = "2025-01-01T00:00:10Z"
+        payload = replay.PayloadBuilder("message/send").build(entry)
+        self.assertEqual(set(payload), {"jsonrpc", "id", "method", "params"})
+        self.assertEqual(set(payload["params"]), {"message"})
+
+
+if __name__ == "__main__":
+    unittest.main()
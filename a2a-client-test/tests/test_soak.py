@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+try:
+    import httpx  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("needs httpx; pip install -r requirements.txt")
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import soak  # noqa: E402
+
+
+def rows(rss, p99, interval=60):
+    return [
+        {"t_s": (i + 1) * interval, "ok": 10, "rss_mb": r, "p99_ms": p}
+        for i, (r, p) in enumerate(zip(rss, p99))
+    ]
+
+
+class TestSoak(unittest.TestCase):
+
+    def setUp(self):
+        self.args = soak.parse_args(["http://localhost:8084/", "--warmup", "60"])
+
+    def test_fit_slope(self):
+        slope, intercept = soak.fit_slope([(0, 1), (1, 3), (2, 5)])
+        self.assertAlmostEqual(slope, 2)
+        self.assertAlmostEqual(intercept, 1)
+        self.assertIsNone(soak.fit_slope([(1, 1)]))
+        self.assertIsNone(soak.fit_slope([(1, 1), (1, 2)]))
+
+    def test_steady_run_has_no_leaks(self):
+        report = soak.analyze(rows([100] * 10, [50] * 10), self.args)
+        self.assertEqual(report["leaks"], [])
+        self.assertEqual(report["windows"], 9)
+
+    def test_flags_memory_growth_and_latency_drift(self):
+        # One MB and one millisecond more per minute: 60 MB/h, ~100%/h.
+        report = soak.analyze(
+            rows([100 + i for i in range(10)], [60 + i for i in range(10)]),
+            self.args,
+        )
+        self.assertAlmostEqual(report["slopes"]["rss_mb"]["per_hour"], 60)
+        self.assertEqual(len(report["leaks"]), 2)
+
+    def test_warmup_windows_are_ignored(self):
+        report = soak.analyze(rows([10, 500, 500, 500], [5, 5, 5, 5]), self.args)
+        self.assertEqual(report["leaks"], [])
+
+    def test_default_process_url(self):
+        self.assertEqual(self.args.process_url, "http://localhost:8084/debug/process")
+
+
+if __name__ == "__main__":
+    unittest.main()
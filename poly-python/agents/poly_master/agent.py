@@ -1,43 +1,52 @@
-from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools import load_memory
-from google.adk.tools.tool_context import ToolContext
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 import os
-import uvicorn
+import sys
 
-# poly master is running on 8085
-# Go Prime checker is on 8086
-# Python random number agent is on 8087
-# FUTURE Rust Prime Generator is on 8088
-# FUTURE 8089 TBD
-# FUTURE Java number factor is on 8090
-# Node Prime Generator is on 8091
+from google.adk.agents.llm_agent import LlmAgent
+
+# The shared src/a2a_runtime helpers, when this folder sits in the repository.
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src"))
+if os.path.isdir(os.path.join(_SRC, "a2a_runtime")) and _SRC not in sys.path:
+    sys.path.append(_SRC)
 
+try:
+    # Sub-agents are resolved by name; see a2a_runtime.registry for the port plan.
+    from a2a_runtime.remote import remote_agent
+except ImportError:
+    # adk deploy copies only this folder, so the port plan is not available:
+    # each sub-agent's URL has to be configured.
+    from google.adk.agents.remote_a2a_agent import (
+        AGENT_CARD_WELL_KNOWN_PATH,
+        RemoteA2aAgent,
+    )
+
+    def remote_agent(name: str, description: str) -> RemoteA2aAgent:
+        variable = f"A2A_AGENT_URL_{name.upper()}"
+        url = os.environ.get(variable)
+        if not url:
+            raise RuntimeError(
+                f"a2a_runtime is not importable: set {variable} to the URL of {name}"
+            )
+        return RemoteA2aAgent(
+            name=name,
+            description=description,
+            agent_card=url.split(",")[0].rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH,
+        )
+
+# poly master is running on 8085
 
-primecheck_agent = RemoteA2aAgent(
+primecheck_agent = remote_agent(
     name="primecheck_agent",
     description="This agent written in Go checks for primes",
-    agent_card=(
-        f"http://127.0.0.1:8086/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
-gen_agent = RemoteA2aAgent(
+gen_agent = remote_agent(
     name="primegenerator_agent",
     description="Prime Generation Agent written in JS",
-    agent_card=(
-        f"http://127.0.0.1:8091/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
-rand_agent = RemoteA2aAgent(
+rand_agent = remote_agent(
     name="rand_agent",
     description="Random Number Agent written in Python",
-    agent_card=(
-        f"http://127.0.0.1:8087/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
 root_agent = LlmAgent(
@@ -56,7 +65,7 @@ root_agent = LlmAgent(
 )
 
 if __name__ == "__main__":
-    a2a_app = to_a2a(root_agent, port=8085)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8085)
+    from a2a_runtime.server import serve
 
+    # serve() binds host='0.0.0.0' to allow external access.
+    serve(root_agent, port=8085)
@@ -2,8 +2,6 @@
 
 import random
 from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
-import uvicorn
 
 
 
@@ -53,7 +51,15 @@ root_agent = Agent(
 )
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    # Make the shared src/a2a_runtime helpers importable when run as a script.
+    sys.path.append(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../src"))
+    )
+    from a2a_runtime.server import serve
+
     PORT = 8087
-    a2a_app = to_a2a(root_agent, port=PORT)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=PORT)
+    # serve() binds host='0.0.0.0' to allow external access.
+    serve(root_agent, port=PORT)
@@ -0,0 +1,5 @@
+"""Shared serving helpers for the A2A agents in this repository.
+
+Submodules are imported explicitly by the agents that need them so that
+importing this package never pulls in ADK, A2A or uvicorn on its own.
+"""
@@ -0,0 +1,193 @@
+"""This module implements admission control and backpressure for A2A servers.
+
+An ``AdmissionController`` admits up to ``max_concurrent`` units of work and
+queues up to ``max_queue`` more. Queued work that waits longer than its
+deadline, or arrives while the queue is full, is rejected immediately instead
+of piling up behind a slow LLM or sub-agent.
+
+``AdmissionMiddleware`` applies a controller to the JSON-RPC endpoint and
+answers rejected calls with HTTP 429 and a JSON-RPC error.
+"""
+
+import asyncio
+import collections
+import contextlib
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from a2a_runtime.deadline import shorten
+from a2a_runtime.metrics import REGISTRY
+
+# JSON-RPC "server error" range; the A2A spec defines no overload code.
+OVERLOADED_ERROR_CODE = -32000
+
+_IN_FLIGHT = REGISTRY.gauge(
+    "a2a_admission_in_flight", "Units of work currently admitted.", ["limiter"]
+)
+_QUEUE_DEPTH = REGISTRY.gauge(
+    "a2a_admission_queue_depth", "Units of work waiting for a slot.", ["limiter"]
+)
+_REJECTED = REGISTRY.counter(
+    "a2a_admission_rejected_total", "Rejected units of work.", ["limiter", "reason"]
+)
+_QUEUE_WAIT = REGISTRY.histogram(
+    "a2a_admission_queue_wait_seconds", "Time spent queued.", ["limiter"]
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when work cannot be admitted; ``reason`` says why."""
+
+    def __init__(self, limiter: str, reason: str) -> None:
+        super().__init__(f"{limiter} is overloaded ({reason})")
+        self.limiter = limiter
+        self.reason = reason
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded, deadline-aware FIFO queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: collections.deque = collections.deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str) -> None:
+        _REJECTED.inc(limiter=self.name, reason=reason)
+        raise AdmissionRejected(self.name, reason)
+
+    def _update_gauges(self) -> None:
+        _IN_FLIGHT.set(self.active, limiter=self.name)
+        _QUEUE_DEPTH.set(len(self._waiters), limiter=self.name)
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """Waits for a slot.
+
+        Args:
+            timeout (float): Maximum queueing time; defaults to
+                ``queue_timeout``. The request deadline, if any, shortens it.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out.
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._update_gauges()
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        timeout = shorten(self.queue_timeout if timeout is None else timeout)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            self._update_gauges()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject("queue_timeout")
+        finally:
+            _QUEUE_WAIT.observe(time.monotonic() - started, limiter=self.name)
+
+    def release(self) -> None:
+        """Frees a slot, handing it straight to the oldest live waiter."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Context manager form of ``acquire``/``release``."""
+        await self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def overloaded_body(error: AdmissionRejected) -> bytes:
+    """Builds the JSON-RPC error returned with HTTP 429."""
+    return json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": OVERLOADED_ERROR_CODE,
+                "message": str(error),
+                "data": {"reason": error.reason},
+            },
+        }
+    ).encode()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting JSON-RPC POSTs through a controller.
+
+    The slot is held until the response has been fully sent, so streaming
+    responses count against the limit for as long as they run.
+    """
+
+    def __init__(
+        self, app, controller: AdmissionController, paths: tuple = ("/",)
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire()
+        except AdmissionRejected as e:
+            body = overloaded_body(e)
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 429,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
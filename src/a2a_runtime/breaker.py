@@ -0,0 +1,194 @@
+"""This module defines circuit breakers for calls to remote agents.
+
+A master keeps calling a sub-agent that is down, and every call waits for a
+connection error or a timeout. A ``CircuitBreaker`` counts consecutive
+failures of one downstream agent and, after ``failure_threshold`` of them,
+opens: calls fail at once for ``reset_timeout`` seconds. It then half-opens
+and lets ``half_open_calls`` calls through as probes. A successful probe
+closes it; a failed one opens it again for twice as long, up to
+``max_reset_timeout``.
+
+``a2a_runtime.remote`` gives each sub-agent a breaker from ``get_breaker``,
+applied by ``a2a_runtime.transport.BreakerTransport``. The master's model is
+told which sub-agents are unavailable (see
+``a2a_runtime.plugins.CircuitBreakerPlugin``), and ``GET /metrics`` and
+``GET /debug/breakers`` show every breaker's state. The master's background
+prober reports its health checks with ``probed``.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_STATE = REGISTRY.gauge(
+    "a2a_circuit_state",
+    "Circuit breaker state per downstream: 0 closed, 1 half-open, 2 open.",
+    ["downstream"],
+)
+_TRANSITIONS = REGISTRY.counter(
+    "a2a_circuit_transitions_total",
+    "Circuit breaker state changes.",
+    ["downstream", "state"],
+)
+_REJECTED = REGISTRY.counter(
+    "a2a_circuit_rejected_total",
+    "Calls failed fast by an open circuit breaker.",
+    ["downstream"],
+)
+
+
+class CircuitBreaker:
+    """Fails calls to one downstream fast while it keeps failing.
+
+    Args:
+        name (str): The downstream agent, used in metrics.
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open at first.
+        max_reset_timeout (float): Cap on the doubled open time.
+        half_open_calls (int): Probe calls allowed at once while half-open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self._open_for = reset_timeout
+        self._probes = 0
+        _STATE.set(0, downstream=name)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        _STATE.set(STATE_VALUES[state], downstream=self.name)
+        _TRANSITIONS.inc(downstream=self.name, state=state)
+
+    def available(self) -> bool:
+        """Returns False while open, before a probe is due."""
+        return self.state != OPEN or self.clock() >= self.opened_until
+
+    def retry_in(self) -> float:
+        """Returns the seconds until the next probe is allowed."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.opened_until - self.clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Returns whether a call may go through; call ``record`` after it."""
+        if self.state == OPEN:
+            if self.clock() < self.opened_until:
+                _REJECTED.inc(downstream=self.name)
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                _REJECTED.inc(downstream=self.name)
+                return False
+            self._probes += 1
+        return True
+
+    def record(self, ok: Optional[bool]) -> None:
+        """Records the outcome of an allowed call; None if it was cancelled."""
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+        if ok is None:
+            return
+        if ok:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._open_for = self.reset_timeout
+                self._transition(CLOSED)
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def probed(self, ok: bool) -> None:
+        """Applies a health check of the downstream made outside of calls.
+
+        While closed, a failed check counts like a failed call. While open, a
+        passed check makes the next call a probe at once.
+        """
+        if ok and self.state == OPEN:
+            self.opened_until = min(self.opened_until, self.clock())
+        elif not ok and self.state == CLOSED:
+            self.record(False)
+
+    def _open(self) -> None:
+        self.opened_until = self.clock() + self._open_for
+        self._probes = 0
+        self._transition(OPEN)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_s": round(self.retry_in(), 1),
+        }
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(name: str) -> Optional[CircuitBreaker]:
+    """Returns the shared breaker of a downstream, or None if disabled.
+
+    ``A2A_BREAKER_FAILURES`` (default 5, 0 disables breakers) and
+    ``A2A_BREAKER_RESET_SECONDS`` (default 30) configure new breakers.
+    """
+    failures = int(os.environ.get("A2A_BREAKER_FAILURES", 5))
+    if failures <= 0:
+        return None
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(
+                name,
+                failure_threshold=failures,
+                reset_timeout=float(os.environ.get("A2A_BREAKER_RESET_SECONDS", 30)),
+            )
+        return breaker
+
+
+def breaker_states() -> dict[str, dict[str, Any]]:
+    """Returns the state of every breaker, by downstream."""
+    return {name: breaker.snapshot() for name, breaker in _BREAKERS.items()}
+
+
+def unavailable_note(names: list[str]) -> Optional[str]:
+    """Returns the note telling a model which sub-agents are unavailable."""
+    down = []
+    for name in names:
+        breaker = _BREAKERS.get(name)
+        if breaker is not None and not breaker.available():
+            down.append(f"{name} (retry in {breaker.retry_in():.0f}s)")
+    if not down:
+        return None
+    return (
+        "These agents are unavailable right now; do not transfer to them, and "
+        f"tell the user they are temporarily unavailable: {', '.join(down)}."
+    )
@@ -0,0 +1,223 @@
+"""This module answers bulk queries without one LLM round trip per item.
+
+Dashboards ask the same question, such as the weather, for hundreds of
+cities. Sending each one through a master and its sub-agent costs two model
+calls per city. Bulk queries skip the models:
+
+*   A master serves ``POST /bulk`` with ``bulk_route``. It splits the items
+    into chunks, sends the chunks to the sub-agent concurrently and streams
+    one NDJSON line per item as the chunks complete. Each item names a
+    ``query`` and its arguments::
+
+        {"items": [{"query": "weather", "city": "Paris"}, ...],
+         "chunk_size": 25}
+
+*   The sub-agent, served with ``bulk_tools=True`` (see
+    ``a2a_runtime.server``), gets each chunk as a single A2A message whose
+    ``DataPart`` lists tool calls under ``BULK_DATA_KEY``. It runs them
+    concurrently and returns their results in a ``DataPart`` artifact,
+    without calling its model.
+
+Only the root agent's own function tools can be called this way, and only
+those without a ``tool_context``.
+"""
+
+import asyncio
+import inspect
+import logging
+import uuid
+from typing import Any, AsyncIterator, Callable, Optional
+
+from a2a_runtime import codec
+from a2a_runtime.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+BULK_DATA_KEY = "a2a_bulk_calls"
+BULK_RESULTS_KEY = "a2a_bulk_results"
+DEFAULT_CHUNK_SIZE = 25
+DEFAULT_CONCURRENCY = 8
+MAX_ITEMS = 10000
+
+_CALLS = REGISTRY.counter(
+    "a2a_bulk_calls_total", "Tool calls answered in bulk.", ["tool", "status"]
+)
+
+
+def tool_table(agent: Any) -> dict[str, Callable]:
+    """Returns the agent's function tools that bulk calls may use, by name."""
+    table = {}
+    for tool in getattr(agent, "tools", None) or []:
+        func = getattr(tool, "func", tool)
+        if not callable(func) or not hasattr(func, "__name__"):
+            continue
+        if "tool_context" in inspect.signature(func).parameters:
+            continue
+        table[func.__name__] = func
+    return table
+
+
+def bulk_calls(message: Any) -> Optional[list[dict[str, Any]]]:
+    """Returns the tool calls of a bulk message, or None for other messages."""
+    for part in getattr(message, "parts", None) or []:
+        data = getattr(part.root, "data", None)
+        if isinstance(data, dict) and isinstance(data.get(BULK_DATA_KEY), list):
+            return data[BULK_DATA_KEY]
+    return None
+
+
+async def call_tool(tools: dict[str, Callable], call: dict[str, Any]) -> dict:
+    """Runs one call; failures become an error result like the tools return."""
+    name = call.get("tool")
+    func = tools.get(name)
+    if func is None:
+        result = {"status": "error", "error_message": f"Unknown tool {name!r}"}
+    else:
+        try:
+            if inspect.iscoroutinefunction(func):
+                result = await func(**call.get("args", {}))
+            else:
+                result = await asyncio.to_thread(func, **call.get("args", {}))
+        except Exception as e:
+            result = {"status": "error", "error_message": f"{type(e).__name__}: {e}"}
+    if not isinstance(result, dict):
+        result = {"status": "success", "result": result}
+    _CALLS.inc(tool=name, status=result.get("status", "success"))
+    return result
+
+
+async def run_bulk(
+    tools: dict[str, Callable], calls: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Runs ``calls`` concurrently and returns their results in order."""
+    return list(await asyncio.gather(*(call_tool(tools, call) for call in calls)))
+
+
+def to_calls(
+    items: list[dict[str, Any]], queries: dict[str, str]
+) -> list[dict[str, Any]]:
+    """Turns ``{"query": ..., **args}`` items into tool calls.
+
+    Raises:
+        ValueError: If an item is not an object or names an unknown query.
+    """
+    calls = []
+    for item in items:
+        if not isinstance(item, dict) or item.get("query") not in queries:
+            raise ValueError(f"Each item needs a query in {sorted(queries)}: {item}")
+        args = {key: value for key, value in item.items() if key != "query"}
+        calls.append({"tool": queries[item["query"]], "args": args})
+    return calls
+
+
+async def send_chunk(agent: Any, calls: list[dict[str, Any]]) -> list[dict]:
+    """Sends one chunk of calls to a remote sub-agent and returns the results.
+
+    The call goes through ``a2a_runtime.remote.remote_client``, so it is
+    balanced, limited and hedged like the agent's other calls.
+    """
+    from a2a.types import DataPart, Message, Part, Role, Task
+
+    from a2a_runtime.remote import remote_client
+
+    client = await remote_client(agent.name)
+    message = Message(
+        message_id=str(uuid.uuid4()),
+        role=Role.user,
+        parts=[Part(root=DataPart(data={BULK_DATA_KEY: calls}))],
+    )
+    async for response in client.send_message(message):
+        task = response[0] if isinstance(response, tuple) else response
+        if not isinstance(task, Task):
+            continue
+        for artifact in task.artifacts or []:
+            for part in artifact.parts:
+                data = getattr(part.root, "data", None) or {}
+                if BULK_RESULTS_KEY in data:
+                    return data[BULK_RESULTS_KEY]
+        state = task.status.state.value
+        raise RuntimeError(f"{agent.name} returned a {state} task without results")
+    raise RuntimeError(f"{agent.name} did not answer the bulk call")
+
+
+async def stream_bulk(
+    agent: Any,
+    items: list[dict[str, Any]],
+    queries: dict[str, str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yields one result per item, chunk by chunk, as the chunks complete.
+
+    Each result is the item with its ``index`` and the tool's result fields.
+    Items of a failed chunk get ``status`` ``"error"``.
+    """
+    calls = to_calls(items, queries)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(start: int) -> tuple[int, list[dict]]:
+        chunk = calls[start:][:chunk_size]
+        async with semaphore:
+            try:
+                return start, await send_chunk(agent, chunk)
+            except Exception as e:
+                logger.warning("Bulk chunk at %d failed: %s", start, e)
+                error = {"status": "error", "error_message": str(e) or type(e).__name__}
+                return start, [error] * len(chunk)
+
+    tasks = [
+        asyncio.create_task(run(start)) for start in range(0, len(calls), chunk_size)
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            start, results = await done
+            for offset, result in enumerate(results):
+                index = start + offset
+                yield {"index": index, **items[index], **result}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def bulk_route(
+    agent: Any,
+    queries: dict[str, str],
+    path: str = "/bulk",
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Any:
+    """Returns a Starlette route that answers bulk queries through ``agent``.
+
+    Pass the route to ``a2a_runtime.server.build_app``, which applies
+    admission control and deadlines to it.
+
+    Args:
+        agent: The sub-agent to delegate to, built by
+            ``a2a_runtime.remote.remote_agent``.
+        queries (dict[str, str]): Maps the item ``query`` values to the
+            sub-agent's tool names.
+        path (str): Where to serve the route.
+        concurrency (int): Chunks in flight per request.
+    """
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route
+
+    async def bulk(request):
+        try:
+            body = codec.loads(await request.body())
+            items = body["items"]
+            chunk_size = max(int(body.get("chunk_size", DEFAULT_CHUNK_SIZE)), 1)
+            if not isinstance(items, list) or len(items) > MAX_ITEMS:
+                raise ValueError(f"items must be a list of at most {MAX_ITEMS}")
+            to_calls(items, queries)
+        except (KeyError, TypeError, ValueError) as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
+        async def lines():
+            async for result in stream_bulk(
+                agent, items, queries, chunk_size, concurrency
+            ):
+                yield codec.dumps(result) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return Route(path, bulk, methods=["POST"])
@@ -0,0 +1,211 @@
+"""This module coalesces identical concurrent ``message/send`` calls.
+
+When many clients send the same message at the same moment, for example
+dashboards polling ``events_agent``, ``CoalescingMiddleware`` runs the first
+call (the leader) and holds the identical ones (the followers) until it
+finishes. Each follower then gets the leader's response with its own
+JSON-RPC ``id``, so a thundering herd costs one agent run.
+
+Only calls that start a new conversation are coalesced: ``message/send``
+without a ``contextId``, ``taskId`` or ``referenceTaskIds``. Two calls are
+identical when their message parts, metadata, configuration and
+``Authorization`` header match. Followers share the leader's task and context
+ids and its outcome: if the leader raises, they get a JSON-RPC internal error.
+Only if the leader is cancelled, for example because its client went away,
+does one follower run in its place. Nothing is kept once the leader finishes,
+so this never serves stale answers.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Optional
+
+from a2a_runtime import codec
+from a2a_runtime.deadline import record_expired, remaining, send_expired
+from a2a_runtime.metrics import REGISTRY
+
+COALESCED_METHODS = ("message/send",)
+INTERNAL_ERROR_CODE = -32603
+
+_COALESCED = REGISTRY.counter(
+    "a2a_coalesced_requests_total",
+    "Coalescable calls that ran (leader) or shared a leader's result.",
+    ["role"],
+)
+
+
+def coalesce_key(request: Any, authorization: bytes = b"") -> Optional[str]:
+    """Returns the key shared by identical calls, or None if not coalescable."""
+    if not isinstance(request, dict) or request.get("method") not in (
+        COALESCED_METHODS
+    ):
+        return None
+    params = request.get("params") or {}
+    message = params.get("message") if isinstance(params, dict) else None
+    # Malformed calls run on their own and get the handler's protocol error.
+    if not isinstance(message, dict):
+        return None
+    if any(message.get(f) for f in ("contextId", "taskId", "referenceTaskIds")):
+        return None
+    identity = {
+        "method": request["method"],
+        "role": message.get("role"),
+        "parts": message.get("parts"),
+        "message_metadata": message.get("metadata"),
+        "extensions": message.get("extensions"),
+        "configuration": params.get("configuration"),
+        "metadata": params.get("metadata"),
+        "authorization": authorization.decode("latin-1"),
+    }
+    serialized = json.dumps(identity, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def with_request_id(body: bytes, request_id: Any) -> bytes:
+    """Returns a JSON-RPC response body answering ``request_id``."""
+    try:
+        response = codec.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(response, dict) or "jsonrpc" not in response:
+        return body
+    response["id"] = request_id
+    return codec.dumps(response)
+
+
+class _Response:
+    """A response captured from the leader while it is sent."""
+
+    def __init__(self, send) -> None:
+        self._send = send
+        self.status = 500
+        self.headers: list = []
+        self.chunks: list[bytes] = []
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = [
+                (name, value)
+                for name, value in message.get("headers", [])
+                if name.lower() != b"content-length"
+            ]
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+        await self._send(message)
+
+    @classmethod
+    def failed(cls, error: Exception) -> "_Response":
+        """Returns the response followers get when the leader raised ``error``."""
+        response = cls(None)
+        response.headers = [(b"content-type", b"application/json")]
+        response.chunks = [
+            codec.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {
+                        "code": INTERNAL_ERROR_CODE,
+                        "message": f"Internal error: {type(error).__name__}",
+                    },
+                }
+            )
+        ]
+        return response
+
+    async def replay(self, send, request_id: Any) -> None:
+        body = with_request_id(b"".join(self.chunks), request_id)
+        headers = [*self.headers, (b"content-length", str(len(body)).encode())]
+        await send(
+            {"type": "http.response.start", "status": self.status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class CoalescingMiddleware:
+    """ASGI middleware sharing one execution among identical in-flight calls.
+
+    Install it outside ``AdmissionMiddleware`` so that followers do not take
+    admission slots. A follower waits no longer than its own deadline. If the
+    leader is cancelled, the first follower to wake up leads in its place.
+    """
+
+    def __init__(self, app, paths: tuple = ("/",)) -> None:
+        self.app = app
+        self.paths = paths
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        body = await _read_body(receive)
+        receive = _replay_body(body, receive)
+        try:
+            request = codec.loads(body)
+        except ValueError:
+            request = None
+        headers = dict(scope.get("headers") or [])
+        key = coalesce_key(request, headers.get(b"authorization", b""))
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        while key in self._in_flight:
+            _COALESCED.inc(role="follower")
+            try:
+                response = await asyncio.wait_for(
+                    asyncio.shield(self._in_flight[key]), remaining()
+                )
+            except asyncio.TimeoutError:
+                record_expired("coalesced")
+                await send_expired(send)
+                return
+            if response is not None:
+                await response.replay(send, request.get("id"))
+                return
+
+        _COALESCED.inc(role="leader")
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        response = _Response(send)
+        outcome = None
+        try:
+            await self.app(scope, receive, response.send)
+            outcome = response
+        except Exception as e:
+            outcome = _Response.failed(e)
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            future.set_result(outcome)
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive):
+    """Returns a ``receive`` that yields ``body`` once, then the original."""
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def replay():
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return replay
@@ -0,0 +1,202 @@
+"""This module picks the fastest available JSON codec for A2A payloads.
+
+``dumps`` and ``loads`` use ``orjson`` when it is installed, then
+``msgspec``, then the standard library; ``A2A_JSON_CODEC`` (``orjson``,
+``msgspec`` or ``json``) forces one. All backends produce compact UTF-8 JSON
+and raise ``ValueError`` on invalid input. Neither package is required:
+``pip install orjson`` on a server to enable the fast path.
+
+Pydantic models, such as the A2A SDK's responses, are best serialized with
+their own ``model_dump_json``, which is implemented in Rust as well; see
+``a2a_runtime.jsonrpc``.
+
+Run this module to compare the codecs on a task whose history grows with the
+conversation, as returned by ``message/send``:
+
+    python src/a2a_runtime/codec.py --turns 1 10 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import timeit
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Bytes = Union[bytes, bytearray, memoryview, str]
+
+
+def _stdlib() -> tuple[Callable[[Any], bytes], Callable[[Bytes], Any]]:
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+    return dumps, json.loads
+
+
+def _orjson() -> tuple[Callable[[Any], bytes], Callable[[Bytes], Any]]:
+    import orjson
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    return dumps, orjson.loads
+
+
+def _msgspec() -> tuple[Callable[[Any], bytes], Callable[[Bytes], Any]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    return encoder.encode, loads
+
+
+BACKENDS = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+
+
+def available_backends() -> dict[str, tuple[Callable, Callable]]:
+    """Returns ``(dumps, loads)`` for every installed backend, fastest first."""
+    available = {}
+    for name, load in BACKENDS.items():
+        try:
+            available[name] = load()
+        except ImportError:
+            continue
+    return available
+
+
+def _select(requested: Optional[str]) -> tuple[str, Callable, Callable]:
+    if requested and requested not in BACKENDS:
+        raise ValueError(f"Unknown A2A_JSON_CODEC {requested!r}")
+    for name in [requested] if requested else BACKENDS:
+        try:
+            return (name, *BACKENDS[name]())
+        except ImportError:
+            if requested:
+                logger.warning("A2A_JSON_CODEC=%s is not installed; using json", name)
+    return ("json", *_stdlib())
+
+
+BACKEND, dumps, loads = _select(os.environ.get("A2A_JSON_CODEC"))
+
+
+def sample_task(turns: int, text_chars: int = 400) -> dict[str, Any]:
+    """Returns a ``message/send`` response whose task has ``turns`` turns."""
+    history = []
+    for turn in range(turns):
+        for role in ("user", "agent"):
+            history.append(
+                {
+                    "kind": "message",
+                    "messageId": f"{role}-{turn:08d}-0000-0000-000000000000",
+                    "contextId": "c0ffee00-0000-0000-0000-000000000000",
+                    "taskId": "7a5c0000-0000-0000-0000-000000000000",
+                    "role": role,
+                    "parts": [{"kind": "text", "text": "é" + "x" * text_chars}],
+                    "metadata": {"adk_author": "weathertime_agent"},
+                }
+            )
+    return {
+        "jsonrpc": "2.0",
+        "id": "4b1d0000-0000-0000-0000-000000000000",
+        "result": {
+            "kind": "task",
+            "id": "7a5c0000-0000-0000-0000-000000000000",
+            "contextId": "c0ffee00-0000-0000-0000-000000000000",
+            "status": {"state": "completed", "timestamp": "2025-01-01T00:00:00Z"},
+            "history": history,
+            "artifacts": [
+                {"artifactId": "a1", "parts": [{"kind": "text", "text": "done"}]}
+            ],
+            "metadata": {"token_usage": {"total": {"prompt_tokens": 1200}}},
+        },
+    }
+
+
+def _pydantic_codecs(payload: dict[str, Any]) -> dict[str, tuple[Callable, Callable]]:
+    """Returns the SDK model round trips, if the A2A SDK is installed."""
+    try:
+        from a2a.types import SendMessageResponse
+    except ImportError:
+        return {}
+    model = SendMessageResponse.model_validate(payload)
+    return {
+        "pydantic+json": (
+            # What Starlette's JSONResponse does with a dumped model.
+            lambda: json.dumps(
+                model.root.model_dump(mode="json", exclude_none=True),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode(),
+            lambda data: SendMessageResponse.model_validate(json.loads(data)),
+        ),
+        "pydantic_json": (
+            lambda: model.root.model_dump_json(exclude_none=True).encode(),
+            SendMessageResponse.model_validate_json,
+        ),
+    }
+
+
+def benchmark(turns: int, number: int = 0) -> list[dict[str, Any]]:
+    """Times encoding and decoding a ``sample_task`` with every codec.
+
+    Args:
+        turns (int): Conversation turns in the task history.
+        number (int): Runs per measurement; 0 picks enough for ~0.2s.
+
+    Returns:
+        list[dict]: One row per codec with its size and microseconds per op.
+    """
+    payload = sample_task(turns)
+    encoded = json.dumps(payload).encode()
+    rows = []
+    codecs = {
+        name: (lambda d=d: d(payload), loads)
+        for name, (d, loads) in available_backends().items()
+    }
+    codecs.update(_pydantic_codecs(payload))
+    for name, (encode, decode) in codecs.items():
+        timer = timeit.Timer(encode)
+        runs = number or timer.autorange()[0]
+        encode_s = min(timer.repeat(3, runs)) / runs
+        timer = timeit.Timer(lambda decode=decode: decode(encoded))
+        decode_s = min(timer.repeat(3, runs)) / runs
+        rows.append(
+            {
+                "codec": name,
+                "turns": turns,
+                "bytes": len(encode()),
+                "encode_us": encode_s * 1e6,
+                "decode_us": decode_s * 1e6,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON codecs.")
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--number", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"Selected backend: {BACKEND}")
+    print(
+        f"{'codec':<15} {'turns':>6} {'bytes':>9} {'encode_us':>11} {'decode_us':>11}"
+    )
+    for turns in args.turns:
+        for row in benchmark(turns, args.number):
+            print(
+                f"{row['codec']:<15} {row['turns']:>6} {row['bytes']:>9} "
+                f"{row['encode_us']:>11.1f} {row['decode_us']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
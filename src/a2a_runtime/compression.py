@@ -0,0 +1,146 @@
+"""This module compresses HTTP responses with the encoding a client accepts.
+
+``CompressionMiddleware`` reads ``Accept-Encoding`` and compresses JSON and
+text responses of at least ``min_size`` bytes with zstd, when a zstd module is
+installed (``compression.zstd`` on Python 3.14, otherwise the ``zstandard``
+package), or gzip. Server-sent event streams are passed through untouched, so
+events are never held back by the compressor. A strong ``ETag`` on a
+compressed response is made weak, as the bytes on the wire changed.
+
+httpx and the A2A SDK clients send ``Accept-Encoding`` and decompress
+transparently; httpx only decodes zstd when ``zstandard`` is installed.
+"""
+
+import gzip
+from typing import Callable, Optional
+
+from a2a_runtime.etag import weaken
+from a2a_runtime.metrics import REGISTRY
+
+DEFAULT_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = (b"application/json", b"text/plain")
+
+_BYTES = REGISTRY.counter(
+    "a2a_response_bytes_total",
+    "Response body bytes before and after compression.",
+    ["encoding", "stage"],
+)
+
+
+def _zstd_compressor() -> Optional[Callable[[bytes], bytes]]:
+    try:
+        from compression import zstd
+
+        return lambda data: zstd.compress(data, level=3)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard.ZstdCompressor(level=3).compress
+
+
+def available_encodings() -> dict[str, Callable[[bytes], bytes]]:
+    """Returns the supported encodings, preferred first."""
+    encodings = {}
+    zstd = _zstd_compressor()
+    if zstd is not None:
+        encodings["zstd"] = zstd
+    encodings["gzip"] = lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    return encodings
+
+
+def negotiate(accept_encoding: str, encodings: dict) -> Optional[str]:
+    """Returns the preferred encoding ``accept_encoding`` allows, if any.
+
+    Encodings with ``q=0`` are refused; other quality values are ignored in
+    favour of the server's own preference order.
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if name and not (params and quality.strip("0.") == ""):
+            accepted.add(name.strip())
+    for name in encodings:
+        if name in accepted or "*" in accepted:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete JSON and text responses.
+
+    Args:
+        app: The wrapped ASGI application.
+        min_size (int): Smallest body worth compressing, in bytes.
+    """
+
+    def __init__(self, app, min_size: int = DEFAULT_MIN_SIZE) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate(
+            headers.get(b"accept-encoding", b"").decode("latin-1"), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def compressing_send(message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start = message
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"")
+                if (
+                    b"content-encoding" in response_headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    await self._send_compressed(send, start, b"".join(chunks), encoding)
+            else:
+                await send(message)
+
+        await self.app(scope, receive, compressing_send)
+
+    async def _send_compressed(self, send, start, body: bytes, encoding: str) -> None:
+        headers = [
+            (name, value)
+            for name, value in start.get("headers") or []
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"vary", b"Accept-Encoding"))
+        if len(body) >= self.min_size:
+            _BYTES.inc(len(body), encoding=encoding, stage="identity")
+            body = self.encodings[encoding](body)
+            _BYTES.inc(len(body), encoding=encoding, stage="compressed")
+            headers = [
+                (
+                    (name, weaken(value.decode("latin-1")).encode("latin-1"))
+                    if name.lower() == b"etag"
+                    else (name, value)
+                )
+                for name, value in headers
+            ]
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,206 @@
+"""This module caches each agent's static prompt prefix in Gemini.
+
+Every model call re-sends the agent's system instruction, including the
+routing rules ADK adds for sub-agents, and its tool declarations.
+``PrefixCache`` uploads that prefix once per agent as a Gemini
+``CachedContent`` and rewrites later requests to reference it by name. The
+cache is kept alive by extending its TTL shortly before it expires. It is
+recreated when Gemini no longer knows it or when the prefix changes.
+
+Requests keep the prefix inline when:
+
+*   the model is not a Gemini model, such as the local mock;
+*   the prefix is estimated below ``min_tokens`` (Gemini rejects smaller
+    caches);
+*   ADK's own session-level ``context_cache_config`` handles the request;
+*   creating the cache failed; it is retried after ``retry_after`` seconds.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Optional
+
+from a2a_runtime.history import CHARS_PER_TOKEN
+from a2a_runtime.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MIN_TOKENS = 1024
+
+_REQUESTS = REGISTRY.counter(
+    "a2a_context_cache_requests_total",
+    "Model calls by whether the static prefix came from the cache.",
+    ["agent", "result"],
+)
+_OPERATIONS = REGISTRY.counter(
+    "a2a_context_cache_operations_total",
+    "Prefix cache creations, refreshes and failures.",
+    ["agent", "operation"],
+)
+
+
+def _dump(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+
+@dataclasses.dataclass
+class CachedPrefix:
+    """The cache of one agent's prefix; ``name`` is None while inline."""
+
+    name: Optional[str]
+    fingerprint: str
+    expires_at: float
+
+
+class PrefixCache:
+    """Keeps one Gemini ``CachedContent`` per agent for its static prefix.
+
+    Args:
+        ttl (int): Seconds a cache lives without being refreshed.
+        min_tokens (int): Smallest estimated prefix worth caching.
+        refresh_margin (float): Seconds before expiry at which the TTL is
+            extended.
+        retry_after (float): Seconds to stay inline after a failure.
+    """
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+        refresh_margin: float = 60.0,
+        retry_after: float = 300.0,
+        clock=time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self.refresh_margin = min(refresh_margin, ttl / 2)
+        self.retry_after = retry_after
+        self._clock = clock
+        self._entries: dict[str, CachedPrefix] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def prefix(llm_request: Any) -> Optional[dict[str, Any]]:
+        """Returns the cacheable part of a request, or None if it has none."""
+        config = llm_request.config
+        if config is None or not (config.system_instruction or config.tools):
+            return None
+        return {
+            "model": llm_request.model,
+            "system_instruction": _dump(config.system_instruction),
+            "tools": [_dump(tool) for tool in config.tools or []],
+            "tool_config": _dump(config.tool_config),
+        }
+
+    async def apply(self, key: str, client: Any, llm_request: Any) -> bool:
+        """Makes ``llm_request`` reference the cached prefix of ``key``.
+
+        Args:
+            key (str): The agent name.
+            client: The ``google.genai`` client of a Gemini model, or None
+                for any other model.
+            llm_request: The ADK ``LlmRequest``, rewritten in place.
+
+        Returns:
+            bool: True if the request now uses the cache.
+        """
+        prefix = self.prefix(llm_request)
+        if (
+            prefix is None
+            or llm_request.cache_config is not None
+            or llm_request.config.cached_content
+        ):
+            return False
+        entry = None
+        if client is not None:
+            serialized = json.dumps(prefix, sort_keys=True, default=str)
+            fingerprint = hashlib.sha256(serialized.encode()).hexdigest()[:16]
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                entry = await self._ensure(
+                    key, fingerprint, len(serialized), client, llm_request
+                )
+        if entry is None or entry.name is None:
+            _REQUESTS.inc(agent=key, result="inline")
+            return False
+        config = llm_request.config
+        config.cached_content = entry.name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+        _REQUESTS.inc(agent=key, result="cached")
+        return True
+
+    def invalidate(self, key: str) -> None:
+        """Forgets the cache of ``key``, e.g. after Gemini rejected it."""
+        self._entries.pop(key, None)
+
+    async def _ensure(
+        self, key: str, fingerprint: str, chars: int, client: Any, llm_request: Any
+    ) -> CachedPrefix:
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            if entry.name is None and now < entry.expires_at:
+                return entry
+            if entry.name is not None:
+                if now < entry.expires_at - self.refresh_margin:
+                    return entry
+                if await self._extend(key, client, entry):
+                    return entry
+        if chars / CHARS_PER_TOKEN < self.min_tokens:
+            fresh = CachedPrefix(None, fingerprint, math.inf)
+        else:
+            fresh = await self._create(key, fingerprint, client, llm_request)
+        if entry is not None and entry.name and entry.fingerprint != fingerprint:
+            await self._delete(client, entry.name)
+        self._entries[key] = fresh
+        return fresh
+
+    async def _create(
+        self, key: str, fingerprint: str, client: Any, llm_request: Any
+    ) -> CachedPrefix:
+        config = llm_request.config
+        try:
+            cached = await client.aio.caches.create(
+                model=llm_request.model,
+                config={
+                    "system_instruction": config.system_instruction,
+                    "tools": config.tools,
+                    "tool_config": config.tool_config,
+                    "ttl": f"{self.ttl}s",
+                    "display_name": f"a2a-{key}-{fingerprint}",
+                },
+            )
+        except Exception as e:
+            logger.warning("Keeping the prompt prefix of %s inline: %s", key, e)
+            _OPERATIONS.inc(agent=key, operation="create_failed")
+            return CachedPrefix(None, fingerprint, self._clock() + self.retry_after)
+        logger.info("Cached the prompt prefix of %s as %s", key, cached.name)
+        _OPERATIONS.inc(agent=key, operation="create")
+        return CachedPrefix(cached.name, fingerprint, self._clock() + self.ttl)
+
+    async def _extend(self, key: str, client: Any, entry: CachedPrefix) -> bool:
+        try:
+            await client.aio.caches.update(
+                name=entry.name, config={"ttl": f"{self.ttl}s"}
+            )
+        except Exception as e:
+            logger.info("Recreating prompt cache %s: %s", entry.name, e)
+            return False
+        entry.expires_at = self._clock() + self.ttl
+        _OPERATIONS.inc(agent=key, operation="refresh")
+        return True
+
+    async def _delete(self, client: Any, name: str) -> None:
+        try:
+            await client.aio.caches.delete(name=name)
+        except Exception as e:
+            logger.debug("Could not delete prompt cache %s: %s", name, e)
@@ -0,0 +1,157 @@
+"""This module propagates request deadlines across A2A hops.
+
+The remaining budget travels in the ``X-A2A-Deadline-Ms`` request header as
+milliseconds, so hops do not need synchronized clocks. A server converts the
+header into a monotonic deadline held in a context variable. Work started for
+the request, including the ADK run and calls to sub-agents, inherits it:
+
+*   ``DeadlineMiddleware`` sets the deadline for each JSON-RPC call.
+*   ``a2a_runtime.executor.DeadlineAgentExecutor`` fails the task once the
+    deadline passes, which cancels the agent run. Non-blocking calls return
+    at once, so their tasks get a separate task timeout instead.
+*   ``a2a_runtime.transport.DeadlineTransport`` forwards the remaining budget
+    and times out calls to sub-agents when it runs out.
+"""
+
+import contextvars
+import json
+import time
+from typing import Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+DEADLINE_HEADER = "x-a2a-deadline-ms"
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "a2a_deadline", default=None
+)
+
+_EXPIRED = REGISTRY.counter(
+    "a2a_deadline_exceeded_total", "Requests that ran out of time.", ["where"]
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request deadline passes."""
+
+    def __init__(self, message: str = "Deadline exceeded") -> None:
+        super().__init__(message)
+
+
+def set_deadline(timeout: Optional[float]) -> contextvars.Token:
+    """Sets the deadline ``timeout`` seconds from now, keeping any earlier one.
+
+    Returns:
+        Token: Pass it to ``reset_deadline`` to restore the previous deadline.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    return _deadline.set(deadline)
+
+
+def replace_deadline(timeout: Optional[float]) -> contextvars.Token:
+    """Sets the deadline ``timeout`` seconds from now, dropping any other one.
+
+    For work that outlives the request that started it.
+    """
+    return _deadline.set(None if timeout is None else time.monotonic() + timeout)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Returns the seconds left before the deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def shorten(timeout: Optional[float]) -> Optional[float]:
+    """Returns the smaller of ``timeout`` and the remaining budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def record_expired(where: str) -> None:
+    _EXPIRED.inc(where=where)
+
+
+def parse_header(value: Optional[bytes]) -> Optional[float]:
+    """Parses an ``X-A2A-Deadline-Ms`` value into seconds; None if invalid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, int(value) / 1000)
+    except ValueError:
+        return None
+
+
+def format_header(seconds: float) -> str:
+    return str(max(0, int(seconds * 1000)))
+
+
+async def send_expired(send) -> None:
+    """Answers an ASGI request with HTTP 504 and a JSON-RPC error."""
+    body = json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32000, "message": "Deadline exceeded"},
+        }
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class DeadlineMiddleware:
+    """ASGI middleware setting the deadline for each JSON-RPC call.
+
+    The deadline comes from the ``X-A2A-Deadline-Ms`` header, capped at
+    ``default_timeout`` when one is set. Calls that arrive already expired
+    are answered with HTTP 504 without doing any work.
+    """
+
+    def __init__(
+        self, app, default_timeout: Optional[float] = None, paths: tuple = ("/",)
+    ) -> None:
+        self.app = app
+        self.default_timeout = default_timeout
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        timeout = parse_header(headers.get(DEADLINE_HEADER.encode()))
+        if self.default_timeout is not None:
+            timeout = (
+                self.default_timeout
+                if timeout is None
+                else min(timeout, self.default_timeout)
+            )
+        if timeout is not None and timeout <= 0:
+            record_expired("server")
+            await send_expired(send)
+            return
+        token = set_deadline(timeout)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
@@ -0,0 +1,32 @@
+"""This module implements the entity tags used for conditional GETs.
+
+Static responses, such as the agent card, carry a strong ``ETag`` computed
+from their bytes. ``CompressionMiddleware`` weakens it when it re-encodes a
+body, as the compressed bytes differ, and ``etag_matches`` compares tags
+weakly, as ``If-None-Match`` requires.
+"""
+
+import hashlib
+from typing import Optional
+
+
+def strong_etag(body: bytes) -> str:
+    """Returns a quoted strong entity tag for ``body``."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def weaken(etag: str) -> str:
+    """Returns the weak form of ``etag``."""
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Returns True if an ``If-None-Match`` header matches ``etag``."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
@@ -0,0 +1,127 @@
+"""This module defines the A2A agent executor used by ``a2a_runtime.server``.
+
+It imports ADK at module level, so only import it where ADK is needed.
+"""
+
+import asyncio
+from typing import Callable, Optional
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import DataPart, Part, TaskStatusUpdateEvent
+from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
+
+from a2a_runtime.admission import AdmissionController
+from a2a_runtime.bulk import BULK_RESULTS_KEY, bulk_calls, run_bulk
+from a2a_runtime.deadline import (
+    DeadlineExceeded,
+    record_expired,
+    remaining,
+    replace_deadline,
+    reset_deadline,
+)
+from a2a_runtime.usage import (
+    USAGE_METADATA_KEY,
+    RequestUsage,
+    finish_request,
+    reset_usage,
+    set_usage,
+)
+
+
+class _UsageEventQueue:
+    """Adds the request's token usage to the final task status event."""
+
+    def __init__(self, queue, usage: RequestUsage, agent: str) -> None:
+        self._queue = queue
+        self._usage = usage
+        self._agent = agent
+
+    async def enqueue_event(self, event) -> None:
+        if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            event.metadata = {
+                **(event.metadata or {}),
+                USAGE_METADATA_KEY: finish_request(self._agent, self._usage),
+            }
+        await self._queue.enqueue_event(event)
+
+    def __getattr__(self, name):
+        return getattr(self._queue, name)
+
+
+class DeadlineAgentExecutor(A2aAgentExecutor):
+    """``A2aAgentExecutor`` that stops the agent run at the request deadline.
+
+    The timeout surfaces as a ``DeadlineExceeded`` error, which the base class
+    publishes as a failed task. Cancelling the run also cancels in-flight
+    calls to sub-agents. Each request also gets a ``RequestUsage``, reported
+    in the final status metadata (see ``a2a_runtime.usage``).
+
+    Calls with ``configuration.blocking`` false return before the task runs,
+    so neither the request deadline nor the admission slot of the call apply
+    to the task. It gets ``task_timeout`` instead, and a slot from
+    ``background`` for as long as it runs.
+
+    Args:
+        bulk_tools (dict[str, Callable]): Tools that bulk messages may call
+            directly, without the model; see ``a2a_runtime.bulk``.
+        task_timeout (float): Seconds a non-blocking task may run; None for
+            no limit.
+        background (AdmissionController): Limits the non-blocking tasks
+            running at once; None for no limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        bulk_tools: Optional[dict[str, Callable]] = None,
+        task_timeout: Optional[float] = None,
+        background: Optional[AdmissionController] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._bulk_tools = bulk_tools
+        self._task_timeout = task_timeout
+        self._background = background
+
+    async def _handle_request(self, context, event_queue) -> None:
+        usage = RequestUsage()
+        runner = await self._resolve_runner()
+        token = set_usage(usage)
+        configuration = context.configuration
+        detached = configuration is not None and configuration.blocking is False
+        deadline = replace_deadline(self._task_timeout) if detached else None
+        event_queue = _UsageEventQueue(event_queue, usage, runner.app_name)
+        try:
+            if detached and self._background is not None:
+                async with self._background.slot():
+                    await self._run_until_deadline(context, event_queue)
+            else:
+                await self._run_until_deadline(context, event_queue)
+        finally:
+            if deadline is not None:
+                reset_deadline(deadline)
+            reset_usage(token)
+
+    async def _run_until_deadline(self, context, event_queue) -> None:
+        timeout = remaining()
+        if timeout is None:
+            await self._run(context, event_queue)
+            return
+        try:
+            await asyncio.wait_for(self._run(context, event_queue), timeout)
+        except asyncio.TimeoutError:
+            record_expired("agent")
+            raise DeadlineExceeded(f"Deadline exceeded after {timeout:.1f}s") from None
+
+    async def _run(self, context, event_queue) -> None:
+        calls = bulk_calls(context.message) if self._bulk_tools else None
+        if calls is None:
+            await super()._handle_request(context, event_queue)
+            return
+        results = await run_bulk(self._bulk_tools, calls)
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.add_artifact(
+            [Part(root=DataPart(data={BULK_RESULTS_KEY: results}))],
+            name="bulk_results",
+        )
+        await updater.complete()
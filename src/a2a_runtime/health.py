@@ -0,0 +1,230 @@
+"""This module tracks the passive health of the replicas of one agent.
+
+``HealthTracker`` learns from the calls a master makes anyway; it never sends
+probes. For every replica it keeps an exponentially weighted moving average
+(EWMA) of latency and error rate. It uses them to:
+
+*   pick the replica with the lowest expected wait, ``(outstanding + 1) *
+    latency``, with ties broken at random;
+*   eject outliers: replicas with ``consecutive_failures`` failures in a row,
+    a high error rate, or a latency far above their peers' median. Ejection
+    lasts ``base_ejection`` seconds times the number of ejections so far,
+    and at most ``max_ejected_fraction`` of the replicas are ejected at once;
+*   slow-start new and returning replicas, whose share of traffic ramps up
+    over ``slow_start`` seconds.
+
+A master's background prober (see ``a2a_runtime.prober``) can also report
+failed health checks with ``probe``, so a dead replica is ejected before
+calls are wasted on it.
+"""
+
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+_EJECTED = REGISTRY.gauge(
+    "a2a_endpoint_ejected",
+    "1 while a replica is ejected as an outlier.",
+    ["downstream", "endpoint"],
+)
+_EJECTIONS = REGISTRY.counter(
+    "a2a_endpoint_ejections_total",
+    "Outlier ejections by cause.",
+    ["downstream", "endpoint", "cause"],
+)
+_LATENCY = REGISTRY.gauge(
+    "a2a_endpoint_latency_ewma_seconds",
+    "Latency EWMA per replica.",
+    ["downstream", "endpoint"],
+)
+
+MAX_EJECTION_SECONDS = 300.0
+
+
+@dataclass
+class EndpointHealth:
+    """What is known about one replica."""
+
+    url: str
+    since: float
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    samples: int = 0
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    probe_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+    def ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def weight(self, now: float, slow_start: float) -> float:
+        """Share of traffic while slow-starting, from 0.1 up to 1."""
+        if slow_start <= 0:
+            return 1.0
+        return min(1.0, max(0.1, (now - self.since) / slow_start))
+
+
+class HealthTracker:
+    """Balances calls over replicas using passive health signals."""
+
+    def __init__(
+        self,
+        name: str,
+        alpha: float = 0.3,
+        consecutive_failures: int = 5,
+        max_error_rate: float = 0.5,
+        latency_factor: float = 3.0,
+        min_samples: int = 10,
+        base_ejection: float = 30.0,
+        max_ejected_fraction: float = 0.5,
+        slow_start: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.alpha = alpha
+        self.consecutive_failures = consecutive_failures
+        self.max_error_rate = max_error_rate
+        self.latency_factor = latency_factor
+        self.min_samples = min_samples
+        self.base_ejection = base_ejection
+        self.max_ejected_fraction = max_ejected_fraction
+        self.slow_start = slow_start
+        self.clock = clock
+        self.endpoints: dict[str, EndpointHealth] = {}
+
+    def sync(self, urls: Iterable[str]) -> None:
+        """Adds new replicas (slow-starting them) and forgets removed ones."""
+        urls = list(urls)
+        now = self.clock()
+        # The first replicas seen need no ramp-up: there is nobody to spare.
+        since = now if self.endpoints else now - self.slow_start
+        self.endpoints = {
+            url: self.endpoints.get(url) or EndpointHealth(url, since=since)
+            for url in urls
+        }
+        for e in self.endpoints.values():
+            _EJECTED.set(int(e.ejected(now)), downstream=self.name, endpoint=e.url)
+
+    def choose(self) -> Optional[str]:
+        """Returns the replica to call next, or None if none are known."""
+        if not self.endpoints:
+            return None
+        now = self.clock()
+        healthy = [e for e in self.endpoints.values() if not e.ejected(now)]
+        # With every replica ejected, trying one beats failing outright.
+        candidates = healthy or list(self.endpoints.values())
+        known = [e.latency for e in candidates if e.latency is not None]
+        default = statistics.median(known) if known else 1.0
+
+        def score(e: EndpointHealth) -> float:
+            latency = default if e.latency is None else e.latency
+            return (e.outstanding + 1) * latency / e.weight(now, self.slow_start)
+
+        best = min(score(e) for e in candidates)
+        return random.choice([e.url for e in candidates if score(e) <= best])
+
+    def start(self, url: str) -> None:
+        endpoint = self.endpoints.get(url)
+        if endpoint is not None:
+            endpoint.outstanding += 1
+
+    def finish(self, url: str, latency: Optional[float], ok: bool) -> None:
+        """Records the outcome of a call started with ``start``.
+
+        Args:
+            url (str): The replica that was called.
+            latency (float): Seconds until the response headers arrived, or
+                None if the call failed before that.
+            ok (bool): False for transport errors and 5xx/429 responses.
+        """
+        endpoint = self.endpoints.get(url)
+        if endpoint is None:
+            return
+        endpoint.outstanding = max(0, endpoint.outstanding - 1)
+        endpoint.samples += 1
+        failed = 0.0 if ok else 1.0
+        endpoint.error_rate += self.alpha * (failed - endpoint.error_rate)
+        if latency is not None:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.alpha * (latency - endpoint.latency)
+            _LATENCY.set(endpoint.latency, downstream=self.name, endpoint=url)
+        endpoint.consecutive_failures = 0 if ok else endpoint.consecutive_failures + 1
+
+        cause = self._outlier_cause(endpoint)
+        if cause is not None:
+            self._eject(endpoint, cause)
+
+    def probe(self, url: str, ok: bool, failures: int = 2) -> None:
+        """Records a health check; ``failures`` failed checks in a row eject."""
+        endpoint = self.endpoints.get(url)
+        if endpoint is None:
+            return
+        endpoint.probe_failures = 0 if ok else endpoint.probe_failures + 1
+        if endpoint.probe_failures >= failures and not endpoint.ejected(self.clock()):
+            self._eject(endpoint, "probe")
+
+    def _outlier_cause(self, endpoint: EndpointHealth) -> Optional[str]:
+        now = self.clock()
+        if endpoint.ejected(now):
+            return None
+        if endpoint.consecutive_failures >= self.consecutive_failures:
+            return "consecutive_failures"
+        if endpoint.samples < self.min_samples:
+            return None
+        if endpoint.error_rate > self.max_error_rate:
+            return "error_rate"
+        peers = [
+            e.latency
+            for e in self.endpoints.values()
+            if e is not endpoint and e.latency is not None and not e.ejected(now)
+        ]
+        if (
+            peers
+            and endpoint.latency is not None
+            and endpoint.latency > self.latency_factor * statistics.median(peers)
+        ):
+            return "latency"
+        return None
+
+    def _eject(self, endpoint: EndpointHealth, cause: str) -> None:
+        now = self.clock()
+        ejected = sum(e.ejected(now) for e in self.endpoints.values())
+        if ejected + 1 > self.max_ejected_fraction * len(self.endpoints):
+            return
+        endpoint.ejections += 1
+        duration = min(MAX_EJECTION_SECONDS, self.base_ejection * endpoint.ejections)
+        endpoint.ejected_until = now + duration
+        # Back in rotation it ramps up again, starting from a clean slate.
+        endpoint.since = endpoint.ejected_until
+        endpoint.latency = None
+        endpoint.error_rate = 0.0
+        endpoint.samples = 0
+        endpoint.consecutive_failures = 0
+        _EJECTED.set(1, downstream=self.name, endpoint=endpoint.url)
+        _EJECTIONS.inc(downstream=self.name, endpoint=endpoint.url, cause=cause)
+
+    def snapshot(self) -> list[dict]:
+        """Returns the health of every replica, for debugging and metrics."""
+        now = self.clock()
+        rows = []
+        for e in self.endpoints.values():
+            rows.append(
+                {
+                    "url": e.url,
+                    "ejected": e.ejected(now),
+                    "latency_ewma": e.latency,
+                    "error_rate": round(e.error_rate, 3),
+                    "outstanding": e.outstanding,
+                    "weight": e.weight(now, self.slow_start),
+                    "ejections": e.ejections,
+                }
+            )
+        return rows
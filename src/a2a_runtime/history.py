@@ -0,0 +1,141 @@
+"""This module bounds conversation history sent to the model and to clients.
+
+The helpers work on anything shaped like ``google.genai.types.Content`` or an
+A2A ``Message`` so they can be unit tested without ADK.
+"""
+
+from typing import Any, Optional
+
+# Rough Gemini tokenizer ratio for English text; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+SUMMARY_LINE_CHARS = 160
+SUMMARY_MAX_CHARS = 1500
+
+
+def _part_text(part: Any) -> str:
+    """Returns the text a part contributes to the prompt."""
+    if getattr(part, "text", None):
+        return part.text
+    for attr in ("function_call", "function_response"):
+        value = getattr(part, attr, None)
+        if value is not None:
+            payload = getattr(value, "args", None) or getattr(value, "response", None)
+            return f"{getattr(value, 'name', '')}{payload or ''}"
+    return ""
+
+
+def estimate_tokens(content: Any) -> int:
+    """Estimates the prompt tokens of one content entry."""
+    chars = sum(len(_part_text(part)) for part in getattr(content, "parts", None) or [])
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def is_turn_start(content: Any) -> bool:
+    """Returns True for a user text message, where history can be cut safely.
+
+    Cutting anywhere else could separate a function call from its response.
+    """
+    if getattr(content, "role", None) != "user":
+        return False
+    parts = getattr(content, "parts", None) or []
+    has_text = any(getattr(part, "text", None) for part in parts)
+    has_response = any(getattr(part, "function_response", None) for part in parts)
+    return has_text and not has_response
+
+
+def split_history(contents: list, max_tokens: int) -> int:
+    """Finds where to cut ``contents`` so the rest fits in ``max_tokens``.
+
+    Args:
+        contents (list): The request contents, oldest first.
+        max_tokens (int): The token budget for the kept history.
+
+    Returns:
+        int: Index of the first content to keep. 0 keeps everything. The last
+        user turn is always kept, even if it alone exceeds the budget.
+    """
+    tokens = [estimate_tokens(content) for content in contents]
+    if sum(tokens) <= max_tokens:
+        return 0
+    cut = None
+    suffix = 0
+    for i in range(len(contents) - 1, -1, -1):
+        suffix += tokens[i]
+        if suffix > max_tokens and cut is not None:
+            break
+        if is_turn_start(contents[i]):
+            cut = i
+    return cut or 0
+
+
+def summarize_dropped(contents: list) -> str:
+    """Builds an extractive summary of the contents removed from the prompt."""
+    lines = []
+    for content in contents:
+        text = " ".join(
+            part.text for part in content.parts or [] if getattr(part, "text", None)
+        ).strip()
+        if text:
+            text = " ".join(text.split())[:SUMMARY_LINE_CHARS]
+            lines.append(f"- {content.role}: {text}")
+    # Keep the most recent lines when the summary itself is too long.
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > SUMMARY_MAX_CHARS:
+            break
+        kept.append(line)
+    header = (
+        f"[Summary of {len(contents)} earlier messages omitted to fit the "
+        "context budget]"
+    )
+    return "\n".join([header, *reversed(kept)])
+
+
+def session_stats(session: Any, now: float) -> dict:
+    """Reports the memory footprint of one ADK session.
+
+    Args:
+        session: An ADK ``Session``.
+        now (float): The current ``time.time()``.
+
+    Returns:
+        dict: Event count, estimated tokens and bytes, and idle seconds.
+    """
+    events = session.events or []
+    return {
+        "app_name": session.app_name,
+        "user_id": session.user_id,
+        "session_id": session.id,
+        "events": len(events),
+        "estimated_tokens": sum(
+            estimate_tokens(event.content) for event in events if event.content
+        ),
+        "bytes": len(session.model_dump_json()),
+        "idle_seconds": round(now - session.last_update_time, 1),
+    }
+
+
+def history_window(
+    history: list, length: Optional[int] = None, since: Optional[str] = None
+) -> list:
+    """Returns the part of a task's history a client asked for.
+
+    Args:
+        history (list): A2A messages, oldest first.
+        length (int): Keep at most this many of the latest messages.
+        since (str): Keep only the messages after the one with this
+            ``message_id``. Ignored if no message has it.
+
+    Returns:
+        list: The selected messages, oldest first.
+    """
+    if since is not None:
+        for index in range(len(history) - 1, -1, -1):
+            if getattr(history[index], "message_id", None) == since:
+                start = index + 1
+                history = history[start:]
+                break
+    if length is not None:
+        history = history[-length:] if length > 0 else []
+    return history
@@ -0,0 +1,164 @@
+"""This module profiles the import time of an agent module with a budget check.
+
+Usage:
+    python src/a2a_runtime/importtime.py src/agents/a2a_master_agent \
+        --budget-ms 3000 --repeat 3
+"""
+
+import argparse
+import dataclasses
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+@dataclasses.dataclass
+class ImportRecord:
+    """A single line of ``python -X importtime`` output."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parses the stderr of ``python -X importtime``.
+
+    Args:
+        output (str): The raw stderr of the profiled interpreter.
+
+    Returns:
+        list[ImportRecord]: One record per imported module, in output order.
+    """
+    records = []
+    for line in output.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(
+            ImportRecord(
+                name=name,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(indent) - 1) // 2,
+            )
+        )
+    return records
+
+
+def total_us(records: list[ImportRecord]) -> int:
+    """Returns the wall time of all top-level imports in microseconds."""
+    return sum(r.cumulative_us for r in records if r.depth == 0)
+
+
+def by_package(records: list[ImportRecord]) -> dict[str, int]:
+    """Sums the self time of each module into its distribution-level package.
+
+    ``google.*`` namespaces are grouped one level deeper (``google.adk``,
+    ``google.genai``) since they are separate distributions.
+    """
+    totals: dict[str, int] = {}
+    for record in records:
+        parts = record.name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "google" else parts[0]
+        totals[key] = totals.get(key, 0) + record.self_us
+    return totals
+
+
+def profile_modules(
+    modules: list[str], cwd: str, python: str = sys.executable
+) -> list[ImportRecord]:
+    """Imports ``modules`` in a fresh interpreter and returns its import records.
+
+    Args:
+        modules (list[str]): Module names to import, e.g. ``["agent"]``.
+        cwd (str): Directory the interpreter runs in, i.e. the agent directory.
+        python (str): The interpreter to profile.
+
+    Returns:
+        list[ImportRecord]: The parsed import records.
+
+    Raises:
+        RuntimeError: If the import fails in the child interpreter.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {modules} in {cwd} failed:\n{proc.stderr}")
+    return parse_importtime(proc.stderr)
+
+
+def format_report(records: list[ImportRecord], top: int = 15) -> str:
+    """Formats the package and module breakdown of a profile."""
+    lines = [f"Total import time: {total_us(records) / 1000:.1f} ms", ""]
+    lines.append("Self time by package:")
+    packages = sorted(by_package(records).items(), key=lambda kv: -kv[1])
+    for name, us in packages[:top]:
+        lines.append(f"  {us / 1000:9.1f} ms  {name}")
+    lines.append("")
+    lines.append("Slowest modules (cumulative):")
+    slowest = sorted(records, key=lambda r: -r.cumulative_us)
+    for record in slowest[:top]:
+        lines.append(
+            f"  {record.cumulative_us / 1000:9.1f} ms  "
+            f"(self {record.self_us / 1000:7.1f} ms)  {record.name}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Profiles an agent directory and enforces the optional budget."""
+    parser = argparse.ArgumentParser(
+        description="Import-time breakdown and cold-start budget for an agent."
+    )
+    parser.add_argument("agent_dir", help="Agent directory containing agent.py.")
+    parser.add_argument(
+        "-m",
+        "--module",
+        action="append",
+        dest="modules",
+        help="Module to import (repeatable). Defaults to 'agent'.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("A2A_IMPORT_BUDGET_MS", "0")),
+        help="Fail if the median import time exceeds this many milliseconds.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of fresh interpreters."
+    )
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    modules = args.modules or ["agent"]
+    runs = [
+        profile_modules(modules, cwd=args.agent_dir) for _ in range(max(args.repeat, 1))
+    ]
+    median_ms = statistics.median(total_us(run) for run in runs) / 1000
+    print(format_report(runs[-1], top=args.top))
+    print("")
+    print(f"Median over {len(runs)} run(s): {median_ms:.1f} ms")
+
+    if args.budget_ms and median_ms > args.budget_ms:
+        print(f"❌ Over cold-start budget of {args.budget_ms:.0f} ms")
+        return 1
+    if args.budget_ms:
+        print(f"✅ Within cold-start budget of {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""This module defines the A2A application and request handler of ``build_app``.
+
+It imports the A2A SDK at module level, so only import it where A2A is needed.
+"""
+
+from collections.abc import AsyncGenerator
+from typing import Any, Optional
+
+from a2a.extensions.common import HTTP_EXTENSION_HEADER
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import JSONRPCErrorResponse, Task
+from starlette.responses import Response
+
+from a2a_runtime import codec
+from a2a_runtime.etag import etag_matches, strong_etag
+from a2a_runtime.history import history_window
+
+HISTORY_SINCE_KEY = "historySince"
+DEFAULT_CARD_MAX_AGE_SECONDS = 300
+
+
+class FastJSONStarletteApplication(A2AStarletteApplication):
+    """``A2AStarletteApplication`` with a faster JSON path.
+
+    Request bodies are parsed with ``a2a_runtime.codec``. Responses are
+    serialized by pydantic straight to JSON instead of being dumped to dicts
+    and re-encoded by the standard library; the bytes are the same. Streaming
+    responses already take that path.
+
+    The agent card is serialized once and served from memory with a strong
+    ``ETag`` and ``Cache-Control: public, max-age=<card_max_age>``; a
+    matching ``If-None-Match`` gets a bodiless 304. A ``card_modifier``
+    makes the card dynamic again.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        card_max_age: int = DEFAULT_CARD_MAX_AGE_SECONDS,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._card_body = self.agent_card.model_dump_json(
+            exclude_none=True, by_alias=True
+        ).encode()
+        self._card_headers = {
+            "ETag": strong_etag(self._card_body),
+            "Cache-Control": f"public, max-age={card_max_age}",
+        }
+
+    async def _handle_get_agent_card(self, request):
+        if self.card_modifier:
+            return await super()._handle_get_agent_card(request)
+        if etag_matches(
+            request.headers.get("if-none-match"), self._card_headers["ETag"]
+        ):
+            return Response(status_code=304, headers=self._card_headers)
+        return Response(
+            self._card_body, headers=self._card_headers, media_type="application/json"
+        )
+
+    async def _handle_requests(self, request):
+        try:
+            # Starlette's Request.json() returns this cached value.
+            request._json = codec.loads(await request.body())
+        except ValueError:
+            pass  # The SDK parses the body again and reports the error.
+        return await super()._handle_requests(request)
+
+    def _create_response(self, context, handler_result):
+        if isinstance(handler_result, AsyncGenerator):
+            return super()._create_response(context, handler_result)
+        if not isinstance(handler_result, JSONRPCErrorResponse):
+            handler_result = handler_result.root
+        headers = {}
+        if extensions := context.activated_extensions:
+            headers[HTTP_EXTENSION_HEADER] = ", ".join(sorted(extensions))
+        return Response(
+            handler_result.model_dump_json(exclude_none=True),
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+class HistoryTrimmingRequestHandler(DefaultRequestHandler):
+    """``DefaultRequestHandler`` that returns only the history a client needs.
+
+    Besides the standard ``historyLength`` of ``message/send`` and
+    ``tasks/get``, a ``historySince`` message id in the request's
+    ``metadata`` returns only the messages after it. Requests that set
+    neither get the latest ``default_history_length`` messages, or the whole
+    history if it is None.
+    """
+
+    def __init__(
+        self, *args: Any, default_history_length: Optional[int] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.default_history_length = default_history_length
+
+    def _trim(
+        self, task: Task, length: Optional[int], metadata: Optional[dict]
+    ) -> Task:
+        since = (metadata or {}).get(HISTORY_SINCE_KEY)
+        if length is None and since is None:
+            length = self.default_history_length
+        if not task.history or (length is None and since is None):
+            return task
+        history = history_window(task.history, length, since)
+        if len(history) == len(task.history):
+            return task
+        return task.model_copy(update={"history": history})
+
+    async def on_message_send(self, params, context=None):
+        result = await super().on_message_send(params, context)
+        if not isinstance(result, Task):
+            return result
+        configuration = params.configuration
+        return self._trim(
+            result, configuration and configuration.history_length, params.metadata
+        )
+
+    async def on_get_task(self, params, context=None):
+        task = await super().on_get_task(params, context)
+        if task is None:
+            return None
+        return self._trim(task, params.history_length, params.metadata)
@@ -0,0 +1,276 @@
+"""This module runs blocking agent tools off the event loop.
+
+ADK calls a synchronous tool function directly on the event loop, so a slow
+HTTP call or a long computation inside a tool stalls every other request the
+server is handling. Each blocking tool should declare how it runs:
+
+*   ``"inline"``: on the event loop. Right for async tools and for tools that
+    return in microseconds.
+*   ``"thread"``: in a shared thread pool. Right for blocking I/O.
+*   ``"process"``: in a shared process pool. Right for CPU-bound work, which
+    would otherwise hold the GIL. Arguments and results must be picklable,
+    the function must be defined at module level, and it cannot take a
+    ``tool_context``.
+
+Declare a policy with the ``offload`` decorator::
+
+    @offload("process")
+    def sieve(limit: int) -> dict: ...
+
+Undeclared tools run inline, as in ADK. Setting ``A2A_TOOL_OFFLOAD=thread``
+makes ``build_app`` run them in the thread pool too, on a copy of the agent
+tree. The pools hold
+``A2A_TOOL_THREADS`` threads and ``A2A_TOOL_PROCESSES`` processes, and
+``GET /metrics`` shows their busy and queued calls, queue wait and tool
+duration.
+
+This module does not import ADK, so agents can use the decorator at import
+time without slowing down their cold start.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import copy
+import functools
+import importlib
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+POLICIES = ("inline", "thread", "process")
+# The policy of undeclared tools; the decorator defaults to "thread".
+DEFAULT_POLICY = "inline"
+POLICY_ATTRIBUTE = "a2a_offload"
+
+_WORKERS = REGISTRY.gauge(
+    "a2a_tool_pool_workers", "Workers in each tool pool.", ["pool"]
+)
+_BUSY = REGISTRY.gauge("a2a_tool_pool_busy", "Tool calls running in a pool.", ["pool"])
+_QUEUED = REGISTRY.gauge(
+    "a2a_tool_pool_queued", "Tool calls waiting for a pool worker.", ["pool"]
+)
+_QUEUE_WAIT = REGISTRY.histogram(
+    "a2a_tool_queue_wait_seconds",
+    "Time tool calls waited for a pool worker.",
+    ["pool"],
+)
+_DURATION = REGISTRY.histogram(
+    "a2a_tool_duration_seconds", "Tool run time by offload policy.", ["tool", "policy"]
+)
+
+
+def _timed(func: Callable, args: tuple, kwargs: dict) -> tuple[float, Any]:
+    started = time.time()
+    return started, func(*args, **kwargs)
+
+
+def _timed_by_name(
+    module: str, qualname: str, args: tuple, kwargs: dict
+) -> tuple[float, Any]:
+    """Runs an offloaded function in a worker process, found by its name.
+
+    The module attribute holds the async wrapper, which cannot be pickled, so
+    the worker looks the function up and unwraps it.
+    """
+    target: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        target = getattr(target, name)
+    return _timed(inspect.unwrap(target), args, kwargs)
+
+
+class ToolPool:
+    """A thread or process pool for tools, with saturation metrics.
+
+    Args:
+        name (str): ``"thread"`` or ``"process"``.
+        workers (int): The pool size.
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.in_flight = 0
+        if name == "process":
+            # Forking a process that runs threads (ADK, gRPC, uvicorn) is unsafe.
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                workers, thread_name_prefix="a2a-tool"
+            )
+        _WORKERS.set(workers, pool=name)
+
+    def _update_gauges(self) -> None:
+        _BUSY.set(min(self.in_flight, self.workers), pool=self.name)
+        _QUEUED.set(max(self.in_flight - self.workers, 0), pool=self.name)
+
+    async def run(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Runs ``func`` in the pool and returns its result."""
+        loop = asyncio.get_running_loop()
+        if self.name == "process":
+            call = functools.partial(
+                _timed_by_name, func.__module__, func.__qualname__, args, kwargs
+            )
+        else:
+            # Threads see the caller's context, e.g. its deadline.
+            call = functools.partial(
+                contextvars.copy_context().run, _timed, func, args, kwargs
+            )
+        submitted = time.time()
+        self.in_flight += 1
+        self._update_gauges()
+        try:
+            started, result = await loop.run_in_executor(self.executor, call)
+        finally:
+            self.in_flight -= 1
+            self._update_gauges()
+        _QUEUE_WAIT.observe(max(started - submitted, 0.0), pool=self.name)
+        return result
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_POOLS: dict[str, ToolPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _default_workers(policy: str) -> int:
+    cpus = os.cpu_count() or 1
+    if policy == "process":
+        return int(os.environ.get("A2A_TOOL_PROCESSES") or cpus)
+    return int(os.environ.get("A2A_TOOL_THREADS") or min(32, cpus + 4))
+
+
+def get_pool(policy: str) -> ToolPool:
+    """Returns the shared pool for ``policy``, creating it on first use."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(policy)
+        if pool is None:
+            pool = _POOLS[policy] = ToolPool(policy, _default_workers(policy))
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stops the tool pools; they are recreated if a tool runs again."""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.shutdown()
+        _POOLS.clear()
+
+
+def offload(policy: str = "thread") -> Callable[[Callable], Callable]:
+    """Declares how a tool function runs; see the module docstring.
+
+    The returned function is a coroutine function with the original name,
+    docstring and signature, so ADK builds the same tool declaration.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown offload policy {policy!r}; use one of {POLICIES}")
+
+    def decorate(func: Callable) -> Callable:
+        if policy == "inline" or inspect.iscoroutinefunction(func):
+            try:
+                setattr(func, POLICY_ATTRIBUTE, "inline")
+            except AttributeError:
+                pass  # A bound method; it is only ever visited once.
+            return func
+        if policy == "process" and (
+            "tool_context" in inspect.signature(func).parameters
+            or "<locals>" in func.__qualname__
+        ):
+            raise ValueError(
+                f"{func.__qualname__} cannot run in a process: it must be a "
+                "module-level function without a tool_context"
+            )
+
+        @functools.wraps(func)
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            started = time.monotonic()
+            try:
+                return await get_pool(policy).run(func, args, kwargs)
+            finally:
+                _DURATION.observe(
+                    time.monotonic() - started, tool=func.__name__, policy=policy
+                )
+
+        setattr(run, POLICY_ATTRIBUTE, policy)
+        return run
+
+    return decorate
+
+
+def _needs_policy(func: Any) -> bool:
+    return (
+        (inspect.isfunction(func) or inspect.ismethod(func))
+        and not inspect.iscoroutinefunction(func)
+        and not hasattr(func, POLICY_ATTRIBUTE)
+    )
+
+
+def _offloaded(agent: Any, decorate: Callable) -> tuple[Any, int]:
+    tools, count = [], 0
+    for tool in getattr(agent, "tools", None) or []:
+        if _needs_policy(tool):
+            tool = decorate(tool)
+        elif _needs_policy(getattr(tool, "func", None)):
+            # An explicit FunctionTool; it calls whatever ``func`` holds.
+            tool = copy.copy(tool)
+            tool.func = decorate(tool.func)
+        else:
+            tools.append(tool)
+            continue
+        tools.append(tool)
+        count += 1
+    sub_agents = []
+    for sub_agent in getattr(agent, "sub_agents", None) or []:
+        copied, offloaded = _offloaded(sub_agent, decorate)
+        sub_agents.append(copied)
+        count += offloaded
+    if not count:
+        return agent, 0
+    # The copy adopts its sub-agents, so unchanged ones must be copied too.
+    update = {
+        "sub_agents": [
+            copied.clone() if copied is original else copied
+            for copied, original in zip(sub_agents, agent.sub_agents)
+        ]
+    }
+    if hasattr(agent, "tools"):
+        update["tools"] = tools
+    return agent.clone(update=update), count
+
+
+def offload_tools(agent: Any, policy: Optional[str] = None) -> tuple[Any, int]:
+    """Applies ``policy`` to the undeclared synchronous tools of an agent tree.
+
+    The agent is left as it is; tools are wrapped in a copy of the tree.
+
+    Args:
+        agent: The ADK root agent; its sub-agents are visited too.
+        policy (str): ``inline`` or ``thread``. Defaults to
+            ``A2A_TOOL_OFFLOAD``, else ``inline``.
+
+    Returns:
+        tuple: The agent to run, and how many tools it runs off the event loop.
+
+    Raises:
+        ValueError: For other policies. Process pools need picklable tools, so
+            tools opt into them one by one with ``offload("process")``.
+    """
+    policy = policy or os.environ.get("A2A_TOOL_OFFLOAD") or DEFAULT_POLICY
+    if policy not in ("inline", "thread"):
+        raise ValueError(
+            f"A2A_TOOL_OFFLOAD must be inline or thread, not {policy!r}; "
+            'declare CPU-bound tools with @offload("process")'
+        )
+    if policy == "inline":
+        return agent, 0
+    return _offloaded(agent, offload(policy))
@@ -0,0 +1,183 @@
+"""This module defines the ADK runner plugins installed by ``build_app``."""
+
+import logging
+from typing import Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.remote_a2a_agent import A2A_METADATA_PREFIX
+from google.adk.events.event import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from a2a_runtime.breaker import unavailable_note
+from a2a_runtime.context_cache import PrefixCache
+from a2a_runtime.history import split_history, summarize_dropped
+from a2a_runtime.usage import (
+    USAGE_METADATA_KEY,
+    current_usage,
+    record_agent_time,
+    record_hop,
+    record_model_call,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryBudgetPlugin(BasePlugin):
+    """Keeps the history sent to the model within a token budget.
+
+    Older turns are replaced by a short extractive summary, so the cost of a
+    turn stays flat however long the conversation runs. The session itself is
+    untouched; only the model request is trimmed.
+    """
+
+    def __init__(self, max_tokens: int) -> None:
+        super().__init__(name="history_budget")
+        self.max_tokens = max_tokens
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        cut = split_history(llm_request.contents, self.max_tokens)
+        if cut:
+            dropped = llm_request.contents[:cut]
+            summary = types.Content(
+                role="user", parts=[types.Part(text=summarize_dropped(dropped))]
+            )
+            llm_request.contents = [summary, *llm_request.contents[cut:]]
+            logger.info(
+                "Compacted %d history entries for %s",
+                len(dropped),
+                callback_context.agent_name,
+            )
+        return None
+
+
+class TokenUsagePlugin(BasePlugin):
+    """Accounts tokens and time per agent and per sub-agent hop.
+
+    Model calls are counted from their ``usage_metadata``; thinking tokens
+    count as completion tokens. Sub-agent usage is read from the
+    ``token_usage`` metadata of the tasks they return. See
+    ``a2a_runtime.usage``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="token_usage")
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        usage = current_usage()
+        if usage is not None:
+            usage.agent_started(callback_context.invocation_id, agent.name)
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        usage = current_usage()
+        if usage is not None:
+            elapsed = usage.agent_finished(callback_context.invocation_id, agent.name)
+            if elapsed is not None:
+                record_agent_time(agent.name, elapsed)
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        metadata = llm_response.usage_metadata
+        if metadata is None or llm_response.partial:
+            return None
+        record_model_call(
+            callback_context.agent_name,
+            prompt=metadata.prompt_token_count or 0,
+            completion=(metadata.candidates_token_count or 0)
+            + (metadata.thoughts_token_count or 0),
+            cached=metadata.cached_content_token_count or 0,
+        )
+        return None
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        response = (event.custom_metadata or {}).get(A2A_METADATA_PREFIX + "response")
+        if isinstance(response, dict):
+            report = (response.get("metadata") or {}).get(USAGE_METADATA_KEY)
+            if report:
+                record_hop(event.author, report, task_id=response.get("id"))
+        return None
+
+
+class CircuitBreakerPlugin(BasePlugin):
+    """Tells a model which of its agent's sub-agents are unavailable.
+
+    The note is added after the history rather than to the instruction, so
+    the cached prompt prefix stays the same. Install it after
+    ``HistoryBudgetPlugin``, which would otherwise take the note for the
+    user's latest turn. See ``a2a_runtime.breaker``.
+
+    Args:
+        root_agent: The runner's root agent, where agents are looked up.
+    """
+
+    def __init__(self, root_agent: BaseAgent) -> None:
+        super().__init__(name="circuit_breaker")
+        self.root_agent = root_agent
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent = self.root_agent.find_agent(callback_context.agent_name)
+        if agent is None:
+            return None
+        note = unavailable_note([sub_agent.name for sub_agent in agent.sub_agents])
+        if note:
+            llm_request.contents.append(
+                types.Content(role="user", parts=[types.Part(text=note)])
+            )
+        return None
+
+
+class ContextCachePlugin(BasePlugin):
+    """Sends each agent's static prompt prefix as a Gemini cached context.
+
+    Non-Gemini models, such as the local mock, keep the prefix inline. See
+    ``a2a_runtime.context_cache``.
+
+    Args:
+        cache (PrefixCache): The cached contexts, by agent.
+        root_agent: The runner's root agent, where agents are looked up.
+    """
+
+    def __init__(self, cache: PrefixCache, root_agent: BaseAgent) -> None:
+        super().__init__(name="context_cache")
+        self.cache = cache
+        self.root_agent = root_agent
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        from google.adk.models.google_llm import Gemini
+
+        agent = self.root_agent.find_agent(callback_context.agent_name)
+        model = getattr(agent, "canonical_model", None)
+        client = model.api_client if isinstance(model, Gemini) else None
+        await self.cache.apply(callback_context.agent_name, client, llm_request)
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> Optional[LlmResponse]:
+        if llm_request.config and llm_request.config.cached_content:
+            # The cache may have expired or been deleted; recreate it next time.
+            self.cache.invalidate(callback_context.agent_name)
+        return None
@@ -0,0 +1,236 @@
+"""This module probes a master's sub-agents in the background.
+
+Passive health (see ``a2a_runtime.health``) only learns about a replica when
+a user's call reaches it. ``TopologyProber`` checks every replica of every
+remote sub-agent each ``interval`` seconds instead: it fetches the agent card
+and then ``GET /healthz``, a cheap ping that does not touch the model. A 404
+from ``/healthz`` still counts as up, since not every agent serves it.
+
+For each replica it keeps the last ``window`` checks, from which it reports
+availability and p50/p95 latency. The results also feed routing:
+
+*   ``HealthTracker.probe`` ejects a replica that fails checks in a row, so
+    the balancer stops sending calls there;
+*   ``CircuitBreaker.probed`` opens a closed breaker sooner when checks fail,
+    and lets an open breaker probe at once when they pass again.
+
+``topology`` returns the whole picture, with the balancer and breaker state,
+for the master's ``GET /topology``.
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from a2a_runtime.metrics import REGISTRY
+from a2a_runtime.warmup import is_remote, iter_agents
+
+logger = logging.getLogger(__name__)
+
+CARD_PATH = "/.well-known/agent-card.json"
+PING_PATH = "/healthz"
+DEFAULT_INTERVAL_SECONDS = 15.0
+DEFAULT_WINDOW = 20
+
+_UP = REGISTRY.gauge(
+    "a2a_probe_up",
+    "1 if the last health check of a replica passed.",
+    ["downstream", "endpoint"],
+)
+_PROBE_LATENCY = REGISTRY.histogram(
+    "a2a_probe_latency_seconds",
+    "Latency of sub-agent health checks.",
+    ["downstream"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+)
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Returns the nearest-rank ``q`` percentile (0-100), or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(q / 100 * len(ordered))), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class EndpointStats:
+    """Rolling results of the health checks of one replica."""
+
+    def __init__(self, url: str, window: int = DEFAULT_WINDOW) -> None:
+        self.url = url
+        self.checks: collections.deque = collections.deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.card: dict[str, Any] = {}
+
+    def record(
+        self,
+        ok: bool,
+        latency: Optional[float],
+        error: Optional[str] = None,
+        card: Optional[dict] = None,
+    ) -> None:
+        self.checks.append((ok, latency))
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+        self.last_error = error
+        self.last_checked = time.time()
+        if card:
+            self.card = {"name": card.get("name"), "version": card.get("version")}
+
+    @property
+    def up(self) -> bool:
+        return bool(self.checks) and self.checks[-1][0]
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = [latency for ok, latency in self.checks if ok]
+        p50, p95 = percentile(latencies, 50), percentile(latencies, 95)
+        return {
+            "url": self.url,
+            "up": self.up,
+            "availability": (
+                round(sum(ok for ok, _ in self.checks) / len(self.checks), 3)
+                if self.checks
+                else None
+            ),
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+            "checks": len(self.checks),
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            **self.card,
+        }
+
+
+class TopologyProber:
+    """Checks the replicas of a master's remote sub-agents periodically.
+
+    Args:
+        agent: The master's root agent; its remote sub-agents are probed.
+        client: An ``httpx.AsyncClient`` used only for the checks, so that
+            they bypass the sub-agents' limits, breakers and balancers.
+        resolve: Returns the replica base URLs of a sub-agent by name;
+            defaults to the registry (see ``a2a_runtime.registry``).
+        balancer: Returns the ``BalancedTransport`` of a sub-agent, if any;
+            defaults to ``a2a_runtime.remote.find_balancer``.
+        breaker: Returns the ``CircuitBreaker`` of a sub-agent, if any;
+            defaults to ``a2a_runtime.breaker.get_breaker``.
+        interval (float): Seconds between rounds of checks.
+        window (int): Checks kept per replica.
+        eject_after (int): Failed checks in a row that eject a replica.
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        client: Any,
+        resolve: Optional[Callable[[str], Any]] = None,
+        balancer: Optional[Callable[[str], Any]] = None,
+        breaker: Optional[Callable[[str], Any]] = None,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        window: int = DEFAULT_WINDOW,
+        eject_after: int = 2,
+    ) -> None:
+        if resolve is None:
+            from a2a_runtime.registry import default_registry
+
+            resolve = default_registry().endpoints
+        if balancer is None:
+            from a2a_runtime.remote import find_balancer as balancer
+        if breaker is None:
+            from a2a_runtime.breaker import get_breaker as breaker
+        self.names = [a.name for a in iter_agents(agent) if is_remote(a)]
+        self.client = client
+        self.resolve = resolve
+        self.balancer = balancer
+        self.breaker = breaker
+        self.interval = interval
+        self.window = window
+        self.eject_after = eject_after
+        self.stats: dict[str, dict[str, EndpointStats]] = {}
+
+    async def check(self, name: str, url: str) -> EndpointStats:
+        """Checks one replica and records the result."""
+        endpoints = self.stats.setdefault(name, {})
+        if url not in endpoints:
+            endpoints[url] = EndpointStats(url, self.window)
+        stats = endpoints[url]
+        base = url.rstrip("/")
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(base + CARD_PATH)
+            response.raise_for_status()
+            card = response.json()
+            ping = await self.client.get(base + PING_PATH)
+            if ping.status_code != 404:
+                ping.raise_for_status()
+        except Exception as e:
+            stats.record(False, None, error=f"{type(e).__name__}: {e}")
+        else:
+            latency = time.perf_counter() - started
+            stats.record(True, latency, card=card)
+            _PROBE_LATENCY.observe(latency, downstream=name)
+        _UP.set(int(stats.up), downstream=name, endpoint=url)
+        return stats
+
+    async def probe_agent(self, name: str) -> None:
+        """Checks every replica of sub-agent ``name`` and applies the results."""
+        urls = await self.resolve(name)
+        balancer = self.balancer(name)
+        if balancer is not None:
+            balancer.health.sync(urls)
+        # Forget replicas that left the registry.
+        known = self.stats.setdefault(name, {})
+        for url in set(known) - set(urls):
+            del known[url]
+        results = await asyncio.gather(*(self.check(name, url) for url in urls))
+        for stats in results:
+            if balancer is not None:
+                balancer.health.probe(stats.url, stats.up, failures=self.eject_after)
+        breaker = self.breaker(name)
+        if breaker is not None and results:
+            breaker.probed(any(stats.up for stats in results))
+
+    async def probe_once(self) -> None:
+        """Runs one round of checks over all sub-agents."""
+        results = await asyncio.gather(
+            *(self.probe_agent(name) for name in self.names), return_exceptions=True
+        )
+        for name, result in zip(self.names, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not probe %s: %s", name, result)
+
+    async def run(self) -> None:
+        """Probes forever, every ``interval`` seconds."""
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def topology(self) -> dict[str, Any]:
+        """Returns the live state of every sub-agent, for ``GET /topology``."""
+        agents = {}
+        for name in self.names:
+            stats = self.stats.get(name, {})
+            balancer = self.balancer(name)
+            health = {}
+            if balancer is not None:
+                health = {row["url"]: row for row in balancer.health.snapshot()}
+            breaker = self.breaker(name)
+            endpoints = []
+            for url, endpoint in stats.items():
+                row = endpoint.to_dict()
+                if url in health:
+                    row["balancer"] = {
+                        key: value for key, value in health[url].items() if key != "url"
+                    }
+                endpoints.append(row)
+            agents[name] = {
+                "up": any(e["up"] for e in endpoints),
+                "breaker": breaker.snapshot() if breaker is not None else None,
+                "endpoints": endpoints,
+            }
+        return {"interval_s": self.interval, "agents": agents}
@@ -0,0 +1,62 @@
+"""This module reports resource usage of a process for soak tests.
+
+``process_stats`` reads ``/proc`` on Linux and falls back to ``resource``
+elsewhere, where only the peak RSS is available.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+_STARTED = time.monotonic()
+
+
+def _proc_status(pid: str) -> dict[str, str]:
+    with open(f"/proc/{pid}/status") as f:
+        return dict(line.split(":", 1) for line in f if ":" in line)
+
+
+def _fd_counts(pid: str) -> tuple[Optional[int], Optional[int]]:
+    """Returns the open file descriptors and how many of them are sockets."""
+    path = f"/proc/{pid}/fd"
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return None, None
+    sockets = 0
+    for name in names:
+        try:
+            sockets += os.readlink(os.path.join(path, name)).startswith("socket:")
+        except OSError:
+            continue
+    return len(names), sockets
+
+
+def process_stats(pid: Optional[int] = None) -> dict[str, Any]:
+    """Returns RSS, open descriptors, sockets and threads of a process.
+
+    Args:
+        pid (int): The process to inspect; defaults to this one. Other
+            processes can only be inspected on Linux.
+    """
+    target = "self" if pid is None else str(pid)
+    stats: dict[str, Any] = {"pid": pid or os.getpid()}
+    try:
+        status = _proc_status(target)
+        stats["rss_bytes"] = int(status["VmRSS"].split()[0]) * 1024
+        stats["threads"] = int(status["Threads"])
+    except (OSError, KeyError, ValueError):
+        if pid is not None:
+            raise
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+        stats["rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+        stats["threads"] = threading.active_count()
+    stats["open_fds"], stats["sockets"] = _fd_counts(target)
+    if pid is None:
+        stats["uptime_s"] = round(time.monotonic() - _STARTED, 1)
+    return stats
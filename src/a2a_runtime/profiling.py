@@ -0,0 +1,222 @@
+"""This module finds what stalls an agent's event loop.
+
+Three tools, all usable on a running server without a redeploy:
+
+*   ``LoopMonitor`` runs a watchdog thread that schedules a heartbeat on the
+    event loop every ``interval`` seconds and measures how late it runs. The
+    lag goes to ``a2a_event_loop_lag_seconds``. When a heartbeat is more than
+    ``slow_threshold`` late, the watchdog captures the loop thread's stack
+    while it is still blocked, so the report names the slow callback rather
+    than whatever runs next.
+*   ``sample_stacks`` samples the stacks of every thread from a background
+    thread, like py-spy, and ``collapse_stacks`` renders them in the collapsed
+    format read by ``flamegraph.pl``, speedscope and Grafana Pyroscope.
+*   ``profile_loop`` runs ``cProfile`` on the event loop thread for a while.
+
+``build_app`` serves the monitor's reports at ``GET /debug/loop`` and both
+profilers at ``GET /debug/profile?seconds=10&format=collapsed``; see
+``a2a_runtime.server``.
+"""
+
+import asyncio
+import cProfile
+import collections
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Any, Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 0.5
+DEFAULT_SLOW_THRESHOLD_SECONDS = 0.1
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.005
+MAX_PROFILE_SECONDS = 120
+
+_LAG = REGISTRY.histogram(
+    "a2a_event_loop_lag_seconds",
+    "How late event loop heartbeats ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+_STALLS = REGISTRY.counter(
+    "a2a_event_loop_stalls_total", "Heartbeats later than the slow threshold."
+)
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def collapse(frame: Optional[FrameType], root: Optional[str] = None) -> str:
+    """Returns a stack as ``root;outer;...;inner``, outermost frame first."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    if root:
+        names.append(root)
+    return ";".join(reversed(names))
+
+
+def collapse_stacks(samples: collections.Counter) -> str:
+    """Renders stack samples in the collapsed ``stack count`` line format."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+def sample_stacks(
+    seconds: float,
+    interval: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+    thread_ids: Optional[set[int]] = None,
+) -> collections.Counter:
+    """Samples thread stacks every ``interval`` seconds; blocks meanwhile.
+
+    Run it in another thread: it only sees the event loop while the loop
+    keeps running.
+
+    Args:
+        seconds (float): How long to sample for.
+        interval (float): Seconds between samples.
+        thread_ids (set[int]): The threads to sample; all but the caller's
+            by default.
+
+    Returns:
+        collections.Counter: Sample counts by collapsed stack, each rooted at
+        the thread's name.
+    """
+    own = threading.get_ident()
+    samples: collections.Counter = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (thread_ids is not None and ident not in thread_ids):
+                continue
+            samples[collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        time.sleep(interval)
+    return samples
+
+
+async def profile_loop(seconds: float) -> cProfile.Profile:
+    """Runs ``cProfile`` on the event loop thread for ``seconds``.
+
+    Every callback and task step the loop runs meanwhile is profiled; other
+    threads are not.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+    return profiler
+
+
+def profile_text(profiler: cProfile.Profile, limit: int = 50) -> str:
+    """Returns the ``limit`` functions with the most cumulative time."""
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def profile_dump(profiler: cProfile.Profile) -> bytes:
+    """Returns what ``Profile.dump_stats`` writes, for pstats or snakeviz."""
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+class LoopMonitor:
+    """Measures event loop lag and captures the stack of slow callbacks.
+
+    Args:
+        interval (float): Seconds between heartbeats.
+        slow_threshold (float): Lag, in seconds, at which a stack is captured.
+        max_reports (int): Slow callback reports kept for ``to_dict``.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        slow_threshold: float = DEFAULT_SLOW_THRESHOLD_SECONDS,
+        max_reports: int = 20,
+    ) -> None:
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.reports: collections.deque = collections.deque(maxlen=max_reports)
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Starts watching ``loop``; call it from the loop's own thread."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="a2a-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(self.interval + self.slow_threshold)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            beat = threading.Event()
+            posted = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(beat.set)
+            except RuntimeError:
+                return  # The loop is closed.
+            stack = None
+            if not beat.wait(self.slow_threshold):
+                frame = sys._current_frames().get(self._loop_thread)
+                stack = traceback.format_stack(frame) if frame else []
+                while not beat.wait(self.interval):
+                    if self._stopped.is_set():
+                        return
+            self._record(time.monotonic() - posted, stack)
+
+    def _record(self, lag: float, stack: Optional[list[str]]) -> None:
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        _LAG.observe(lag)
+        if stack is None:
+            return
+        self.stalls += 1
+        _STALLS.inc()
+        logger.warning("Event loop blocked for %.3fs in:\n%s", lag, "".join(stack[-6:]))
+        self.reports.append(
+            {
+                "at": time.time(),
+                "lag_s": round(lag, 4),
+                "stack": [line.rstrip() for line in stack],
+            }
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "interval_s": self.interval,
+            "slow_threshold_s": self.slow_threshold,
+            "last_lag_s": round(self.last_lag, 4),
+            "max_lag_s": round(self.max_lag, 4),
+            "stalls": self.stalls,
+            "recent_stalls": list(self.reports),
+        }
@@ -0,0 +1,223 @@
+"""This module delivers A2A push notifications for non-blocking tasks.
+
+A client that sends ``message/send`` with ``configuration.blocking`` false
+gets the task back as soon as it is submitted, and the agent keeps running
+in the background. If the call also carries a ``pushNotificationConfig``, the
+task is POSTed to that webhook when it needs the client again: once it is
+completed, failed, canceled or rejected, or needs input or authorization.
+Clients without a webhook poll ``tasks/get`` instead.
+
+The A2A SDK asks the sender to notify after every event of a running task.
+``PushNotifier`` only sends the states above, once per task and state. It
+queues them for background workers, so a slow or failing webhook, retried a
+few times with exponential backoff, never holds up the task.
+
+Webhook URLs come from clients, so ``check_webhook`` guards against requests
+to internal services: only http and https URLs are called, and hosts that
+resolve to private, loopback, link-local or reserved addresses are refused.
+With ``allowed_hosts`` (``A2A_PUSH_ALLOWED_HOSTS``) set, only the listed
+hosts are called, private ones included. Redirects are not followed.
+"""
+
+import asyncio
+import collections
+import ipaddress
+import logging
+import socket
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import httpx
+from a2a.server.tasks.base_push_notification_sender import (
+    BasePushNotificationSender,
+)
+from a2a.server.tasks.push_notification_config_store import (
+    PushNotificationConfigStore,
+)
+from a2a.types import PushNotificationConfig, Task, TaskState
+
+from a2a_runtime.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_STATES = frozenset(
+    {
+        TaskState.completed,
+        TaskState.failed,
+        TaskState.canceled,
+        TaskState.rejected,
+        TaskState.input_required,
+        TaskState.auth_required,
+    }
+)
+TOKEN_HEADER = "X-A2A-Notification-Token"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 1000
+
+_NOTIFICATIONS = REGISTRY.counter(
+    "a2a_push_notifications_total",
+    "Push notifications by task state and delivery result.",
+    ["state", "result"],
+)
+
+
+def _host_allowed(host: str, allowed_hosts: Iterable[str]) -> bool:
+    for allowed in allowed_hosts:
+        allowed = allowed.strip().lower()
+        if allowed.startswith("*."):
+            if host.endswith(allowed[1:]):
+                return True
+        elif allowed and host == allowed:
+            return True
+    return False
+
+
+async def check_webhook(url: str, allowed_hosts: Iterable[str] = ()) -> None:
+    """Checks that a client-supplied webhook URL may be called.
+
+    Args:
+        url (str): The webhook URL.
+        allowed_hosts (list[str]): Host names, or ``*.domain`` suffixes, that
+            may be called even on private addresses. When not empty, no other
+            host may be called.
+
+    Raises:
+        ValueError: If the URL may not be called.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported webhook scheme {parts.scheme!r}")
+    host = (parts.hostname or "").lower()
+    if not host:
+        raise ValueError("Webhook URL has no host")
+    allowed_hosts = list(allowed_hosts)
+    if allowed_hosts:
+        if _host_allowed(host, allowed_hosts):
+            return
+        raise ValueError(f"Webhook host {host!r} is not in A2A_PUSH_ALLOWED_HOSTS")
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, parts.port, type=socket.SOCK_STREAM
+        )
+    except OSError as e:
+        raise ValueError(f"Cannot resolve webhook host {host!r}: {e}") from None
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"Webhook host {host!r} resolves to {address}")
+
+
+class PushNotifier(BasePushNotificationSender):
+    """Sends a task to its webhooks when it reaches a state in ``NOTIFY_STATES``.
+
+    Args:
+        client (httpx.AsyncClient): The client used to call webhooks; it
+            should not follow redirects.
+        config_store: The store of per-task push notification configs.
+        attempts (int): Delivery attempts per webhook.
+        backoff (float): Seconds before the first retry; doubled each time.
+        max_tracked (int): Tasks remembered to avoid duplicate notifications.
+        allowed_hosts (list[str]): See ``check_webhook``.
+        workers (int): Notifications sent concurrently.
+        max_queue (int): Notifications waiting for a worker; more are dropped.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config_store: PushNotificationConfigStore,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_tracked: int = 10000,
+        allowed_hosts: Iterable[str] = (),
+        workers: int = DEFAULT_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        super().__init__(client, config_store)
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_tracked = max_tracked
+        self.allowed_hosts = [host for host in allowed_hosts if host.strip()]
+        self.workers = workers
+        self._sent: collections.OrderedDict[str, TaskState] = collections.OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self._workers: list[asyncio.Task] = []
+
+    async def send_notification(self, task: Task) -> None:
+        state = task.status.state
+        if state not in NOTIFY_STATES or self._sent.get(task.id) == state:
+            return
+        self._sent[task.id] = state
+        self._sent.move_to_end(task.id)
+        while len(self._sent) > self.max_tracked:
+            self._sent.popitem(last=False)
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+        try:
+            # A copy: the task keeps changing while the notification waits.
+            self._queue.put_nowait(task.model_copy(deep=True))
+        except asyncio.QueueFull:
+            logger.warning("Dropping push notification for task %s", task.id)
+            _NOTIFICATIONS.inc(state=state.value, result="dropped")
+
+    async def _work(self) -> None:
+        while True:
+            task = await self._queue.get()
+            try:
+                await super().send_notification(task)
+            except Exception as e:
+                logger.warning("Push notification for task %s failed: %s", task.id, e)
+            finally:
+                self._queue.task_done()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Waits up to ``timeout`` seconds for queued notifications, then stops."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Dropping %d queued push notifications", self._queue.qsize()
+                )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _dispatch_notification(
+        self, task: Task, push_info: PushNotificationConfig
+    ) -> bool:
+        try:
+            await check_webhook(push_info.url, self.allowed_hosts)
+        except ValueError as e:
+            logger.warning("Not notifying task %s: %s", task.id, e)
+            _NOTIFICATIONS.inc(state=task.status.state.value, result="rejected")
+            return False
+        headers = {TOKEN_HEADER: push_info.token} if push_info.token else None
+        payload = task.model_dump(mode="json", exclude_none=True)
+        delay = self.backoff
+        for attempt in range(1, self.attempts + 1):
+            try:
+                response = await self._client.post(
+                    push_info.url, json=payload, headers=headers
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                if attempt == self.attempts:
+                    logger.warning(
+                        "Giving up on push notification for task %s to %s: %s",
+                        task.id,
+                        push_info.url,
+                        e,
+                    )
+                    _NOTIFICATIONS.inc(state=task.status.state.value, result="failed")
+                    return False
+                await asyncio.sleep(delay)
+                delay *= 2
+                continue
+            logger.info("Notified %s of task %s", push_info.url, task.id)
+            _NOTIFICATIONS.inc(state=task.status.state.value, result="sent")
+            return True
+        return False
@@ -0,0 +1,163 @@
+"""This module implements service discovery for A2A agents.
+
+``DEFAULT_ENDPOINTS`` is the local port plan. Each entry can be overridden
+with ``A2A_AGENT_URL_<NAME>``, a comma-separated list of replica base URLs.
+When ``A2A_REGISTRY_URL`` points at a shared store (see
+``a2a_runtime.stores.open_store``), servers register their URL, agent card and
+readiness there with a TTL and keep refreshing it. Masters then spread calls
+over every ready replica of a sub-agent. An agent with no live registration
+falls back to its static URLs.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from a2a_runtime.stores import KeyValueStore, dumps, loads, open_store
+
+logger = logging.getLogger(__name__)
+
+# The local port plan. The masters themselves run on 8081 (a2a_master_agent)
+# and 8085 (poly_master).
+DEFAULT_ENDPOINTS = {
+    "events_agent": "http://127.0.0.1:8082",
+    "helloworld_agent": "http://127.0.0.1:8083",
+    "weathertime_agent": "http://127.0.0.1:8084",
+    "primecheck_agent": "http://127.0.0.1:8086",  # Go
+    "rand_agent": "http://127.0.0.1:8087",  # Python
+    "primegenerator_agent": "http://127.0.0.1:8091",  # Node
+    # Reserved: 8088 Rust prime generator, 8089 TBD, 8090 Java number factor.
+}
+
+DEFAULT_REGISTRATION_TTL_SECONDS = 30
+
+
+def static_urls(name: str) -> list[str]:
+    """Returns the configured replica base URLs of agent ``name``.
+
+    Raises:
+        KeyError: If the agent is neither in the port plan nor configured.
+    """
+    value = os.environ.get(f"A2A_AGENT_URL_{name.upper()}", "")
+    urls = [url.strip() for url in value.split(",") if url.strip()]
+    return urls or [DEFAULT_ENDPOINTS[name]]
+
+
+def static_url(name: str) -> str:
+    """Returns the first configured base URL of agent ``name``."""
+    return static_urls(name)[0]
+
+
+def card_url(name: str) -> str:
+    """Returns the agent card URL of agent ``name``."""
+    from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+    return static_url(name).rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+
+
+class AgentRegistry:
+    """Agent registrations kept in a shared key-value store.
+
+    Each replica is stored under ``registry:{name}:{url}`` and expires unless
+    it is refreshed within ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        store: Optional[KeyValueStore],
+        ttl: float = DEFAULT_REGISTRATION_TTL_SECONDS,
+    ) -> None:
+        self._store = store
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self._store is not None
+
+    @staticmethod
+    def _key(name: str, url: str = "") -> str:
+        return f"registry:{name}:{url}"
+
+    async def register(
+        self,
+        name: str,
+        url: str,
+        card: Optional[dict[str, Any]] = None,
+        ready: bool = True,
+    ) -> None:
+        if self._store is None:
+            return
+        entry = {
+            "name": name,
+            "url": url,
+            "ready": ready,
+            "card": card,
+            "updated": time.time(),
+        }
+        await self._store.set(self._key(name, url), dumps(entry), self.ttl)
+
+    async def deregister(self, name: str, url: str) -> None:
+        if self._store is not None:
+            await self._store.delete(self._key(name, url))
+
+    async def entries(self, name: str) -> list[dict[str, Any]]:
+        """Returns the live registrations of agent ``name``."""
+        if self._store is None:
+            return []
+        entries = []
+        for key in await self._store.keys(self._key(name)):
+            blob = await self._store.get(key)
+            if blob is not None:
+                entries.append(loads(blob))
+        return entries
+
+    async def endpoints(self, name: str) -> list[str]:
+        """Returns the base URLs of the ready replicas of agent ``name``.
+
+        Falls back to the static URLs when no replica is registered.
+        """
+        urls = sorted(e["url"] for e in await self.entries(name) if e["ready"])
+        if urls:
+            return urls
+        try:
+            return static_urls(name)
+        except KeyError:
+            return []
+
+    async def heartbeat(
+        self, name: str, url: str, card: Optional[dict], is_ready
+    ) -> None:
+        """Re-registers every third of the TTL until cancelled.
+
+        Args:
+            is_ready: Callable returning the current readiness.
+        """
+        try:
+            while True:
+                try:
+                    await self.register(name, url, card, ready=is_ready())
+                except Exception as e:
+                    logger.warning("Registry heartbeat for %s failed: %s", name, e)
+                await asyncio.sleep(self.ttl / 3)
+        finally:
+            try:
+                await self.deregister(name, url)
+            except Exception as e:
+                logger.warning("Could not deregister %s: %s", name, e)
+
+    async def close(self) -> None:
+        if self._store is not None:
+            await self._store.close()
+
+
+@functools.lru_cache(maxsize=None)
+def default_registry() -> AgentRegistry:
+    """Returns the process-wide registry configured by ``A2A_REGISTRY_URL``."""
+    url = os.environ.get("A2A_REGISTRY_URL")
+    ttl = float(
+        os.environ.get("A2A_REGISTRATION_TTL_SECONDS", DEFAULT_REGISTRATION_TTL_SECONDS)
+    )
+    return AgentRegistry(open_store(url) if url else None, ttl=ttl)
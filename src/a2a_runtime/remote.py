@@ -0,0 +1,167 @@
+"""This module builds the ``RemoteA2aAgent`` sub-agents used by the masters.
+
+``remote_agent`` resolves a sub-agent by name through ``a2a_runtime.registry``
+and gives it its own HTTP client. Its transport forwards the request deadline,
+spreads calls over the registered replicas, optionally hedges slow calls and
+limits concurrent calls to that downstream. A circuit breaker fails calls
+fast while the sub-agent is down; see ``a2a_runtime.breaker``. Limits default
+to the ``A2A_DOWNSTREAM_*`` environment variables. Static hedging replicas can
+be listed in ``A2A_REPLICAS_<NAME>`` as comma-separated base URLs such as
+``http://10.0.0.2:8084``.
+
+``remote_client`` returns an A2A client over the same transports, for calls
+that bypass the agent, such as bulk queries (see ``a2a_runtime.bulk``).
+"""
+
+import os
+from typing import Any, Optional, Sequence
+
+DEFAULT_TIMEOUT_SECONDS = 600.0
+
+# The balancing transport of each remote agent, for the background prober.
+_BALANCERS: dict[str, Any] = {}
+# The card URL, HTTP client and A2A client factory of each remote agent.
+_CONNECTIONS: dict[str, tuple[str, Any, Any]] = {}
+# A2A clients created by ``remote_client``, by agent name.
+_CLIENTS: dict[str, Any] = {}
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_replicas(name: str) -> list[str]:
+    value = os.environ.get(f"A2A_REPLICAS_{name.upper()}", "")
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def find_balancer(name: str) -> Optional[Any]:
+    """Returns the ``BalancedTransport`` of remote agent ``name``, if built."""
+    return _BALANCERS.get(name)
+
+
+def remote_agent(
+    name: str,
+    description: str = "",
+    agent_card: Optional[str] = None,
+    *,
+    max_concurrent: Optional[int] = None,
+    max_queue: Optional[int] = None,
+    queue_timeout: Optional[float] = None,
+    replicas: Optional[Sequence[str]] = None,
+    hedge_percentile: Optional[float] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Any:
+    """Creates a load-balanced ``RemoteA2aAgent`` with admission control.
+
+    Args:
+        name (str): The sub-agent name, also its key in the registry.
+        description (str): Description shown to the master's LLM.
+        agent_card (str): URL of the remote agent card; defaults to the
+            registry's static URL for ``name``.
+        max_concurrent (int): Concurrent calls allowed to this downstream.
+        max_queue (int): Calls allowed to wait for a free slot.
+        queue_timeout (float): Seconds a call may wait before failing fast.
+        replicas (list[str]): Base URLs that slow calls are hedged to;
+            defaults to ``A2A_REPLICAS_<NAME>``.
+        hedge_percentile (float): Latency percentile, between 0 and 1, after
+            which a call is hedged. Defaults to ``A2A_HEDGE_PERCENTILE``. With
+            no static replicas, calls are hedged to other registered replicas
+            only when a percentile is configured.
+        timeout (float): HTTP timeout for one call.
+
+    Returns:
+        RemoteA2aAgent: The configured sub-agent.
+    """
+    import httpx
+    from a2a.client.client import ClientConfig
+    from a2a.client.client_factory import ClientFactory
+    from a2a.types import TransportProtocol
+    from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+
+    from a2a_runtime.admission import AdmissionController
+    from a2a_runtime.breaker import get_breaker
+    from a2a_runtime.registry import card_url, default_registry
+    from a2a_runtime.transport import (
+        BalancedTransport,
+        BreakerTransport,
+        DeadlineTransport,
+        HedgingTransport,
+        LimitedTransport,
+    )
+
+    controller = AdmissionController(
+        f"downstream:{name}",
+        max_concurrent=max_concurrent or _env_int("A2A_DOWNSTREAM_MAX_CONCURRENCY", 8),
+        max_queue=(
+            max_queue
+            if max_queue is not None
+            else _env_int("A2A_DOWNSTREAM_MAX_QUEUE", 32)
+        ),
+        queue_timeout=queue_timeout
+        or float(os.environ.get("A2A_DOWNSTREAM_QUEUE_TIMEOUT_SECONDS", 10)),
+    )
+    transport = LimitedTransport(httpx.AsyncHTTPTransport(), controller)
+
+    replicas = _env_replicas(name) if replicas is None else list(replicas)
+    if hedge_percentile is None and "A2A_HEDGE_PERCENTILE" in os.environ:
+        hedge_percentile = float(os.environ["A2A_HEDGE_PERCENTILE"]) / 100
+    if replicas or hedge_percentile:
+        transport = HedgingTransport(
+            transport,
+            name,
+            replicas or (lambda: balancer.endpoints),
+            percentile=hedge_percentile or 0.95,
+        )
+
+    registry = default_registry()
+    transport = balancer = _BALANCERS[name] = BalancedTransport(
+        transport, name, lambda: registry.endpoints(name)
+    )
+    breaker = get_breaker(name)
+    if breaker is not None:
+        # Inside the deadline, so that calls it cuts short are not failures.
+        transport = BreakerTransport(transport, breaker)
+    httpx_client = httpx.AsyncClient(
+        transport=DeadlineTransport(transport), timeout=httpx.Timeout(timeout=timeout)
+    )
+    factory = ClientFactory(
+        config=ClientConfig(
+            httpx_client=httpx_client,
+            streaming=False,
+            polling=False,
+            supported_transports=[TransportProtocol.jsonrpc],
+        )
+    )
+    agent_card = agent_card or card_url(name)
+    _CONNECTIONS[name] = (agent_card, httpx_client, factory)
+    _CLIENTS.pop(name, None)
+    return RemoteA2aAgent(
+        name=name,
+        description=description,
+        agent_card=agent_card,
+        timeout=timeout,
+        a2a_client_factory=factory,
+    )
+
+
+async def remote_client(name: str) -> Any:
+    """Returns an A2A client for remote agent ``name``.
+
+    Calls share the agent's limits, balancing, hedging, breaker and deadline.
+    The agent card is fetched on first use.
+
+    Raises:
+        LookupError: If ``remote_agent`` did not build an agent ``name``.
+    """
+    from a2a.types import AgentCard
+
+    if name in _CLIENTS:
+        return _CLIENTS[name]
+    if name not in _CONNECTIONS:
+        raise LookupError(f"No remote agent {name!r}; build it with remote_agent")
+    url, httpx_client, factory = _CONNECTIONS[name]
+    response = await httpx_client.get(url)
+    response.raise_for_status()
+    client = _CLIENTS[name] = factory.create(AgentCard.model_validate(response.json()))
+    return client
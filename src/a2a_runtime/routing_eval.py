@@ -0,0 +1,315 @@
+"""This module measures how well a master agent routes, and how fast.
+
+The masters route by prompt alone, so a prompt change can make routing
+slower, costlier or wrong without anyone noticing. This harness runs a master
+in-process against stub sub-agents and reports, per prompt variant, the
+routing accuracy, the LLM calls and tokens per request and the latency.
+
+A spec, ``routing_eval.json`` in the agent directory by default, holds the
+labelled prompts, the stubs' canned replies and the variants::
+
+    {
+        "stubs": {"rand_agent": {"reply": "Random number: 42"}},
+        "variants": {
+            "baseline": {},
+            "lite": {"model": "gemini-2.5-flash-lite", "instruction": "..."}
+        },
+        "cases": [{"prompt": "Is 97 prime?", "route": ["primecheck_agent"]}]
+    }
+
+A variant overrides the master's ``instruction`` and/or ``model``; an empty
+one runs the agent as written. A stub keeps the name and description of the
+sub-agent it replaces, so the master sees the same choices, and answers after
+``latency_ms`` without calling a model. Like a ``RemoteA2aAgent``, a stub's
+answer ends the turn. The route of a case is the list of sub-agents that
+answered, in order, and an empty route means the master answered itself.
+
+The model calls are real, so the agent's credentials must be set, e.g.
+``GOOGLE_API_KEY``. Nothing else is contacted.
+
+Usage:
+    python src/a2a_runtime/routing_eval.py poly-python/agents/poly_master \
+        --repeat 3 --out routing.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Optional
+
+SPEC_FILENAME = "routing_eval.json"
+
+
+def load_spec(path: str) -> dict[str, Any]:
+    """Reads and checks a routing spec.
+
+    Raises:
+        ValueError: If the spec has no cases or a case has no route.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    spec.setdefault("stubs", {})
+    spec.setdefault("variants", {"baseline": {}})
+    if not spec.get("cases"):
+        raise ValueError(f"{path} has no cases")
+    for case in spec["cases"]:
+        if "prompt" not in case or not isinstance(case.get("route"), list):
+            raise ValueError(f"Case needs a prompt and a route list: {case}")
+    return spec
+
+
+def check_routes(spec: dict[str, Any], sub_agents: list[str]) -> None:
+    """Raises ``ValueError`` if the spec names agents the master lacks."""
+    known = set(sub_agents)
+    named = set(spec["stubs"])
+    for case in spec["cases"]:
+        named.update(case["route"])
+    unknown = sorted(named - known)
+    if unknown:
+        raise ValueError(f"Not sub-agents of the master: {', '.join(unknown)}")
+
+
+def observed_route(authors: list[str], root: str) -> list[str]:
+    """Returns the sub-agents that produced events, in order, without repeats."""
+    route: list[str] = []
+    for author in authors:
+        if author not in (root, "user") and (not route or route[-1] != author):
+            route.append(author)
+    return route
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Returns the nearest-rank ``q`` percentile (0-100) of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(-(-q * len(ordered) // 100)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(results: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Aggregates case results into one row per variant."""
+    by_variant: dict[str, list[dict[str, Any]]] = {}
+    for result in results:
+        by_variant.setdefault(result["variant"], []).append(result)
+    summary = {}
+    for variant, rows in by_variant.items():
+        latencies = [row["latency_ms"] for row in rows]
+        summary[variant] = {
+            "runs": len(rows),
+            "accuracy": sum(row["correct"] for row in rows) / len(rows),
+            "errors": sum(row["error"] is not None for row in rows),
+            "llm_calls": statistics.mean(row["llm_calls"] for row in rows),
+            "prompt_tokens": statistics.mean(row["prompt_tokens"] for row in rows),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "mean_ms": statistics.mean(latencies),
+        }
+    return summary
+
+
+def format_report(
+    summary: dict[str, dict[str, Any]], results: list[dict[str, Any]]
+) -> str:
+    """Formats the variant table followed by every misrouted prompt."""
+    lines = [
+        f"{'variant':<20} {'runs':>5} {'accuracy':>9} {'errors':>7} "
+        f"{'llm_calls':>10} {'prompt_tok':>11} {'p50_ms':>8} {'p95_ms':>8}"
+    ]
+    for variant, row in summary.items():
+        lines.append(
+            f"{variant:<20} {row['runs']:>5} {row['accuracy']:>9.1%} "
+            f"{row['errors']:>7} {row['llm_calls']:>10.2f} "
+            f"{row['prompt_tokens']:>11.0f} {row['p50_ms']:>8.0f} "
+            f"{row['p95_ms']:>8.0f}"
+        )
+    misses = [row for row in results if not row["correct"]]
+    if misses:
+        lines.extend(["", "Misrouted:"])
+    for row in misses:
+        got = row["error"] or " -> ".join(row["route"]) or "(master)"
+        want = " -> ".join(row["expected"]) or "(master)"
+        lines.append(f"  [{row['variant']}] {row['prompt']!r}: {got}, want {want}")
+    return "\n".join(lines)
+
+
+def load_agent(agent_dir: str) -> Any:
+    """Imports ``agent.py`` from ``agent_dir`` and returns its ``root_agent``."""
+    path = os.path.join(agent_dir, "agent.py")
+    name = os.path.basename(os.path.abspath(agent_dir)) + "_agent"
+    module_spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module.root_agent
+
+
+def build_stub(sub_agent: Any, stub: dict[str, Any]) -> Any:
+    """Returns an agent that stands in for ``sub_agent`` with a canned reply."""
+    from google.adk.agents.llm_agent import LlmAgent
+    from google.genai import types
+
+    reply = stub.get("reply", f"{sub_agent.name} handled the request.")
+    delay = stub.get("latency_ms", 0) / 1000
+
+    async def answer(callback_context) -> types.Content:
+        if delay:
+            await asyncio.sleep(delay)
+        return types.Content(role="model", parts=[types.Part(text=reply)])
+
+    return LlmAgent(
+        name=sub_agent.name,
+        description=sub_agent.description,
+        before_agent_callback=answer,
+    )
+
+
+def build_variant(master: Any, spec: dict[str, Any], variant: dict[str, Any]) -> Any:
+    """Clones ``master`` with the variant's overrides and stub sub-agents."""
+    update: dict[str, Any] = {
+        "sub_agents": [
+            build_stub(sub_agent, spec["stubs"].get(sub_agent.name, {}))
+            for sub_agent in master.sub_agents
+        ]
+    }
+    for field in ("instruction", "model"):
+        if variant.get(field):
+            update[field] = variant[field]
+    return master.clone(update=update)
+
+
+async def run_case(runner: Any, root: str, prompt: str) -> dict[str, Any]:
+    """Sends ``prompt`` in a new session and returns its route and costs."""
+    from google.genai import types
+
+    from a2a_runtime.usage import RequestUsage, reset_usage, set_usage
+
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="eval"
+    )
+    usage = RequestUsage()
+    token = set_usage(usage)
+    authors = []
+    error = None
+    started = time.monotonic()
+    try:
+        async for event in runner.run_async(
+            user_id="eval",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+        ):
+            authors.append(event.author)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        reset_usage(token)
+    total = usage.total()
+    return {
+        "route": observed_route(authors, root),
+        "latency_ms": (time.monotonic() - started) * 1000,
+        "llm_calls": total.llm_calls,
+        "prompt_tokens": total.prompt_tokens,
+        "completion_tokens": total.completion_tokens,
+        "error": error,
+    }
+
+
+async def evaluate(
+    master: Any,
+    spec: dict[str, Any],
+    variants: Optional[list[str]] = None,
+    repeat: int = 1,
+    concurrency: int = 4,
+) -> list[dict[str, Any]]:
+    """Runs every case ``repeat`` times under each variant.
+
+    Args:
+        master: The master's root agent.
+        spec (dict): A spec from ``load_spec``.
+        variants (list[str]): Variant names to run; all by default.
+        repeat (int): Runs per case and variant, as routing is not
+            deterministic.
+        concurrency (int): Cases running at once.
+
+    Returns:
+        list[dict]: One result per run, with the variant, prompt, expected
+        and observed routes, latency, LLM calls and tokens.
+    """
+    from google.adk.runners import InMemoryRunner
+
+    from a2a_runtime.plugins import TokenUsagePlugin
+
+    check_routes(spec, [sub_agent.name for sub_agent in master.sub_agents])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(variant: str, runner: Any, case: dict[str, Any]) -> dict:
+        async with semaphore:
+            result = await run_case(runner, master.name, case["prompt"])
+        return {
+            "variant": variant,
+            "prompt": case["prompt"],
+            "expected": case["route"],
+            "correct": result["error"] is None and result["route"] == case["route"],
+            **result,
+        }
+
+    runs = []
+    for name in variants or list(spec["variants"]):
+        runner = InMemoryRunner(
+            agent=build_variant(master, spec, spec["variants"][name]),
+            app_name=master.name,
+            plugins=[TokenUsagePlugin()],
+        )
+        for case in spec["cases"]:
+            runs.extend(run(name, runner, case) for _ in range(repeat))
+    return list(await asyncio.gather(*runs))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Routing accuracy, LLM calls and latency per prompt variant."
+    )
+    parser.add_argument("agent_dir", help="Master agent directory with agent.py.")
+    parser.add_argument("--spec", help=f"Defaults to AGENT_DIR/{SPEC_FILENAME}.")
+    parser.add_argument(
+        "--variant",
+        action="append",
+        dest="variants",
+        help="Variant to run (repeatable). Defaults to all.",
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", help="Write every run and the summary as JSON.")
+    parser.add_argument(
+        "--min-accuracy",
+        type=float,
+        default=0.0,
+        help="Exit with status 1 if a variant routes worse than this (0-1).",
+    )
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec or os.path.join(args.agent_dir, SPEC_FILENAME))
+    unknown = set(args.variants or []) - set(spec["variants"])
+    if unknown:
+        parser.error(f"Unknown variants: {', '.join(sorted(unknown))}")
+    master = load_agent(args.agent_dir)
+    results = asyncio.run(
+        evaluate(master, spec, args.variants, args.repeat, args.concurrency)
+    )
+    summary = summarize(results)
+    print(format_report(summary, results))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"summary": summary, "runs": results}, f, indent=2)
+    worst = min(row["accuracy"] for row in summary.values())
+    return 1 if worst < args.min_accuracy else 0
+
+
+if __name__ == "__main__":
+    # Lets the agent module and this one import a2a_runtime as a script.
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    sys.exit(main())
@@ -0,0 +1,580 @@
+"""This module builds and serves the A2A Starlette app for an ADK agent.
+
+``build_app`` mirrors ``google.adk.a2a.utils.agent_to_a2a.to_a2a`` but creates
+the runner eagerly, warms the agent up in the background and adds liveness and
+readiness endpoints:
+
+*   ``GET /healthz`` always answers 200 once the process serves HTTP.
+*   ``GET /readyz`` answers 503 while warming up and 200 once warm.
+
+Sessions and tasks stay in memory unless ``A2A_STORE_URL`` points at a shared
+store (see ``a2a_runtime.stores.open_store``). Entries then expire after
+``A2A_STORE_TTL_SECONDS`` (one day by default). In-memory sessions are capped
+at ``A2A_MAX_SESSIONS`` and evicted after ``A2A_SESSION_IDLE_SECONDS``.
+
+The history sent to the model is trimmed to ``A2A_HISTORY_TOKEN_BUDGET``
+tokens, and ``A2A_COMPACTION_INTERVAL`` enables ADK's LLM summarization of
+older invocations. Gemini agents send their static instruction and tool
+declarations as a cached context that lives ``A2A_CONTEXT_CACHE_TTL_SECONDS``
+(see ``a2a_runtime.context_cache``). ``GET /debug/sessions?limit=20`` reports
+the session count and the memory use of a sample of sessions, and
+``GET /debug/process`` the RSS, open sockets and tasks sampled by soak tests.
+
+A watchdog measures event loop lag every ``A2A_LOOP_MONITOR_INTERVAL_SECONDS``
+and captures the stack of callbacks that block the loop for more than
+``A2A_SLOW_CALLBACK_SECONDS``; ``GET /debug/loop`` lists them.
+``GET /debug/profile?seconds=10`` samples all thread stacks into collapsed
+flamegraph input, and ``format=text`` or ``format=pstats`` runs ``cProfile``
+on the event loop instead; see ``a2a_runtime.profiling``. These endpoints and
+``/debug/sessions`` expose internals and cost CPU, so they are only served
+with ``A2A_DEBUG_ENDPOINTS=1``.
+
+At most ``A2A_MAX_CONCURRENCY`` JSON-RPC calls, and POSTs to the extra
+``routes``, run at once; up to ``A2A_MAX_QUEUE`` more wait
+``A2A_QUEUE_TIMEOUT_SECONDS`` for a slot and the rest get HTTP 429. Tasks of
+non-blocking calls outlive their call, so at most ``A2A_MAX_BACKGROUND_TASKS``
+of them run at once, queued the same way; rejected ones fail. ``GET /metrics``
+exposes queue depth and rejections.
+
+With ``bulk_tools=True`` (or ``A2A_BULK_TOOLS=1``), a message carrying a
+list of tool calls runs them directly, without the model, and ``routes``
+adds agent-specific endpoints such as a master's ``POST /bulk``; see
+``a2a_runtime.bulk``.
+
+With ``A2A_COALESCE_REQUESTS=1`` (or ``coalesce=True``), identical concurrent
+calls that start a new conversation share one run; see
+``a2a_runtime.coalesce``.
+
+Calls with ``configuration.blocking`` false return the submitted task at
+once; the agent card advertises push notifications, and the finished task is
+POSTed to the call's webhook (see ``a2a_runtime.push``). Webhooks on private
+addresses are refused unless listed in ``A2A_PUSH_ALLOWED_HOSTS``.
+
+The agent card is served from memory with an ``ETag``, conditional GETs and
+``Cache-Control: max-age=A2A_CARD_MAX_AGE_SECONDS``.
+
+Responses of at least ``A2A_COMPRESS_MIN_BYTES`` are compressed with zstd or
+gzip when the client accepts it. Tasks carry their whole history unless the
+client asks for ``historyLength``, a ``historySince`` message id in the
+request metadata, or ``A2A_DEFAULT_HISTORY_LENGTH`` is set.
+
+Tools declared with ``a2a_runtime.offload.offload`` run in a thread or
+process pool; ``A2A_TOOL_OFFLOAD=thread`` moves the undeclared synchronous
+tools to the thread pool as well.
+
+Each call, including POSTs to the extra ``routes``, must finish within its
+``X-A2A-Deadline-Ms`` header, capped at ``A2A_REQUEST_TIMEOUT_SECONDS``; see
+``a2a_runtime.deadline``. The task of a non-blocking call may run
+``A2A_TASK_TIMEOUT_SECONDS`` (0 for no limit).
+
+Calls to sub-agents go through circuit breakers; ``GET /debug/breakers``
+shows their state and the model is told which sub-agents are unavailable
+(see ``a2a_runtime.breaker``).
+
+A master probes the agent card and ``/healthz`` of each sub-agent replica
+every ``A2A_PROBE_INTERVAL_SECONDS`` (0 disables it). ``GET /topology`` serves
+their availability and latency, and failed checks eject replicas and open
+breakers before user calls hit them; see ``a2a_runtime.prober``.
+
+With ``A2A_REGISTRY_URL`` set, the agent registers its card and readiness in
+the registry (see ``a2a_runtime.registry``) under ``A2A_ADVERTISE_URL``.
+
+Every task reports the tokens it used, per agent and per sub-agent hop, in its
+final status metadata and in ``GET /metrics``; see ``a2a_runtime.usage``.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Optional
+
+from a2a_runtime.admission import AdmissionController, AdmissionMiddleware
+from a2a_runtime.breaker import breaker_states
+from a2a_runtime.coalesce import CoalescingMiddleware
+from a2a_runtime.compression import DEFAULT_MIN_SIZE, CompressionMiddleware
+from a2a_runtime.deadline import DeadlineMiddleware
+from a2a_runtime.metrics import REGISTRY
+from a2a_runtime.offload import offload_tools, shutdown_pools
+from a2a_runtime.prober import TopologyProber
+from a2a_runtime.process import process_stats
+from a2a_runtime.profiling import (
+    DEFAULT_INTERVAL_SECONDS,
+    DEFAULT_SAMPLE_INTERVAL_SECONDS,
+    DEFAULT_SLOW_THRESHOLD_SECONDS,
+    MAX_PROFILE_SECONDS,
+    LoopMonitor,
+    collapse_stacks,
+    profile_dump,
+    profile_loop,
+    profile_text,
+    sample_stacks,
+)
+from a2a_runtime.registry import default_registry
+from a2a_runtime.stores import MemoryStore, open_store
+from a2a_runtime.warmup import WarmupState, resolve_remote_cards, warm_up_agent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_SESSION_IDLE_SECONDS = 60 * 60
+DEFAULT_HISTORY_TOKEN_BUDGET = 16000
+HOUSEKEEPING_INTERVAL_SECONDS = 60
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 30
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 300
+DEFAULT_TASK_TIMEOUT_SECONDS = 60 * 60
+DEFAULT_PROBE_INTERVAL_SECONDS = 15
+DEFAULT_PROBE_TIMEOUT_SECONDS = 2
+MAX_STATS_SAMPLE = 200
+
+
+def _env_number(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def debug_endpoints_enabled() -> bool:
+    """Returns whether ``A2A_DEBUG_ENDPOINTS`` turns on the debug endpoints."""
+    return os.environ.get("A2A_DEBUG_ENDPOINTS", "") not in ("", "0")
+
+
+def build_runner(agent: Any, session_service: Any) -> Any:
+    """Creates the runner ``to_a2a`` would create, plus the runtime plugins.
+
+    Args:
+        agent: The ADK root agent, with its tools already offloaded (see
+            ``a2a_runtime.offload.offload_tools``).
+        session_service: The session service to use.
+    """
+    from google.adk.apps.app import App, EventsCompactionConfig
+    from google.adk.artifacts.in_memory_artifact_service import (
+        InMemoryArtifactService,
+    )
+    from google.adk.auth.credential_service.in_memory_credential_service import (
+        InMemoryCredentialService,
+    )
+    from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+    from google.adk.runners import Runner
+
+    from a2a_runtime.context_cache import (
+        DEFAULT_MIN_TOKENS,
+        DEFAULT_TTL_SECONDS,
+        PrefixCache,
+    )
+    from a2a_runtime.plugins import (
+        CircuitBreakerPlugin,
+        ContextCachePlugin,
+        HistoryBudgetPlugin,
+        TokenUsagePlugin,
+    )
+
+    plugins = [TokenUsagePlugin()]
+    budget = int(_env_number("A2A_HISTORY_TOKEN_BUDGET", DEFAULT_HISTORY_TOKEN_BUDGET))
+    if budget > 0:
+        plugins.append(HistoryBudgetPlugin(max_tokens=budget))
+    # After trimming, so that its note is not taken for the latest user turn.
+    plugins.append(CircuitBreakerPlugin(agent))
+    cache_ttl = int(_env_number("A2A_CONTEXT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if cache_ttl > 0:
+        cache = PrefixCache(
+            ttl=cache_ttl,
+            min_tokens=int(
+                _env_number("A2A_CONTEXT_CACHE_MIN_TOKENS", DEFAULT_MIN_TOKENS)
+            ),
+        )
+        plugins.append(ContextCachePlugin(cache, agent))
+
+    compaction = None
+    interval = int(_env_number("A2A_COMPACTION_INTERVAL", 0))
+    if interval > 0:
+        compaction = EventsCompactionConfig(
+            compaction_interval=interval, overlap_size=1
+        )
+
+    app = App(
+        name=agent.name or "adk_agent",
+        root_agent=agent,
+        plugins=plugins,
+        events_compaction_config=compaction,
+    )
+    return Runner(
+        app=app,
+        artifact_service=InMemoryArtifactService(),
+        session_service=session_service,
+        memory_service=InMemoryMemoryService(),
+        credential_service=InMemoryCredentialService(),
+    )
+
+
+def build_app(
+    agent: Any,
+    *,
+    port: int,
+    host: str = "localhost",
+    protocol: str = "http",
+    store_url: Optional[str] = None,
+    coalesce: Optional[bool] = None,
+    bulk_tools: Optional[bool] = None,
+    routes: Optional[list] = None,
+) -> Any:
+    """Converts an ADK agent into a warmed-up A2A Starlette application.
+
+    Args:
+        agent: The ADK root agent to serve.
+        port (int): The port advertised in the agent card.
+        host (str): The host advertised in the agent card.
+        protocol (str): The scheme advertised in the agent card.
+        store_url (str): Shared session and task store; defaults to the
+            ``A2A_STORE_URL`` environment variable.
+        coalesce (bool): Share one run among identical concurrent new
+            conversations. The ``A2A_COALESCE_REQUESTS`` environment
+            variable overrides it when set.
+        bulk_tools (bool): Let bulk messages call the agent's tools without
+            the model. The ``A2A_BULK_TOOLS`` environment variable overrides
+            it when set.
+        routes (list): Extra Starlette routes to serve.
+
+    Returns:
+        Starlette: The application, ready to be run with uvicorn.
+    """
+    from a2a.server.tasks import InMemoryTaskStore
+    from a2a.types import AgentCapabilities
+    from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
+    from google.adk.cli.utils.logs import setup_adk_logger
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, PlainTextResponse, Response
+    from starlette.routing import Route
+
+    setup_adk_logger(logging.INFO)
+
+    import httpx
+
+    from a2a_runtime.bulk import tool_table
+    from a2a_runtime.executor import DeadlineAgentExecutor
+    from a2a_runtime.jsonrpc import (
+        DEFAULT_CARD_MAX_AGE_SECONDS,
+        FastJSONStarletteApplication,
+        HistoryTrimmingRequestHandler,
+    )
+    from a2a_runtime.push import PushNotifier
+    from a2a_runtime.session_service import (
+        DEFAULT_STATS_SAMPLE,
+        BoundedSessionService,
+        SharedSessionService,
+    )
+
+    from a2a_runtime.task_store import SharedPushConfigStore
+
+    # One tree for the runner, warm-up, the prober and the card: offloading
+    # copies the agents, and the originals never serve a call.
+    agent, offloaded = offload_tools(agent)
+    if offloaded:
+        logger.info("Running %d blocking tools off the event loop", offloaded)
+
+    state = WarmupState()
+    store_url = store_url or os.environ.get("A2A_STORE_URL")
+    store = None
+    ttl = _env_number("A2A_STORE_TTL_SECONDS", DEFAULT_STORE_TTL_SECONDS)
+    # Webhooks of finished tasks expire even without a shared store.
+    push_store = MemoryStore()
+    if store_url:
+        from a2a_runtime.task_store import SharedTaskStore
+
+        store = push_store = open_store(store_url)
+        session_service = SharedSessionService(store, ttl=ttl)
+        task_store = SharedTaskStore(store, ttl=ttl)
+        logger.info("Using shared session and task store at %s", store_url)
+    else:
+        session_service = BoundedSessionService(
+            max_sessions=int(_env_number("A2A_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)),
+            idle_ttl=_env_number(
+                "A2A_SESSION_IDLE_SECONDS", DEFAULT_SESSION_IDLE_SECONDS
+            ),
+        )
+        task_store = InMemoryTaskStore()
+
+    push_config_store = SharedPushConfigStore(push_store, ttl=ttl)
+    push_client = httpx.AsyncClient(timeout=10, follow_redirects=False)
+    push_sender = PushNotifier(
+        push_client,
+        push_config_store,
+        allowed_hosts=os.environ.get("A2A_PUSH_ALLOWED_HOSTS", "").split(","),
+    )
+    probe_client = httpx.AsyncClient(
+        timeout=_env_number("A2A_PROBE_TIMEOUT_SECONDS", DEFAULT_PROBE_TIMEOUT_SECONDS)
+    )
+    prober = TopologyProber(
+        agent,
+        probe_client,
+        interval=_env_number(
+            "A2A_PROBE_INTERVAL_SECONDS", DEFAULT_PROBE_INTERVAL_SECONDS
+        ),
+    )
+    history_length = os.environ.get("A2A_DEFAULT_HISTORY_LENGTH")
+    if "A2A_BULK_TOOLS" in os.environ:
+        bulk_tools = os.environ["A2A_BULK_TOOLS"] not in ("", "0")
+    runner = build_runner(agent, session_service)
+    task_timeout = _env_number("A2A_TASK_TIMEOUT_SECONDS", DEFAULT_TASK_TIMEOUT_SECONDS)
+    max_concurrency = int(_env_number("A2A_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+    max_queue = int(_env_number("A2A_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+    queue_timeout = _env_number(
+        "A2A_QUEUE_TIMEOUT_SECONDS", DEFAULT_QUEUE_TIMEOUT_SECONDS
+    )
+    max_background = int(_env_number("A2A_MAX_BACKGROUND_TASKS", max_concurrency))
+    request_handler = HistoryTrimmingRequestHandler(
+        agent_executor=DeadlineAgentExecutor(
+            runner=runner,
+            bulk_tools=tool_table(agent) if bulk_tools else None,
+            task_timeout=task_timeout or None,
+            background=(
+                AdmissionController(
+                    f"{agent.name or 'adk_agent'}_background",
+                    max_concurrent=max_background,
+                    max_queue=max_queue,
+                    queue_timeout=queue_timeout,
+                )
+                if max_background > 0
+                else None
+            ),
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender,
+        default_history_length=int(history_length) if history_length else None,
+    )
+    rpc_url = f"{protocol}://{host}:{port}/"
+    card_builder = AgentCardBuilder(
+        agent=agent,
+        rpc_url=rpc_url,
+        capabilities=AgentCapabilities(push_notifications=True),
+    )
+
+    async def healthz(request):
+        return JSONResponse({"status": "ok"})
+
+    async def readyz(request):
+        return JSONResponse(state.to_dict(), status_code=200 if state.ready else 503)
+
+    async def debug_sessions(request):
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_STATS_SAMPLE))
+        except ValueError:
+            return JSONResponse({"error": "limit must be an integer"}, 400)
+        count, stats = await session_service.stats(min(limit, MAX_STATS_SAMPLE))
+        return JSONResponse(
+            {
+                "sessions": count,
+                "sampled": len(stats),
+                "estimated_tokens": sum(s["estimated_tokens"] for s in stats),
+                "bytes": sum(s["bytes"] for s in stats),
+                "per_session": stats,
+            }
+        )
+
+    async def debug_process(request):
+        stats = process_stats()
+        stats["asyncio_tasks"] = len(asyncio.all_tasks())
+        return JSONResponse(stats)
+
+    monitor = LoopMonitor(
+        interval=_env_number(
+            "A2A_LOOP_MONITOR_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS
+        ),
+        slow_threshold=_env_number(
+            "A2A_SLOW_CALLBACK_SECONDS", DEFAULT_SLOW_THRESHOLD_SECONDS
+        ),
+    )
+    profiling = asyncio.Lock()
+
+    async def debug_loop(request):
+        return JSONResponse(monitor.to_dict())
+
+    async def debug_profile(request):
+        params = request.query_params
+        output = params.get("format", "collapsed")
+        try:
+            seconds = min(float(params.get("seconds", 10)), MAX_PROFILE_SECONDS)
+            interval = float(params.get("interval", DEFAULT_SAMPLE_INTERVAL_SECONDS))
+        except ValueError:
+            return JSONResponse({"error": "seconds and interval must be numbers"}, 400)
+        if output not in ("collapsed", "text", "pstats"):
+            return JSONResponse({"error": f"Unknown format {output!r}"}, 400)
+        if profiling.locked():
+            return JSONResponse({"error": "A profile is already running"}, 409)
+        async with profiling:
+            if output == "collapsed":
+                samples = await asyncio.to_thread(sample_stacks, seconds, interval)
+                return PlainTextResponse(collapse_stacks(samples))
+            profiler = await profile_loop(seconds)
+        if output == "text":
+            return PlainTextResponse(profile_text(profiler))
+        return Response(
+            profile_dump(profiler),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="a2a.pstats"'},
+        )
+
+    # Off by default: they show user ids and stack frames, and cost CPU.
+    debug_routes = [
+        Route("/debug/sessions", debug_sessions),
+        Route("/debug/loop", debug_loop),
+        Route("/debug/profile", debug_profile),
+    ]
+
+    async def debug_breakers(request):
+        return JSONResponse(breaker_states())
+
+    async def topology(request):
+        return JSONResponse(prober.topology())
+
+    async def metrics(request):
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
+    app = Starlette(
+        routes=[
+            Route("/healthz", healthz),
+            Route("/readyz", readyz),
+            Route("/debug/process", debug_process),
+            Route("/debug/breakers", debug_breakers),
+            Route("/topology", topology),
+            Route("/metrics", metrics),
+            *(debug_routes if debug_endpoints_enabled() else []),
+            *(routes or []),
+        ]
+    )
+    # JSON-RPC calls and extra POST endpoints, such as a master's /bulk.
+    rpc_paths = (
+        "/",
+        *(
+            route.path
+            for route in routes or []
+            if "POST" in (getattr(route, "methods", None) or ())
+        ),
+    )
+    if max_concurrency > 0:
+        app.add_middleware(
+            AdmissionMiddleware,
+            controller=AdmissionController(
+                agent.name or "adk_agent",
+                max_concurrent=max_concurrency,
+                max_queue=max_queue,
+                queue_timeout=queue_timeout,
+            ),
+            paths=rpc_paths,
+        )
+    if "A2A_COALESCE_REQUESTS" in os.environ:
+        coalesce = os.environ["A2A_COALESCE_REQUESTS"] not in ("", "0")
+    if coalesce:
+        # Outside admission control, so that followers do not take slots.
+        app.add_middleware(CoalescingMiddleware)
+    # Runs before coalescing and admission: queueing counts against the deadline.
+    request_timeout = _env_number(
+        "A2A_REQUEST_TIMEOUT_SECONDS", DEFAULT_REQUEST_TIMEOUT_SECONDS
+    )
+    app.add_middleware(
+        DeadlineMiddleware, default_timeout=request_timeout or None, paths=rpc_paths
+    )
+    compress_min = int(_env_number("A2A_COMPRESS_MIN_BYTES", DEFAULT_MIN_SIZE))
+    if compress_min > 0:
+        # Outermost, so that coalesced responses are encoded for each client.
+        app.add_middleware(CompressionMiddleware, min_size=compress_min)
+    app.state.warmup = state
+    background_tasks = set()
+
+    def start_background(coro) -> None:
+        task = asyncio.create_task(coro)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    async def housekeeping() -> None:
+        while True:
+            await asyncio.sleep(HOUSEKEEPING_INTERVAL_SECONDS)
+            try:
+                if store is not None:
+                    removed = await store.purge_expired()
+                else:
+                    removed = session_service.evict()
+                    removed += await push_store.purge_expired()
+                if removed:
+                    logger.info("Evicted %d expired sessions or tasks", removed)
+            except Exception as e:
+                logger.warning("Housekeeping failed: %s", e)
+
+    async def setup_a2a():
+        agent_card = await card_builder.build()
+        a2a_app = FastJSONStarletteApplication(
+            agent_card=agent_card,
+            http_handler=request_handler,
+            card_max_age=int(
+                _env_number("A2A_CARD_MAX_AGE_SECONDS", DEFAULT_CARD_MAX_AGE_SECONDS)
+            ),
+        )
+        a2a_app.add_routes_to_app(app)
+
+        if monitor.interval > 0:
+            monitor.start()
+        # Warm-up runs after startup so /readyz can report progress meanwhile.
+        start_background(warm_up_agent(agent, state))
+        start_background(resolve_remote_cards(agent, state))
+        start_background(housekeeping())
+        if prober.names and prober.interval > 0:
+            start_background(prober.run())
+
+        registry = default_registry()
+        if registry.enabled:
+            start_background(
+                registry.heartbeat(
+                    agent.name,
+                    os.environ.get("A2A_ADVERTISE_URL") or rpc_url.rstrip("/"),
+                    agent_card.model_dump(mode="json", exclude_none=True),
+                    lambda: state.ready,
+                )
+            )
+
+    async def shutdown():
+        for task in list(background_tasks):
+            task.cancel()
+        # Lets the registry heartbeat deregister before the store closes.
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await push_sender.close()
+        await push_client.aclose()
+        await probe_client.aclose()
+        shutdown_pools()
+        monitor.stop()
+        if store is not None:
+            await store.close()
+        await default_registry().close()
+
+    app.add_event_handler("startup", setup_a2a)
+    app.add_event_handler("shutdown", shutdown)
+    return app
+
+
+def serve(
+    agent: Any,
+    *,
+    port: int,
+    host: str = "0.0.0.0",
+    coalesce: Optional[bool] = None,
+    bulk_tools: Optional[bool] = None,
+    routes: Optional[list] = None,
+) -> None:
+    """Builds the app for ``agent`` and runs it with uvicorn.
+
+    Args:
+        agent: The ADK root agent to serve.
+        port (int): The port to listen on and advertise.
+        host (str): The interface to bind; '0.0.0.0' allows external access.
+        coalesce (bool): See ``build_app``.
+        bulk_tools (bool): See ``build_app``.
+        routes (list): See ``build_app``.
+    """
+    import uvicorn
+
+    app = build_app(
+        agent, port=port, coalesce=coalesce, bulk_tools=bulk_tools, routes=routes
+    )
+    uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,323 @@
+"""This module defines the bounded ADK session services used by ``build_app``.
+
+``BoundedSessionService`` keeps sessions in memory but evicts the least
+recently used ones beyond ``max_sessions`` and any idle longer than
+``idle_ttl`` seconds.
+
+``SharedSessionService`` keeps sessions in a ``KeyValueStore``. Storage layout:
+
+*   ``session:{app}:{user}:{id}`` holds the session as it was created, with
+    its initial session-scoped state and no events.
+*   ``events:{app}:{user}:{id}`` is the append-only list of its events. The
+    session-scoped state is replayed from their state deltas, so replicas
+    serving the same conversation never overwrite each other's events.
+*   ``appstate:{app}`` and ``userstate:{app}:{user}`` hold the ``app:`` and
+    ``user:`` prefixed state shared across sessions, as in
+    ``InMemorySessionService``.
+
+Every write refreshes the TTL, so idle sessions expire on their own.
+"""
+
+import collections
+import logging
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events.event import Event
+from google.adk.sessions import _session_util
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+from a2a_runtime.history import session_stats
+from a2a_runtime.stores import KeyValueStore, dumps, loads, pack, unpack
+
+logger = logging.getLogger(__name__)
+
+# Sessions whose statistics ``stats`` loads, at most.
+DEFAULT_STATS_SAMPLE = 20
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory session service with LRU and idle-time eviction."""
+
+    def __init__(
+        self, max_sessions: int = 1000, idle_ttl: Optional[float] = None
+    ) -> None:
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        # (app_name, user_id, session_id) -> last access time, oldest first.
+        self._access: collections.OrderedDict = collections.OrderedDict()
+
+    def _touch(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._access[key] = time.time()
+        self._access.move_to_end(key)
+
+    def _evict(self, key: tuple) -> None:
+        app_name, user_id, session_id = key
+        self._access.pop(key, None)
+        self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+
+    def evict(self) -> int:
+        """Evicts idle sessions and trims to ``max_sessions``.
+
+        Returns:
+            int: The number of evicted sessions.
+        """
+        evicted = 0
+        if self.idle_ttl:
+            cutoff = time.time() - self.idle_ttl
+            for key, last_access in list(self._access.items()):
+                if last_access > cutoff:
+                    break
+                self._evict(key)
+                evicted += 1
+        while len(self._access) > self.max_sessions:
+            self._evict(next(iter(self._access)))
+            evicted += 1
+        return evicted
+
+    async def create_session(self, *, app_name: str, user_id: str, **kwargs) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, **kwargs
+        )
+        self._touch(app_name, user_id, session.id)
+        self.evict()
+        return session
+
+    async def get_session(
+        self, *, app_name: str, user_id: str, session_id: str, **kwargs
+    ) -> Optional[Session]:
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, **kwargs
+        )
+        if session is not None:
+            self._touch(app_name, user_id, session_id)
+        return session
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await super().delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        self._access.pop((app_name, user_id, session_id), None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        # An evicted session stays evicted; tracking it would leak its entry.
+        key = (session.app_name, session.user_id, session.id)
+        if session.id in self.sessions.get(key[0], {}).get(key[1], {}):
+            self._touch(*key)
+        return event
+
+    async def stats(self, limit: int = DEFAULT_STATS_SAMPLE) -> tuple[int, list]:
+        """Returns the session count and a sample of per-session statistics.
+
+        The sample holds the ``limit`` most recently used sessions, most
+        recently used last.
+        """
+        now = time.time()
+        live = [
+            (app, user, sid)
+            for app, user, sid in self._access
+            if sid in self.sessions.get(app, {}).get(user, {})
+        ]
+        sample = live[-limit:] if limit > 0 else []
+        return len(live), [
+            session_stats(self.sessions[app][user][sid], now)
+            for app, user, sid in sample
+        ]
+
+
+class SharedSessionService(BaseSessionService):
+    """Session service that persists sessions in a shared key-value store."""
+
+    def __init__(self, store: KeyValueStore, ttl: Optional[float] = None) -> None:
+        self._store = store
+        self._ttl = ttl
+
+    @staticmethod
+    def _session_key(app_name: str, user_id: str, session_id: str) -> str:
+        return f"session:{app_name}:{user_id}:{session_id}"
+
+    @staticmethod
+    def _events_key(session_key: str) -> str:
+        return "events:" + session_key.removeprefix("session:")
+
+    async def _load_dict(self, key: str) -> dict:
+        blob = await self._store.get(key)
+        return loads(blob) if blob is not None else {}
+
+    async def _update_dict(self, key: str, delta: dict) -> None:
+        if delta:
+            current = await self._load_dict(key)
+            current.update(delta)
+            await self._store.set(key, dumps(current), self._ttl)
+
+    async def _load_session(self, key: str) -> Optional[Session]:
+        blob = await self._store.get(key)
+        if blob is None:
+            return None
+        session = Session.model_validate_json(unpack(blob))
+        for item in await self._store.get_list(self._events_key(key)):
+            event = Event.model_validate_json(unpack(item))
+            session.events.append(event)
+            session.last_update_time = max(session.last_update_time, event.timestamp)
+            if event.actions and event.actions.state_delta:
+                deltas = _session_util.extract_state_delta(event.actions.state_delta)
+                session.state.update(deltas["session"])
+        return session
+
+    async def _save_session(self, session: Session) -> None:
+        key = self._session_key(session.app_name, session.user_id, session.id)
+        await self._store.set(key, pack(session.model_dump_json().encode()), self._ttl)
+
+    async def _merge_state(self, session: Session) -> Session:
+        """Adds the shared app and user state to a loaded session."""
+        app_state = await self._load_dict(f"appstate:{session.app_name}")
+        user_state = await self._load_dict(
+            f"userstate:{session.app_name}:{session.user_id}"
+        )
+        for key, value in app_state.items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    async def _apply_state_delta(
+        self, app_name: str, user_id: str, state: Optional[dict]
+    ) -> dict:
+        """Persists the app and user parts of ``state``; returns the rest."""
+        deltas = _session_util.extract_state_delta(state)
+        await self._update_dict(f"appstate:{app_name}", deltas["app"])
+        await self._update_dict(f"userstate:{app_name}:{user_id}", deltas["user"])
+        return deltas["session"]
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else str(uuid.uuid4())
+        )
+        key = self._session_key(app_name, user_id, session_id)
+        if await self._store.get(key) is not None:
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+
+        session_state = await self._apply_state_delta(app_name, user_id, state)
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=session_state or {},
+            last_update_time=time.time(),
+        )
+        await self._save_session(session)
+        return await self._merge_state(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await self._load_session(
+            self._session_key(app_name, user_id, session_id)
+        )
+        if session is None:
+            return None
+
+        if config:
+            recent = config.num_recent_events
+            if recent:
+                session.events = session.events[-recent:]
+            if config.after_timestamp:
+                session.events = [
+                    event
+                    for event in session.events
+                    if event.timestamp >= config.after_timestamp
+                ]
+        return await self._merge_state(session)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        prefix = (
+            f"session:{app_name}:{user_id}:"
+            if user_id is not None
+            else f"session:{app_name}:"
+        )
+        sessions = []
+        for key in await self._store.keys(prefix):
+            session = await self._load_session(key)
+            if session is None or session.app_name != app_name:
+                continue
+            session.events = []
+            sessions.append(await self._merge_state(session))
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        key = self._session_key(app_name, user_id, session_id)
+        await self._store.delete(key)
+        await self._store.delete(self._events_key(key))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        key = self._session_key(session.app_name, session.user_id, session.id)
+        created = await self._store.get(key)
+        if created is None:
+            logger.warning(
+                "Failed to append event to session %s: session not found", session.id
+            )
+            return event
+
+        # Update the caller's session object; this also drops temp: state.
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        if event.actions and event.actions.state_delta:
+            await self._apply_state_delta(
+                session.app_name, session.user_id, event.actions.state_delta
+            )
+        await self._store.append(
+            self._events_key(key), pack(event.model_dump_json().encode()), self._ttl
+        )
+        # The session record never changes; writing it back refreshes its TTL.
+        await self._store.set(key, created, self._ttl)
+        return event
+
+    async def stats(self, limit: int = DEFAULT_STATS_SAMPLE) -> tuple[int, list]:
+        """Returns the session count and a sample of per-session statistics.
+
+        Only the ``limit`` sampled sessions are loaded from the store.
+        """
+        now = time.time()
+        keys = await self._store.keys("session:")
+        stats = []
+        for key in keys[:limit]:
+            session = await self._load_session(key)
+            if session is not None:
+                stats.append(session_stats(session, now))
+        return len(keys), stats
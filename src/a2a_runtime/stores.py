@@ -0,0 +1,454 @@
+"""This module defines the key-value stores behind shared sessions and tasks.
+
+Three backends implement the same async interface:
+
+*   ``MemoryStore`` keeps everything in the process. It is the local stand-in
+    used by tests and single-replica development.
+*   ``SQLiteStore`` persists to a WAL-mode SQLite file that several local
+    replicas can share.
+*   ``RedisStore`` speaks the Redis protocol (RESP) to any compatible server.
+
+Besides plain values, a key can hold a list that writers only append to, so
+that concurrent writers never overwrite each other (``RPUSH`` in Redis).
+
+Every value and list carries an optional TTL, refreshed by each append.
+Expired entries are never returned and are dropped by ``purge_expired`` (or
+natively by Redis).
+"""
+
+import abc
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+
+from a2a_runtime import codec
+
+# Values above this size are zlib-compressed before they are stored.
+COMPRESS_THRESHOLD = 512
+_RAW = b"j"
+_ZLIB = b"z"
+
+
+class StoreError(Exception):
+    """Raised when a store backend fails or is misconfigured."""
+
+
+def pack(payload: bytes) -> bytes:
+    """Compacts a serialized value, compressing it when that pays off."""
+    if len(payload) > COMPRESS_THRESHOLD:
+        compressed = zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            return _ZLIB + compressed
+    return _RAW + payload
+
+
+def unpack(blob: bytes) -> bytes:
+    """Reverses ``pack``."""
+    if blob[:1] == _ZLIB:
+        return zlib.decompress(blob[1:])
+    return blob[1:]
+
+
+def dumps(value: Any) -> bytes:
+    """Serializes a JSON-compatible value compactly."""
+    return pack(codec.dumps(value))
+
+
+def loads(blob: bytes) -> Any:
+    """Reverses ``dumps``."""
+    return codec.loads(unpack(blob))
+
+
+class KeyValueStore(abc.ABC):
+    """Async key-value interface with per-key TTLs."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Returns the value for ``key`` or None if missing or expired."""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Stores ``value`` under ``key``, expiring after ``ttl`` seconds."""
+
+    @abc.abstractmethod
+    async def append(self, key: str, value: bytes, ttl: Optional[float] = None) -> int:
+        """Appends ``value`` to the list at ``key`` and returns its length.
+
+        The whole list then expires after ``ttl`` seconds.
+        """
+
+    @abc.abstractmethod
+    async def get_list(self, key: str) -> list[bytes]:
+        """Returns the list at ``key``, oldest first; empty if missing."""
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """Removes ``key``, value or list, if present."""
+
+    @abc.abstractmethod
+    async def keys(self, prefix: str) -> list[str]:
+        """Returns the live keys starting with ``prefix``, lists included."""
+
+    async def purge_expired(self) -> int:
+        """Drops expired entries and returns how many were removed."""
+        return 0
+
+    async def close(self) -> None:
+        """Releases connections held by the store."""
+
+
+class MemoryStore(KeyValueStore):
+    """In-process store; the local stand-in for the shared backends."""
+
+    def __init__(self) -> None:
+        # Values are bytes, or lists of bytes for ``append``.
+        self._data: dict[str, tuple[Any, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._live(key)
+        return None if isinstance(value, list) else value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, time.time() + ttl if ttl else None)
+
+    async def append(self, key: str, value: bytes, ttl: Optional[float] = None) -> int:
+        values = self._live(key)
+        values = [*values, value] if isinstance(values, list) else [value]
+        self._data[key] = (values, time.time() + ttl if ttl else None)
+        return len(values)
+
+    async def get_list(self, key: str) -> list[bytes]:
+        values = self._live(key)
+        return list(values) if isinstance(values, list) else []
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def keys(self, prefix: str) -> list[str]:
+        candidates = [key for key in self._data if key.startswith(prefix)]
+        return [key for key in candidates if self._live(key) is not None]
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        expired = [
+            key
+            for key, (_, expires_at) in self._data.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+
+class SQLiteStore(KeyValueStore):
+    """Store backed by a SQLite file in WAL mode.
+
+    WAL lets readers in other processes proceed while one process writes, so
+    several replicas on one host can share a conversation. Queries run in a
+    worker thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)"
+            )
+            # Lists: the TTL lives in kv_list, the items in insertion order.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv_list ("
+                " key TEXT PRIMARY KEY, expires_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv_list_item ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " key TEXT NOT NULL, value BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS kv_list_item_key ON kv_list_item (key)"
+            )
+            self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple, commit: bool) -> tuple[list, int]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchall()
+            if commit:
+                self._conn.commit()
+            return rows, cursor.rowcount
+
+    def _append(self, key: str, value: bytes, ttl: Optional[float]) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            # An expired list starts over.
+            self._conn.execute(
+                "DELETE FROM kv_list_item WHERE key = ? AND key IN (SELECT key"
+                " FROM kv_list WHERE expires_at IS NOT NULL AND expires_at <= ?)",
+                (key, now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv_list (key, expires_at) VALUES (?, ?)",
+                (key, now + ttl if ttl else None),
+            )
+            self._conn.execute(
+                "INSERT INTO kv_list_item (key, value) VALUES (?, ?)", (key, value)
+            )
+            (length,) = self._conn.execute(
+                "SELECT COUNT(*) FROM kv_list_item WHERE key = ?", (key,)
+            ).fetchone()
+        return length
+
+    async def _run(
+        self, sql: str, params: tuple = (), commit: bool = False
+    ) -> tuple[list, int]:
+        return await asyncio.to_thread(self._execute, sql, params, commit)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        rows, _ = await self._run(
+            "SELECT value FROM kv WHERE key = ?"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl if ttl else None),
+            commit=True,
+        )
+
+    async def append(self, key: str, value: bytes, ttl: Optional[float] = None) -> int:
+        return await asyncio.to_thread(self._append, key, value, ttl)
+
+    async def get_list(self, key: str) -> list[bytes]:
+        rows, _ = await self._run(
+            "SELECT value FROM kv_list_item WHERE key = ? AND key IN (SELECT key"
+            " FROM kv_list WHERE expires_at IS NULL OR expires_at > ?) ORDER BY id",
+            (key, time.time()),
+        )
+        return [row[0] for row in rows]
+
+    async def delete(self, key: str) -> None:
+        await self._run("DELETE FROM kv WHERE key = ?", (key,), commit=True)
+        await self._run("DELETE FROM kv_list WHERE key = ?", (key,), commit=True)
+        await self._run("DELETE FROM kv_list_item WHERE key = ?", (key,), commit=True)
+
+    async def keys(self, prefix: str) -> list[str]:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%")
+        escaped = escaped.replace("_", "\\_")
+        rows, _ = await self._run(
+            "SELECT key FROM kv WHERE key LIKE ? ESCAPE '\\'"
+            " AND (expires_at IS NULL OR expires_at > ?)"
+            " UNION SELECT key FROM kv_list WHERE key LIKE ? ESCAPE '\\'"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (escaped + "%", time.time()) * 2,
+        )
+        return [row[0] for row in rows]
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        _, removed = await self._run(
+            "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+            commit=True,
+        )
+        _, lists = await self._run(
+            "DELETE FROM kv_list WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+            commit=True,
+        )
+        if lists:
+            await self._run(
+                "DELETE FROM kv_list_item WHERE key NOT IN (SELECT key FROM kv_list)",
+                commit=True,
+            )
+        return removed + lists
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisStore(KeyValueStore):
+    """Store speaking RESP2 to a Redis-compatible server over one connection.
+
+    TTLs map to ``SET ... PX`` so the server evicts expired keys itself.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            self._host, self._port
+        )
+        if self._password:
+            await self._roundtrip("AUTH", self._password)
+        if self._db:
+            await self._roundtrip("SELECT", str(self._db))
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionResetError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise StoreError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise StoreError(f"Unexpected RESP reply: {line!r}")
+
+    async def _roundtrip(self, *args: Any) -> Any:
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def command(self, *args: Any) -> Any:
+        """Sends one command, reconnecting once if the connection dropped.
+
+        A command that fails or is cancelled midway closes the connection, so
+        that its unread reply cannot be taken for the next command's.
+        """
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._roundtrip(*args)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    self._disconnect()
+                    if attempt:
+                        raise StoreError(f"Redis command failed: {e}") from e
+                except BaseException:
+                    self._disconnect()
+                    raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self.command("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            await self.command("SET", key, value)
+
+    async def append(self, key: str, value: bytes, ttl: Optional[float] = None) -> int:
+        length = await self.command("RPUSH", key, value)
+        if ttl:
+            await self.command("PEXPIRE", key, int(ttl * 1000))
+        else:
+            await self.command("PERSIST", key)
+        return length
+
+    async def get_list(self, key: str) -> list[bytes]:
+        return await self.command("LRANGE", key, 0, -1) or []
+
+    async def delete(self, key: str) -> None:
+        await self.command("DEL", key)
+
+    async def keys(self, prefix: str) -> list[str]:
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        cursor, found = "0", []
+        while True:
+            cursor, batch = await self.command(
+                "SCAN", cursor, "MATCH", pattern, "COUNT", 500
+            )
+            cursor = cursor.decode()
+            found.extend(key.decode() for key in batch)
+            if cursor == "0":
+                return sorted(set(found))
+
+    async def close(self) -> None:
+        self._disconnect()
+
+
+def open_store(url: str) -> KeyValueStore:
+    """Creates a store from a URL.
+
+    Args:
+        url (str): ``memory://``, ``sqlite:///relative.db``,
+            ``sqlite:////absolute/path.db`` or
+            ``redis://[:password@]host[:port][/db]``.
+
+    Returns:
+        KeyValueStore: The configured backend.
+
+    Raises:
+        StoreError: If the URL scheme is not supported.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryStore()
+    if parsed.scheme == "sqlite":
+        # Same convention as SQLAlchemy: three slashes for a relative path,
+        # four for an absolute one.
+        return SQLiteStore(unquote(parsed.path[1:]) or ":memory:")
+    if parsed.scheme == "redis":
+        db = parsed.path.lstrip("/")
+        return RedisStore(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+    raise StoreError(f"Unsupported store URL: {url}")
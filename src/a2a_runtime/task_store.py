@@ -0,0 +1,98 @@
+"""This module adapts a ``KeyValueStore`` to the A2A task store interfaces."""
+
+import logging
+from typing import Optional
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks.push_notification_config_store import (
+    PushNotificationConfigStore,
+)
+from a2a.server.tasks.task_store import TaskStore
+from a2a.types import PushNotificationConfig, Task
+
+from a2a_runtime.stores import KeyValueStore, dumps, loads, pack, unpack
+
+logger = logging.getLogger(__name__)
+
+
+class SharedTaskStore(TaskStore):
+    """A2A task store that keeps tasks in a shared key-value store.
+
+    Any replica pointed at the same store can answer ``tasks/get`` or continue
+    a task started elsewhere, and tasks expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, store: KeyValueStore, ttl: Optional[float] = None) -> None:
+        self._store = store
+        self._ttl = ttl
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    async def save(
+        self, task: Task, context: Optional[ServerCallContext] = None
+    ) -> None:
+        payload = task.model_dump_json(exclude_none=True, by_alias=True)
+        await self._store.set(self._key(task.id), pack(payload.encode()), self._ttl)
+
+    async def get(
+        self, task_id: str, context: Optional[ServerCallContext] = None
+    ) -> Optional[Task]:
+        blob = await self._store.get(self._key(task_id))
+        if blob is None:
+            logger.debug("Task %s not found in store.", task_id)
+            return None
+        return Task.model_validate_json(unpack(blob))
+
+    async def delete(
+        self, task_id: str, context: Optional[ServerCallContext] = None
+    ) -> None:
+        await self._store.delete(self._key(task_id))
+
+
+class SharedPushConfigStore(PushNotificationConfigStore):
+    """Push notification configs kept in a key-value store.
+
+    Unlike the SDK's in-memory store, configs expire after ``ttl`` seconds,
+    so webhooks of finished tasks do not accumulate.
+    """
+
+    def __init__(self, store: KeyValueStore, ttl: Optional[float] = None) -> None:
+        self._store = store
+        self._ttl = ttl
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"push:{task_id}"
+
+    async def _save(self, task_id: str, configs: list[dict]) -> None:
+        if configs:
+            await self._store.set(self._key(task_id), dumps(configs), self._ttl)
+        else:
+            await self._store.delete(self._key(task_id))
+
+    async def _load(self, task_id: str) -> list[dict]:
+        blob = await self._store.get(self._key(task_id))
+        return loads(blob) if blob is not None else []
+
+    async def set_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        if notification_config.id is None:
+            notification_config.id = task_id
+        configs = [
+            c for c in await self._load(task_id) if c["id"] != notification_config.id
+        ]
+        configs.append(notification_config.model_dump(mode="json", exclude_none=True))
+        await self._save(task_id, configs)
+
+    async def get_info(self, task_id: str) -> list[PushNotificationConfig]:
+        return [
+            PushNotificationConfig.model_validate(c) for c in await self._load(task_id)
+        ]
+
+    async def delete_info(self, task_id: str, config_id: Optional[str] = None) -> None:
+        config_id = config_id or task_id
+        configs = await self._load(task_id)
+        await self._save(task_id, [c for c in configs if c["id"] != config_id])
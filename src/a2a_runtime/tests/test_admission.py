@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.admission import (  # noqa: E402
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+from a2a_runtime.metrics import REGISTRY  # noqa: E402
+
+try:
+    from a2a_runtime.executor import DeadlineAgentExecutor
+except ImportError:
+    DeadlineAgentExecutor = None
+
+
+async def call(app, path="/", method="POST"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return messages
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+
+    async def test_admits_up_to_limit_then_queues(self):
+        controller = AdmissionController("t1", max_concurrent=1, max_queue=1)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire(timeout=1))
+        await asyncio.sleep(0)
+        self.assertEqual(controller.queue_depth, 1)
+        controller.release()
+        await waiter
+        self.assertEqual(controller.active, 1)
+        self.assertEqual(controller.queue_depth, 0)
+
+    async def test_rejects_when_queue_full(self):
+        controller = AdmissionController("t2", max_concurrent=1, max_queue=0)
+        await controller.acquire()
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await controller.acquire()
+        self.assertEqual(ctx.exception.reason, "queue_full")
+        rejected = REGISTRY.counter("a2a_admission_rejected_total", "")
+        self.assertEqual(rejected.get(limiter="t2", reason="queue_full"), 1)
+
+    async def test_queue_timeout(self):
+        controller = AdmissionController("t3", max_concurrent=1, max_queue=4)
+        await controller.acquire()
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await controller.acquire(timeout=0.01)
+        self.assertEqual(ctx.exception.reason, "queue_timeout")
+        self.assertEqual(controller.queue_depth, 0)
+        controller.release()
+        self.assertEqual(controller.active, 0)
+
+    async def test_slot_releases_on_error(self):
+        controller = AdmissionController("t4", max_concurrent=1)
+        with self.assertRaises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError("boom")
+        self.assertEqual(controller.active, 0)
+
+
+class TestAdmissionMiddleware(unittest.IsolatedAsyncioTestCase):
+
+    async def test_overloaded_call_gets_429(self):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def app(scope, receive, send):
+            started.set()
+            await finish.wait()
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        controller = AdmissionController("t5", max_concurrent=1)
+        middleware = AdmissionMiddleware(app, controller)
+        first = asyncio.create_task(call(middleware))
+        await started.wait()
+
+        messages = await call(middleware)
+        self.assertEqual(messages[0]["status"], 429)
+        self.assertIn((b"retry-after", b"1"), messages[0]["headers"])
+        body = json.loads(messages[1]["body"])
+        self.assertEqual(body["error"]["data"]["reason"], "queue_full")
+
+        finish.set()
+        self.assertEqual((await first)[0]["status"], 200)
+        self.assertEqual(controller.active, 0)
+
+    async def test_other_routes_bypass_limit(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200})
+
+        controller = AdmissionController("t6", max_concurrent=0)
+        messages = await call(AdmissionMiddleware(app, controller), path="/readyz")
+        self.assertEqual(messages[0]["status"], 200)
+
+
+@unittest.skipIf(DeadlineAgentExecutor is None, "needs google-adk")
+class TestBackgroundTasks(unittest.IsolatedAsyncioTestCase):
+
+    async def test_background_tasks_hold_a_slot_while_they_run(self):
+        release = asyncio.Event()
+
+        class Executor(DeadlineAgentExecutor):
+            async def _resolve_runner(self):
+                return SimpleNamespace(app_name="a")
+
+            async def _run(self, context, event_queue):
+                await release.wait()
+
+        background = AdmissionController("t_background", max_concurrent=1)
+        executor = Executor(runner=None, background=background)
+
+        def context(blocking):
+            return SimpleNamespace(configuration=SimpleNamespace(blocking=blocking))
+
+        first = asyncio.create_task(executor._handle_request(context(False), None))
+        await asyncio.sleep(0)
+        self.assertEqual(background.active, 1)
+        with self.assertRaises(AdmissionRejected):
+            await executor._handle_request(context(False), None)
+        # Blocking calls hold their HTTP slot instead.
+        blocking = asyncio.create_task(executor._handle_request(context(True), None))
+        await asyncio.sleep(0)
+        self.assertEqual(background.active, 1)
+        release.set()
+        await asyncio.gather(first, blocking)
+        self.assertEqual(background.active, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import breaker  # noqa: E402
+from a2a_runtime.breaker import CircuitBreaker  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail(circuit, times):
+    for _ in range(times):
+        if circuit.allow():
+            circuit.record(False)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.circuit = CircuitBreaker(
+            "primecheck_agent",
+            failure_threshold=3,
+            reset_timeout=10,
+            max_reset_timeout=25,
+            clock=self.clock,
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        fail(self.circuit, 2)
+        self.circuit.allow()
+        self.circuit.record(True)
+        fail(self.circuit, 2)
+        self.assertEqual(self.circuit.state, breaker.CLOSED)
+        fail(self.circuit, 1)
+        self.assertEqual(self.circuit.state, breaker.OPEN)
+        self.assertFalse(self.circuit.allow())
+        self.assertFalse(self.circuit.available())
+        self.assertEqual(self.circuit.retry_in(), 10)
+
+    def test_half_open_allows_one_probe_then_closes(self):
+        fail(self.circuit, 3)
+        self.clock.now += 10
+        self.assertTrue(self.circuit.available())
+        self.assertTrue(self.circuit.allow())
+        self.assertEqual(self.circuit.state, breaker.HALF_OPEN)
+        self.assertFalse(self.circuit.allow())
+        self.circuit.record(True)
+        self.assertEqual(self.circuit.state, breaker.CLOSED)
+        self.assertTrue(self.circuit.allow())
+
+    def test_failed_probe_doubles_the_open_time_up_to_the_cap(self):
+        fail(self.circuit, 3)
+        for expected in (20, 25, 25):
+            self.clock.now += 30
+            self.assertTrue(self.circuit.allow())
+            self.circuit.record(False)
+            self.assertEqual(self.circuit.state, breaker.OPEN)
+            self.assertEqual(self.circuit.retry_in(), expected)
+
+    def test_cancelled_probe_frees_its_slot(self):
+        fail(self.circuit, 3)
+        self.clock.now += 10
+        self.assertTrue(self.circuit.allow())
+        self.circuit.record(None)
+        self.assertEqual(self.circuit.state, breaker.HALF_OPEN)
+        self.assertTrue(self.circuit.allow())
+
+    def test_health_checks(self):
+        fail(self.circuit, 2)
+        self.circuit.probed(False)
+        self.assertEqual(self.circuit.state, breaker.OPEN)
+        self.circuit.probed(False)
+        self.assertEqual(self.circuit.retry_in(), 10)
+        self.circuit.probed(True)
+        self.assertTrue(self.circuit.available())
+        self.assertTrue(self.circuit.allow())
+        self.assertEqual(self.circuit.state, breaker.HALF_OPEN)
+
+
+class TestSharedBreakers(unittest.TestCase):
+
+    def tearDown(self):
+        breaker._BREAKERS.clear()
+
+    def test_unavailable_note_names_open_breakers(self):
+        with mock.patch.dict(os.environ, {"A2A_BREAKER_FAILURES": "1"}):
+            down = breaker.get_breaker("primecheck_agent")
+            breaker.get_breaker("rand_agent")
+        self.assertIs(breaker.get_breaker("primecheck_agent"), down)
+        self.assertIsNone(breaker.unavailable_note(["primecheck_agent"]))
+        down.allow()
+        down.record(False)
+        note = breaker.unavailable_note(["primecheck_agent", "rand_agent", "x"])
+        self.assertIn("primecheck_agent (retry in 30s)", note)
+        self.assertNotIn("rand_agent", note)
+        self.assertEqual(
+            breaker.breaker_states()["primecheck_agent"]["state"], breaker.OPEN
+        )
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {"A2A_BREAKER_FAILURES": "0"}):
+            self.assertIsNone(breaker.get_breaker("rand_agent"))
+
+
+if __name__ == "__main__":
+    unittest.main()
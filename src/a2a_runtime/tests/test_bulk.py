@@ -0,0 +1,186 @@
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import bulk, remote  # noqa: E402
+
+try:
+    import httpx
+    from a2a.types import (
+        Artifact,
+        DataPart,
+        Part,
+        Task,
+        TaskState,
+        TaskStatus,
+    )
+except ImportError:
+    httpx = None
+
+QUERIES = {"weather": "get_weather", "time": "get_current_time"}
+
+
+def get_weather(city: str) -> dict:
+    if city == "boom":
+        raise RuntimeError("no data")
+    return {"status": "success", "report": f"Sunny in {city}"}
+
+
+async def get_current_time(city: str) -> dict:
+    return {"status": "success", "report": f"Noon in {city}"}
+
+
+def remember(fact: str, tool_context) -> dict:
+    return {}
+
+
+def data_message(data):
+    part = types.SimpleNamespace(root=types.SimpleNamespace(data=data))
+    text = types.SimpleNamespace(root=types.SimpleNamespace(text="hi"))
+    return types.SimpleNamespace(parts=[text, part])
+
+
+class TestBulkTools(unittest.IsolatedAsyncioTestCase):
+
+    def test_tool_table_skips_tools_with_context(self):
+        agent = types.SimpleNamespace(
+            tools=[get_weather, types.SimpleNamespace(func=get_current_time), remember]
+        )
+        self.assertEqual(
+            set(bulk.tool_table(agent)), {"get_weather", "get_current_time"}
+        )
+
+    def test_bulk_calls(self):
+        calls = [{"tool": "get_weather", "args": {"city": "Paris"}}]
+        self.assertEqual(
+            bulk.bulk_calls(data_message({bulk.BULK_DATA_KEY: calls})), calls
+        )
+        self.assertIsNone(bulk.bulk_calls(data_message({"other": 1})))
+
+    async def test_run_bulk_keeps_order_and_reports_errors(self):
+        tools = {"get_weather": get_weather, "get_current_time": get_current_time}
+        results = await bulk.run_bulk(
+            tools,
+            [
+                {"tool": "get_current_time", "args": {"city": "Paris"}},
+                {"tool": "get_weather", "args": {"city": "boom"}},
+                {"tool": "remember", "args": {"fact": "x"}},
+                {"tool": "get_weather", "args": {"city": "Oslo"}},
+            ],
+        )
+        self.assertEqual(results[0]["report"], "Noon in Paris")
+        self.assertEqual(results[1]["error_message"], "RuntimeError: no data")
+        self.assertIn("Unknown tool", results[2]["error_message"])
+        self.assertEqual(results[3]["report"], "Sunny in Oslo")
+
+    def test_to_calls(self):
+        self.assertEqual(
+            bulk.to_calls([{"query": "weather", "city": "Paris"}], QUERIES),
+            [{"tool": "get_weather", "args": {"city": "Paris"}}],
+        )
+        with self.assertRaises(ValueError):
+            bulk.to_calls([{"query": "tides", "city": "Paris"}], QUERIES)
+
+
+class TestStreamBulk(unittest.IsolatedAsyncioTestCase):
+
+    async def test_streams_every_item_once_in_chunks(self):
+        chunks = []
+
+        async def send_chunk(agent, calls):
+            chunks.append(len(calls))
+            # Later chunks answer first.
+            await asyncio.sleep(0.01 * (3 - len(chunks)))
+            if calls[0]["args"]["city"] == "c4":
+                raise ConnectionError("weathertime_agent is down")
+            return [{"status": "success", "report": c["args"]["city"]} for c in calls]
+
+        items = [{"query": "weather", "city": f"c{i}"} for i in range(7)]
+        with mock.patch.object(bulk, "send_chunk", send_chunk):
+            results = [
+                r async for r in bulk.stream_bulk(None, items, QUERIES, chunk_size=2)
+            ]
+        self.assertEqual(sorted(chunks), [1, 2, 2, 2])
+        self.assertEqual(sorted(r["index"] for r in results), list(range(7)))
+        self.assertNotEqual([r["index"] for r in results], list(range(7)))
+        by_index = {r["index"]: r for r in results}
+        self.assertEqual(by_index[0]["report"], "c0")
+        self.assertEqual(by_index[0]["city"], "c0")
+        self.assertEqual(by_index[5]["status"], "error")
+        self.assertIn("down", by_index[4]["error_message"])
+
+
+@unittest.skipIf(httpx is None, "needs a2a-sdk")
+class TestRemoteClient(unittest.IsolatedAsyncioTestCase):
+
+    CARD = {
+        "name": "weathertime_agent",
+        "description": "Weather",
+        "url": "http://127.0.0.1:8084/",
+        "version": "1.0",
+        "capabilities": {},
+        "default_input_modes": ["text"],
+        "default_output_modes": ["text"],
+        "skills": [],
+    }
+
+    async def test_send_chunk_uses_the_remote_client(self):
+        task = Task(
+            id="t1",
+            context_id="c1",
+            status=TaskStatus(state=TaskState.completed),
+            artifacts=[
+                Artifact(
+                    artifact_id="a1",
+                    parts=[Part(root=DataPart(data={bulk.BULK_RESULTS_KEY: [1, 2]}))],
+                )
+            ],
+        )
+        sent = []
+
+        class Client:
+            async def send_message(self, message):
+                sent.append(message)
+                yield task, None
+
+        async def remote_client(name):
+            self.assertEqual(name, "weathertime_agent")
+            return Client()
+
+        agent = types.SimpleNamespace(name="weathertime_agent")
+        with mock.patch.object(remote, "remote_client", remote_client):
+            results = await bulk.send_chunk(agent, [{"tool": "a"}, {"tool": "b"}])
+        self.assertEqual(results, [1, 2])
+        data = sent[0].parts[0].root.data
+        self.assertEqual(data[bulk.BULK_DATA_KEY], [{"tool": "a"}, {"tool": "b"}])
+
+    async def test_remote_client_resolves_the_card_once(self):
+        fetched, created = [], []
+        http = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: fetched.append(request.url)
+                or httpx.Response(200, json=self.CARD)
+            )
+        )
+        factory = types.SimpleNamespace(create=lambda card: created.append(card) or 1)
+        card_url = "http://127.0.0.1:8084/.well-known/agent-card.json"
+        with mock.patch.dict(
+            remote._CONNECTIONS, {"weathertime_agent": (card_url, http, factory)}
+        ), mock.patch.dict(remote._CLIENTS, clear=True):
+            self.assertEqual(await remote.remote_client("weathertime_agent"), 1)
+            self.assertEqual(await remote.remote_client("weathertime_agent"), 1)
+            with self.assertRaises(LookupError):
+                await remote.remote_client("events_agent")
+        await http.aclose()
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(created[0].name, "weathertime_agent")
+
+
+if __name__ == "__main__":
+    unittest.main()
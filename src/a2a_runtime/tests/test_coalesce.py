@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.coalesce import CoalescingMiddleware, coalesce_key  # noqa: E402
+
+
+def rpc(request_id, text="upcoming events in NYC", **message):
+    message.update(kind="message", messageId=f"m{request_id}", role="user")
+    message["parts"] = [{"kind": "text", "text": text}]
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "message/send",
+        "params": {"message": message},
+    }
+
+
+async def call(app, request, headers=()):
+    messages = []
+    body = json.dumps(request).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    await app(scope, receive, send)
+    return messages[0]["status"], json.loads(messages[1]["body"])
+
+
+class EchoApp:
+    """Answers after ``finish`` is set, counting the runs."""
+
+    def __init__(self):
+        self.runs = 0
+        self.finish = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        request = json.loads((await receive())["body"])
+        self.runs += 1
+        await self.finish.wait()
+        body = json.dumps(
+            {"jsonrpc": "2.0", "id": request["id"], "result": {"run": self.runs}}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class TestCoalesceKey(unittest.TestCase):
+
+    def test_identical_new_messages_share_a_key(self):
+        self.assertEqual(coalesce_key(rpc(1)), coalesce_key(rpc(2)))
+        self.assertNotEqual(coalesce_key(rpc(1)), coalesce_key(rpc(1, "other")))
+        self.assertNotEqual(
+            coalesce_key(rpc(1), b"Bearer a"), coalesce_key(rpc(1), b"Bearer b")
+        )
+
+    def test_only_new_conversations_are_coalesced(self):
+        self.assertIsNone(coalesce_key(rpc(1, contextId="c1")))
+        self.assertIsNone(coalesce_key(rpc(1, taskId="t1")))
+        self.assertIsNone(coalesce_key(dict(rpc(1), method="message/stream")))
+        self.assertIsNone(coalesce_key(None))
+
+    def test_malformed_params_are_not_coalesced(self):
+        for params in ([], {"message": []}, {"message": "hi"}, "x"):
+            with self.subTest(params=params):
+                self.assertIsNone(coalesce_key(dict(rpc(1), params=params)))
+
+
+class TestCoalescingMiddleware(unittest.IsolatedAsyncioTestCase):
+
+    async def test_identical_calls_share_one_run(self):
+        app = EchoApp()
+        middleware = CoalescingMiddleware(app)
+        calls = [asyncio.create_task(call(middleware, rpc(i))) for i in range(5)]
+        await asyncio.sleep(0.01)
+        app.finish.set()
+        results = await asyncio.gather(*calls)
+        self.assertEqual(app.runs, 1)
+        for i, (status, body) in enumerate(results):
+            self.assertEqual(status, 200)
+            self.assertEqual(body["id"], i)
+            self.assertEqual(body["result"], {"run": 1})
+
+    async def test_different_and_later_calls_run_separately(self):
+        app = EchoApp()
+        app.finish.set()
+        middleware = CoalescingMiddleware(app)
+        await call(middleware, rpc(1))
+        await call(middleware, rpc(2))
+        await call(middleware, rpc(3, contextId="c1"))
+        self.assertEqual(app.runs, 3)
+
+    async def test_followers_share_the_leaders_failure(self):
+        runs = []
+
+        async def failing(scope, receive, send):
+            runs.append(True)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        middleware = CoalescingMiddleware(failing)
+        leader = asyncio.create_task(call(middleware, rpc(1)))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(call(middleware, rpc(i))) for i in (2, 3)]
+        with self.assertRaises(RuntimeError):
+            await leader
+        for i, (status, body) in zip((2, 3), await asyncio.gather(*followers)):
+            self.assertEqual((status, body["id"]), (500, i))
+            self.assertEqual(body["error"]["code"], -32603)
+        self.assertEqual(len(runs), 1)
+
+    async def test_one_follower_takes_over_a_cancelled_leader(self):
+        app = EchoApp()
+        middleware = CoalescingMiddleware(app)
+        leader = asyncio.create_task(call(middleware, rpc(1)))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(call(middleware, rpc(i))) for i in (2, 3, 4)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        app.finish.set()
+        results = await asyncio.gather(*followers)
+        self.assertEqual(app.runs, 2)
+        self.assertEqual([body["id"] for _, body in results], [2, 3, 4])
+        self.assertTrue(all(body["result"] == {"run": 2} for _, body in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
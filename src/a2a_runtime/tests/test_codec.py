@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import codec  # noqa: E402
+
+
+class TestCodec(unittest.TestCase):
+
+    def test_backends_agree_with_the_standard_library(self):
+        payload = codec.sample_task(turns=3)
+        for name, (dumps, loads) in codec.available_backends().items():
+            with self.subTest(backend=name):
+                encoded = dumps(payload)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(json.loads(encoded), payload)
+                self.assertEqual(loads(json.dumps(payload).encode()), payload)
+                with self.assertRaises(ValueError):
+                    loads(b'{"jsonrpc": ')
+
+    def test_selection(self):
+        self.assertIn(codec.BACKEND, codec.BACKENDS)
+        self.assertEqual(codec._select("json")[0], "json")
+        with self.assertRaises(ValueError):
+            codec._select("yaml")
+
+    def test_benchmark_reports_every_backend(self):
+        rows = codec.benchmark(turns=2, number=1)
+        names = {row["codec"] for row in rows}
+        self.assertTrue(set(codec.available_backends()) <= names)
+        self.assertTrue(all(row["bytes"] > 0 for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import gzip
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.compression import CompressionMiddleware, negotiate  # noqa: E402
+
+
+def app_returning(body, content_type=b"application/json", chunks=1):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        size = len(body) // chunks + 1
+        for i in range(0, len(body), size):
+            more = i + size < len(body)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": body[i:][:size],
+                    "more_body": more,
+                }
+            )
+
+    return app
+
+
+async def call(app, accept_encoding=None):
+    messages = []
+    headers = []
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(
+        {"type": "http", "method": "POST", "path": "/", "headers": headers},
+        receive,
+        send,
+    )
+    headers = dict(messages[0]["headers"])
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return headers, body
+
+
+class TestNegotiate(unittest.TestCase):
+
+    def test_prefers_server_order(self):
+        encodings = {"zstd": None, "gzip": None}
+        self.assertEqual(negotiate("gzip, deflate, zstd", encodings), "zstd")
+        self.assertEqual(negotiate("gzip;q=0.5, br", encodings), "gzip")
+        self.assertEqual(negotiate("*", encodings), "zstd")
+        self.assertIsNone(negotiate("identity", encodings))
+        self.assertIsNone(negotiate("gzip;q=0", {"gzip": None}))
+        self.assertIsNone(negotiate("", encodings))
+
+
+class TestCompressionMiddleware(unittest.IsolatedAsyncioTestCase):
+
+    BODY = b'{"result": {"history": [' + b'{"text": "hello"},' * 200 + b"{}]}}"
+
+    async def test_compresses_large_json(self):
+        middleware = CompressionMiddleware(app_returning(self.BODY, chunks=3))
+        middleware.encodings = {"gzip": gzip.compress}
+        headers, body = await call(middleware, "gzip, deflate")
+        self.assertEqual(headers[b"content-encoding"], b"gzip")
+        self.assertEqual(headers[b"vary"], b"Accept-Encoding")
+        self.assertEqual(int(headers[b"content-length"]), len(body))
+        self.assertLess(len(body), len(self.BODY))
+        self.assertEqual(gzip.decompress(body), self.BODY)
+
+    async def test_weakens_etags_of_compressed_bodies(self):
+        app = app_returning(self.BODY)
+
+        async def tagged(scope, receive, send):
+            async def add_etag(message):
+                if message["type"] == "http.response.start":
+                    message["headers"].append((b"etag", b'"abc"'))
+                await send(message)
+
+            await app(scope, receive, add_etag)
+
+        middleware = CompressionMiddleware(tagged)
+        headers, _ = await call(middleware, "gzip")
+        self.assertEqual(headers[b"etag"], b'W/"abc"')
+
+    async def test_leaves_other_responses_alone(self):
+        small = CompressionMiddleware(app_returning(b'{"ok": true}'))
+        headers, body = await call(small, "gzip")
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertEqual(body, b'{"ok": true}')
+
+        stream = CompressionMiddleware(app_returning(self.BODY, b"text/event-stream"))
+        headers, body = await call(stream, "gzip")
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertEqual(body, self.BODY)
+
+        unaccepted = CompressionMiddleware(app_returning(self.BODY))
+        headers, body = await call(unaccepted)
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertEqual(body, self.BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.context_cache import PrefixCache  # noqa: E402
+
+LONG_INSTRUCTION = "Route prime questions to primecheck_agent. " * 200
+
+
+class FakeCaches:
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.deleted = []
+        self.fail = False
+
+    async def create(self, model, config):
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        self.created.append(config)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    async def update(self, name, config):
+        if self.fail:
+            raise RuntimeError("not found")
+        self.updated.append(name)
+
+    async def delete(self, name):
+        self.deleted.append(name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def request(instruction=LONG_INSTRUCTION):
+    config = SimpleNamespace(
+        system_instruction=instruction,
+        tools=None,
+        tool_config=None,
+        cached_content=None,
+    )
+    return SimpleNamespace(model="gemini-2.5-flash", config=config, cache_config=None)
+
+
+class TestPrefixCache(unittest.TestCase):
+
+    def setUp(self):
+        self.caches = FakeCaches()
+        self.client = SimpleNamespace(aio=SimpleNamespace(caches=self.caches))
+        self.clock = FakeClock()
+        self.cache = PrefixCache(ttl=600, refresh_margin=60, clock=self.clock)
+
+    def apply(self, llm_request, client="default"):
+        client = self.client if client == "default" else client
+        return asyncio.run(self.cache.apply("master", client, llm_request))
+
+    def test_uploads_prefix_once_and_references_it(self):
+        first, second = request(), request()
+        self.assertTrue(self.apply(first))
+        self.assertTrue(self.apply(second))
+        self.assertEqual(len(self.caches.created), 1)
+        self.assertEqual(self.caches.created[0]["ttl"], "600s")
+        self.assertEqual(second.config.cached_content, "cachedContents/1")
+        self.assertIsNone(second.config.system_instruction)
+
+    def test_extends_ttl_before_expiry(self):
+        self.apply(request())
+        self.clock.now += 550
+        self.assertTrue(self.apply(request()))
+        self.assertEqual(self.caches.updated, ["cachedContents/1"])
+        self.assertEqual(len(self.caches.created), 1)
+
+    def test_recreates_after_invalidation(self):
+        self.apply(request())
+        self.cache.invalidate("master")
+        self.apply(request())
+        self.assertEqual(len(self.caches.created), 2)
+
+    def test_changed_prefix_replaces_cache(self):
+        self.apply(request())
+        self.apply(request(LONG_INSTRUCTION + "Be brief."))
+        self.assertEqual(len(self.caches.created), 2)
+        self.assertEqual(self.caches.deleted, ["cachedContents/1"])
+
+    def test_inline_fallbacks(self):
+        # Non-Gemini models, such as the local mock.
+        mock = request()
+        self.assertFalse(self.apply(mock, client=None))
+        self.assertEqual(mock.config.system_instruction, LONG_INSTRUCTION)
+        # Prefixes too small for Gemini's cache.
+        self.assertFalse(self.apply(request("Be brief.")))
+        # Creation failures are retried after a while.
+        self.caches.fail = True
+        self.assertFalse(self.apply(request()))
+        self.caches.fail = False
+        self.assertFalse(self.apply(request()))
+        self.clock.now += 301
+        self.assertTrue(self.apply(request()))
+        self.assertEqual(len(self.caches.created), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.admission import (  # noqa: E402
+    AdmissionController,
+    AdmissionRejected,
+)
+from a2a_runtime.deadline import (  # noqa: E402
+    DeadlineMiddleware,
+    parse_header,
+    remaining,
+    replace_deadline,
+    reset_deadline,
+    set_deadline,
+    shorten,
+)
+
+try:
+    from a2a_runtime.executor import DeadlineAgentExecutor
+except ImportError:
+    DeadlineAgentExecutor = None
+
+
+async def call(app, headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    await app(scope, receive, send)
+    return messages
+
+
+class TestDeadline(unittest.IsolatedAsyncioTestCase):
+
+    def test_no_deadline_by_default(self):
+        self.assertIsNone(remaining())
+        self.assertEqual(shorten(5), 5)
+
+    def test_inner_deadline_cannot_extend_outer(self):
+        outer = set_deadline(1)
+        inner = set_deadline(60)
+        try:
+            self.assertLessEqual(remaining(), 1)
+            self.assertLessEqual(shorten(30), 1)
+        finally:
+            reset_deadline(inner)
+            reset_deadline(outer)
+        self.assertIsNone(remaining())
+
+    def test_parse_header(self):
+        self.assertEqual(parse_header(b"1500"), 1.5)
+        self.assertEqual(parse_header(b"-5"), 0.0)
+        self.assertIsNone(parse_header(b"soon"))
+        self.assertIsNone(parse_header(None))
+
+    async def test_middleware_sets_deadline_from_header(self):
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(remaining())
+            await send({"type": "http.response.start", "status": 200})
+
+        middleware = DeadlineMiddleware(app, default_timeout=300)
+        await call(middleware, [(b"x-a2a-deadline-ms", b"2000")])
+        self.assertTrue(0 < seen[0] <= 2)
+        await call(middleware)
+        self.assertTrue(2 < seen[1] <= 300)
+
+    async def test_expired_call_gets_504(self):
+        async def app(scope, receive, send):
+            self.fail("expired calls must not reach the app")
+
+        messages = await call(DeadlineMiddleware(app), [(b"x-a2a-deadline-ms", b"0")])
+        self.assertEqual(messages[0]["status"], 504)
+
+    async def test_deadline_shortens_queue_wait(self):
+        controller = AdmissionController(
+            "d1", max_concurrent=1, max_queue=1, queue_timeout=60
+        )
+        await controller.acquire()
+        token = set_deadline(0.01)
+        try:
+            with self.assertRaises(AdmissionRejected) as ctx:
+                await controller.acquire()
+        finally:
+            reset_deadline(token)
+        self.assertEqual(ctx.exception.reason, "queue_timeout")
+
+
+class TestTaskDeadline(unittest.IsolatedAsyncioTestCase):
+
+    def test_replace_deadline_can_extend(self):
+        outer = set_deadline(1)
+        inner = replace_deadline(60)
+        try:
+            self.assertGreater(remaining(), 1)
+        finally:
+            reset_deadline(inner)
+        self.assertLessEqual(remaining(), 1)
+        reset_deadline(outer)
+
+    @unittest.skipIf(DeadlineAgentExecutor is None, "needs google-adk")
+    async def test_non_blocking_tasks_outlive_the_request_deadline(self):
+        seen = []
+
+        class Executor(DeadlineAgentExecutor):
+            async def _resolve_runner(self):
+                return SimpleNamespace(app_name="a")
+
+            async def _run(self, context, event_queue):
+                seen.append(remaining())
+
+        executor = Executor(runner=None, task_timeout=60)
+        token = set_deadline(1)
+        try:
+            for blocking in (True, None, False):
+                context = SimpleNamespace(
+                    configuration=SimpleNamespace(blocking=blocking)
+                )
+                await executor._handle_request(context, None)
+        finally:
+            reset_deadline(token)
+        self.assertLessEqual(seen[0], 1)
+        self.assertLessEqual(seen[1], 1)
+        self.assertTrue(1 < seen[2] <= 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.etag import etag_matches, strong_etag, weaken  # noqa: E402
+
+
+class TestEtag(unittest.TestCase):
+
+    def test_strong_etag_follows_the_bytes(self):
+        etag = strong_etag(b'{"name": "echo_agent"}')
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+        self.assertEqual(etag, strong_etag(b'{"name": "echo_agent"}'))
+        self.assertNotEqual(etag, strong_etag(b'{"name": "other"}'))
+
+    def test_matching_is_weak(self):
+        etag = strong_etag(b"card")
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(weaken(etag), etag))
+        self.assertTrue(etag_matches(f'"old", {weaken(etag)}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"old"', etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertEqual(weaken(weaken(etag)), "W/" + etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.health import HealthTracker  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def tracker(clock, **kwargs):
+    health = HealthTracker("weathertime_agent", clock=clock, **kwargs)
+    health.sync(["http://a", "http://b", "http://c"])
+    return health
+
+
+def call(health, url, latency=0.1, ok=True):
+    health.start(url)
+    health.finish(url, latency, ok)
+
+
+class TestHealthTracker(unittest.TestCase):
+
+    def test_prefers_fewest_outstanding_then_lowest_latency(self):
+        health = tracker(Clock())
+        for url, latency in (("http://a", 0.1), ("http://b", 0.2), ("http://c", 0.3)):
+            call(health, url, latency)
+        self.assertEqual(health.choose(), "http://a")
+        health.start("http://a")
+        health.start("http://a")
+        self.assertEqual(health.choose(), "http://b")
+
+    def test_consecutive_failures_eject(self):
+        clock = Clock()
+        health = tracker(clock, consecutive_failures=3, base_ejection=30)
+        for _ in range(3):
+            call(health, "http://a", ok=False)
+        self.assertTrue(health.endpoints["http://a"].ejected(clock.now))
+        for _ in range(20):
+            self.assertNotEqual(health.choose(), "http://a")
+        clock.now += 31
+        self.assertFalse(health.endpoints["http://a"].ejected(clock.now))
+
+    def test_latency_outlier_is_ejected(self):
+        clock = Clock()
+        health = tracker(clock, min_samples=5)
+        for _ in range(5):
+            call(health, "http://b", 0.1)
+            call(health, "http://c", 0.1)
+            call(health, "http://a", 2.0)
+        snapshot = {row["url"]: row for row in health.snapshot()}
+        self.assertTrue(snapshot["http://a"]["ejected"])
+        self.assertFalse(snapshot["http://b"]["ejected"])
+
+    def test_ejection_is_capped(self):
+        clock = Clock()
+        health = tracker(clock, consecutive_failures=1, max_ejected_fraction=0.5)
+        for url in ("http://a", "http://b", "http://c"):
+            call(health, url, ok=False)
+        ejected = [e for e in health.endpoints.values() if e.ejected(clock.now)]
+        self.assertEqual(len(ejected), 1)
+
+    def test_ejection_backs_off(self):
+        clock = Clock()
+        health = tracker(clock, consecutive_failures=1, base_ejection=10)
+        call(health, "http://a", ok=False)
+        clock.now += 11
+        call(health, "http://a", ok=False)
+        self.assertEqual(health.endpoints["http://a"].ejected_until, clock.now + 20)
+
+    def test_failed_probes_eject(self):
+        clock = Clock()
+        health = tracker(clock)
+        health.probe("http://a", ok=False)
+        health.probe("http://a", ok=True)
+        health.probe("http://a", ok=False)
+        self.assertFalse(health.endpoints["http://a"].ejected(clock.now))
+        health.probe("http://a", ok=False)
+        self.assertTrue(health.endpoints["http://a"].ejected(clock.now))
+        health.probe("http://unknown", ok=False)
+
+    def test_new_replica_slow_starts(self):
+        clock = Clock()
+        health = tracker(clock, slow_start=30)
+        for url in ("http://a", "http://b", "http://c"):
+            call(health, url, 0.1)
+        health.sync(["http://a", "http://b", "http://c", "http://d"])
+        self.assertAlmostEqual(health.endpoints["http://d"].weight(clock.now, 30), 0.1)
+        self.assertNotEqual(health.choose(), "http://d")
+        clock.now += 30
+        self.assertEqual(health.endpoints["http://d"].weight(clock.now, 30), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import types
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.history import (  # noqa: E402
+    estimate_tokens,
+    history_window,
+    split_history,
+    summarize_dropped,
+)
+
+
+def text(role, value):
+    part = types.SimpleNamespace(text=value, function_call=None, function_response=None)
+    return types.SimpleNamespace(role=role, parts=[part])
+
+
+def call(name):
+    function_call = types.SimpleNamespace(name=name, args={"city": "new york"})
+    part = types.SimpleNamespace(
+        text=None, function_call=function_call, function_response=None
+    )
+    return types.SimpleNamespace(role="model", parts=[part])
+
+
+def response(name):
+    function_response = types.SimpleNamespace(name=name, response={"ok": True})
+    part = types.SimpleNamespace(
+        text=None, function_call=None, function_response=function_response
+    )
+    return types.SimpleNamespace(role="user", parts=[part])
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(text("user", "x" * 400)), 101)
+
+    def test_short_history_is_kept(self):
+        contents = [text("user", "hi"), text("model", "hello")]
+        self.assertEqual(split_history(contents, 1000), 0)
+
+    def test_cut_lands_on_user_turn(self):
+        contents = [
+            text("user", "a" * 400),
+            call("get_weather"),
+            response("get_weather"),
+            text("model", "b" * 400),
+            text("user", "c" * 40),
+            call("get_weather"),
+            response("get_weather"),
+            text("model", "d" * 40),
+        ]
+        cut = split_history(contents, 60)
+        self.assertEqual(cut, 4)
+
+    def test_last_turn_is_always_kept(self):
+        contents = [text("user", "a" * 400), text("user", "b" * 4000)]
+        self.assertEqual(split_history(contents, 10), 1)
+
+    def test_summary_mentions_dropped_messages(self):
+        summary = summarize_dropped([text("user", "weather in NYC?"), call("x")])
+        self.assertIn("2 earlier messages", summary)
+        self.assertIn("- user: weather in NYC?", summary)
+
+    def test_history_window(self):
+        history = [types.SimpleNamespace(message_id=f"m{i}") for i in range(6)]
+        ids = lambda messages: [m.message_id for m in messages]  # noqa: E731
+        self.assertEqual(ids(history_window(history)), ids(history))
+        self.assertEqual(ids(history_window(history, length=2)), ["m4", "m5"])
+        self.assertEqual(history_window(history, length=0), [])
+        self.assertEqual(ids(history_window(history, since="m3")), ["m4", "m5"])
+        self.assertEqual(history_window(history, since="m5"), [])
+        self.assertEqual(ids(history_window(history, length=1, since="m3")), ["m5"])
+        self.assertEqual(len(history_window(history, since="unknown")), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.importtime import by_package, parse_importtime, total_us  # noqa: E402
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   google.genai.types
+import time:       500 |        920 | google.genai
+import time:        80 |         80 |   uvicorn.config
+import time:       100 |        180 | uvicorn
+some unrelated warning line
+"""
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        records = parse_importtime(SAMPLE)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0].name, "_io")
+        self.assertEqual(records[0].depth, 2)
+        self.assertEqual(records[2].depth, 0)
+        self.assertEqual(records[2].cumulative_us, 920)
+
+    def test_total_counts_top_level_only(self):
+        self.assertEqual(total_us(parse_importtime(SAMPLE)), 1100)
+
+    def test_by_package_groups_google_namespaces(self):
+        totals = by_package(parse_importtime(SAMPLE))
+        self.assertEqual(totals["google.genai"], 800)
+        self.assertEqual(totals["uvicorn"], 180)
+        self.assertEqual(totals["_io"], 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
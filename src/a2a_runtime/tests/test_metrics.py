@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.metrics import Registry  # noqa: E402
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_render_counter_and_gauge(self):
+        registry = Registry()
+        registry.counter("calls_total", "Calls.", ["agent"]).inc(agent="a")
+        registry.gauge("depth", "Depth.").set(3)
+        text = registry.render()
+        self.assertIn("# TYPE calls_total counter", text)
+        self.assertIn('calls_total{agent="a"} 1.0', text)
+        self.assertIn("depth 3", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        histogram = registry.histogram("wait", "Wait.", buckets=(1, 2))
+        for value in (0.5, 1.5, 5):
+            histogram.observe(value)
+        text = registry.render()
+        self.assertIn('wait_bucket{le="1"} 1', text)
+        self.assertIn('wait_bucket{le="2"} 2', text)
+        self.assertIn('wait_bucket{le="+Inf"} 3', text)
+        self.assertIn("wait_count 3", text)
+
+    def test_same_name_returns_same_metric(self):
+        registry = Registry()
+        self.assertIs(registry.counter("x", ""), registry.counter("x", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import inspect
+import os
+import sys
+import time
+import types
+import unittest
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import offload  # noqa: E402
+
+
+def slow_lookup(city: str, delay: float = 0.2) -> dict:
+    """Looks a city up, slowly."""
+    time.sleep(delay)
+    return {"status": "success", "city": city}
+
+
+def count_primes(limit: int) -> int:
+    return sum(all(n % d for d in range(2, int(n**0.5) + 1)) for n in range(2, limit))
+
+
+class FakeAgent:
+    """Mimics ``BaseAgent.clone``: the copy adopts its sub-agents."""
+
+    def __init__(self, tools, sub_agents=()):
+        self.tools = list(tools)
+        self.sub_agents = list(sub_agents)
+        self.parent_agent = None
+        for sub_agent in self.sub_agents:
+            sub_agent.parent_agent = self
+
+    def clone(self, update=None):
+        update = update or {}
+        return FakeAgent(
+            update.get("tools", self.tools),
+            update.get("sub_agents", [s.clone() for s in self.sub_agents]),
+        )
+
+
+async def loop_lag(duration: float) -> float:
+    """Returns the worst event-loop lag seen while ticking every 10ms."""
+    worst = 0.0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        before = time.monotonic()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.monotonic() - before - 0.01)
+    return worst
+
+
+class TestOffload(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        offload.shutdown_pools()
+
+    async def test_thread_policy_keeps_the_loop_responsive(self):
+        tool = offload.offload("thread")(slow_lookup)
+        self.assertTrue(inspect.iscoroutinefunction(tool))
+        self.assertEqual(tool.__name__, "slow_lookup")
+        self.assertEqual(list(inspect.signature(tool).parameters), ["city", "delay"])
+        result, lag = await asyncio.gather(tool(city="new york"), loop_lag(0.15))
+        self.assertEqual(result["city"], "new york")
+        self.assertLess(lag, 0.1)
+
+    async def test_process_policy(self):
+        tool = offload.offload("process")(count_primes)
+        self.assertEqual(await tool(limit=100), 25)
+
+    def test_process_policy_rejects_what_cannot_be_pickled(self):
+        def local(limit: int) -> int:
+            return limit
+
+        def with_context(tool_context) -> None:
+            pass
+
+        with self.assertRaises(ValueError):
+            offload.offload("process")(local)
+        with self.assertRaises(ValueError):
+            offload.offload("process")(with_context)
+        with self.assertRaises(ValueError):
+            offload.offload("fiber")
+
+    def test_offload_tools_copies_the_tree(self):
+        def cheap() -> dict:
+            return {}
+
+        async def native() -> dict:
+            return {}
+
+        declared = offload.offload("inline")(cheap)
+        function_tool = types.SimpleNamespace(func=slow_lookup)
+        child = FakeAgent([slow_lookup])
+        sibling = FakeAgent([native])
+        root = FakeAgent([declared, native, function_tool], [child, sibling])
+        copied, count = offload.offload_tools(root, "thread")
+        self.assertEqual(count, 2)
+        self.assertIs(copied.tools[0], declared)
+        self.assertIs(copied.tools[1], native)
+        self.assertTrue(inspect.iscoroutinefunction(copied.tools[2].func))
+        self.assertTrue(inspect.iscoroutinefunction(copied.sub_agents[0].tools[0]))
+        self.assertIs(copied.sub_agents[1].parent_agent, copied)
+        # The original tree is untouched.
+        self.assertIs(function_tool.func, slow_lookup)
+        self.assertEqual(child.tools, [slow_lookup])
+        self.assertIs(sibling.parent_agent, root)
+        # A second pass has nothing left to do.
+        self.assertEqual(offload.offload_tools(copied, "thread"), (copied, 0))
+
+    def test_undeclared_tools_stay_inline_by_default(self):
+        root = FakeAgent([slow_lookup])
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(offload.offload_tools(root), (root, 0))
+        with self.assertRaises(ValueError):
+            offload.offload_tools(root, "process")
+
+
+if __name__ == "__main__":
+    unittest.main()
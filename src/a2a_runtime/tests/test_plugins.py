@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import breaker  # noqa: E402
+
+try:
+    from google.adk.agents import Agent
+    from google.adk.models.llm_request import LlmRequest
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    from a2a_runtime.server import build_runner
+except ImportError:
+    Agent = None
+
+
+def text(role, value):
+    return types.Content(role=role, parts=[types.Part(text=value)])
+
+
+@unittest.skipIf(Agent is None, "needs google-adk")
+class TestCircuitBreakerNote(unittest.TestCase):
+
+    def tearDown(self):
+        breaker._BREAKERS.clear()
+
+    def test_note_follows_the_trimmed_history(self):
+        sub_agent = Agent(name="rand_agent", model="gemini-2.0-flash")
+        root = Agent(name="master", model="gemini-2.0-flash", sub_agents=[sub_agent])
+        with mock.patch.dict(
+            os.environ,
+            {"A2A_BREAKER_FAILURES": "1", "A2A_HISTORY_TOKEN_BUDGET": "200"},
+        ):
+            circuit = breaker.get_breaker("rand_agent")
+            runner = build_runner(root, InMemorySessionService())
+        circuit.allow()
+        circuit.record(False)
+
+        history = []
+        for turn in range(20):
+            history.append(text("user", f"question {turn} " + "words " * 40))
+            history.append(text("model", f"answer {turn} " + "words " * 40))
+        # On its own over budget: it is kept, but only as the last user turn.
+        latest_question = "latest question " + "words " * 300
+        request = LlmRequest(contents=[*history, text("user", latest_question)])
+        context = SimpleNamespace(agent_name="master")
+
+        async def run_plugins():
+            for plugin in runner.plugin_manager.plugins:
+                if plugin.name in ("history_budget", "circuit_breaker"):
+                    await plugin.before_model_callback(
+                        callback_context=context, llm_request=request
+                    )
+
+        asyncio.run(run_plugins())
+        *_, latest, note = request.contents
+        self.assertEqual(latest.parts[0].text, latest_question)
+        self.assertIn("rand_agent", note.parts[0].text)
+        self.assertLess(len(request.contents), len(history))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import breaker  # noqa: E402
+from a2a_runtime.breaker import CircuitBreaker  # noqa: E402
+from a2a_runtime.health import HealthTracker  # noqa: E402
+from a2a_runtime.prober import EndpointStats, TopologyProber, percentile  # noqa: E402
+
+
+class Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.body
+
+
+class Client:
+    """Answers with canned responses; hosts without a card are unreachable."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.urls = []
+
+    async def get(self, url):
+        self.urls.append(url)
+        if url in self.responses:
+            return self.responses[url]
+        host = url.split("/.well-known")[0].removesuffix("/healthz")
+        if f"{host}/.well-known/agent-card.json" not in self.responses:
+            raise ConnectionError(f"cannot connect to {host}")
+        return Response(404)
+
+
+def card(host, name="weathertime_agent"):
+    return {
+        f"{host}/.well-known/agent-card.json": Response(
+            200, {"name": name, "version": "0.0.1"}
+        ),
+    }
+
+
+class Remote:
+    name = "weathertime_agent"
+
+    async def _ensure_resolved(self):
+        pass
+
+
+MASTER = SimpleNamespace(name="a2a_master_agent", sub_agents=[Remote()])
+
+
+class TestEndpointStats(unittest.TestCase):
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([0.3, 0.1, 0.2], 50), 0.2)
+        self.assertEqual(percentile([float(i) for i in range(1, 101)], 95), 95.0)
+
+    def test_window(self):
+        stats = EndpointStats("http://a", window=4)
+        for ok in (False, True, True, False, True):
+            stats.record(ok, 0.01 if ok else None)
+        row = stats.to_dict()
+        self.assertTrue(row["up"])
+        self.assertEqual(row["checks"], 4)
+        self.assertEqual(row["availability"], 0.75)
+        self.assertEqual(row["p95_ms"], 10.0)
+
+
+class TestTopologyProber(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.urls = ["http://a:8080", "http://b:8080"]
+        self.health = HealthTracker("weathertime_agent", max_ejected_fraction=1)
+        self.balancer = SimpleNamespace(health=self.health)
+        self.circuit = CircuitBreaker("weathertime_agent", failure_threshold=2)
+        self.client = Client(
+            {
+                **card("http://a:8080"),
+                "http://a:8080/healthz": Response(200, {"status": "ok"}),
+                **card("http://b:8080"),
+            }
+        )
+
+        async def resolve(name):
+            return self.urls
+
+        self.prober = TopologyProber(
+            MASTER,
+            self.client,
+            resolve=resolve,
+            balancer=lambda name: self.balancer,
+            breaker=lambda name: self.circuit,
+        )
+
+    async def test_probes_card_and_ping(self):
+        await self.prober.probe_once()
+        self.assertEqual(self.prober.names, ["weathertime_agent"])
+        self.assertIn("http://a:8080/healthz", self.client.urls)
+        agent = self.prober.topology()["agents"]["weathertime_agent"]
+        self.assertTrue(agent["up"])
+        self.assertEqual(agent["breaker"]["state"], breaker.CLOSED)
+        a, b = agent["endpoints"]
+        self.assertEqual(a["name"], "weathertime_agent")
+        self.assertEqual(a["availability"], 1.0)
+        # No /healthz route is not a failure.
+        self.assertTrue(b["up"])
+        self.assertFalse(a["balancer"]["ejected"])
+
+    async def test_failed_checks_eject_and_open(self):
+        self.client.responses = card("http://b:8080")
+        await self.prober.probe_once()
+        await self.prober.probe_once()
+        agent = self.prober.topology()["agents"]["weathertime_agent"]
+        a, b = agent["endpoints"]
+        self.assertFalse(a["up"])
+        self.assertEqual(a["consecutive_failures"], 2)
+        self.assertIn("ConnectionError", a["last_error"])
+        self.assertTrue(a["balancer"]["ejected"])
+        self.assertFalse(b["balancer"]["ejected"])
+        self.assertEqual(self.circuit.state, breaker.CLOSED)
+
+        self.client.responses = {}
+        await self.prober.probe_once()
+        await self.prober.probe_once()
+        self.assertEqual(self.circuit.state, breaker.OPEN)
+        self.assertFalse(self.prober.topology()["agents"]["weathertime_agent"]["up"])
+
+        self.client.responses = card("http://a:8080")
+        await self.prober.probe_once()
+        self.assertTrue(self.circuit.available())
+
+    async def test_forgets_removed_replicas(self):
+        await self.prober.probe_once()
+        self.urls = ["http://b:8080"]
+        await self.prober.probe_once()
+        endpoints = self.prober.topology()["agents"]["weathertime_agent"]["endpoints"]
+        self.assertEqual([e["url"] for e in endpoints], ["http://b:8080"])
+        self.assertEqual(list(self.health.endpoints), ["http://b:8080"])
+
+
+if __name__ == "__main__":
+    unittest.main()
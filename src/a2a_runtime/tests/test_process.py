@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.process import process_stats  # noqa: E402
+
+
+class TestProcess(unittest.TestCase):
+
+    def test_reports_own_process(self):
+        stats = process_stats()
+        self.assertEqual(stats["pid"], os.getpid())
+        self.assertGreater(stats["rss_bytes"], 0)
+        self.assertGreaterEqual(stats["threads"], 1)
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc")
+    def test_counts_open_sockets(self):
+        import socket
+
+        before = process_stats()
+        with socket.socket():
+            during = process_stats()
+        self.assertEqual(during["sockets"], before["sockets"] + 1)
+        self.assertEqual(during["open_fds"], before["open_fds"] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
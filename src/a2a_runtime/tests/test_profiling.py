@@ -0,0 +1,88 @@
+import asyncio
+import collections
+import marshal
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import profiling  # noqa: E402
+
+
+def blocking_handler(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_captures_the_stack_of_a_blocking_callback(self):
+        monitor = profiling.LoopMonitor(interval=0.02, slow_threshold=0.05)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+            blocking_handler(0.3)
+            await asyncio.sleep(0.1)
+        finally:
+            monitor.stop()
+        report = monitor.to_dict()
+        self.assertGreaterEqual(report["stalls"], 1)
+        self.assertGreaterEqual(report["max_lag_s"], 0.2)
+        stall = report["recent_stalls"][0]
+        self.assertIn("blocking_handler", "\n".join(stall["stack"]))
+
+    async def test_quiet_loop_has_no_stalls(self):
+        monitor = profiling.LoopMonitor(interval=0.02, slow_threshold=0.1)
+        monitor.start()
+        await asyncio.sleep(0.15)
+        monitor.stop()
+        self.assertEqual(monitor.stalls, 0)
+        self.assertLess(monitor.max_lag, 0.1)
+
+
+class TestProfilers(unittest.IsolatedAsyncioTestCase):
+
+    def test_sample_stacks_renders_collapsed_stacks(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,), name="spinner")
+        worker.start()
+        try:
+            samples = profiling.sample_stacks(0.2, 0.005, {worker.ident})
+        finally:
+            stop.set()
+            worker.join()
+        # The spinner holds the GIL, so a loaded machine gets few samples.
+        self.assertGreater(sum(samples.values()), 0)
+        lines = profiling.collapse_stacks(samples).splitlines()
+        stack, _, count = lines[0].rpartition(" ")
+        self.assertTrue(stack.startswith("spinner;"))
+        self.assertIn("spin (test_profiling.py:", stack)
+        self.assertGreater(int(count), 0)
+
+    def test_collapse_stacks_orders_by_count(self):
+        samples = collections.Counter({"main;a": 1, "main;b": 3})
+        self.assertEqual(profiling.collapse_stacks(samples), "main;b 3\nmain;a 1\n")
+
+    async def test_profile_loop(self):
+        async def busy():
+            await asyncio.sleep(0.01)
+            blocking_handler(0.02)
+
+        task = asyncio.create_task(busy())
+        profiler = await profiling.profile_loop(0.1)
+        await task
+        self.assertIn("blocking_handler", profiling.profile_text(profiler))
+        stats = marshal.loads(profiling.profile_dump(profiler))
+        self.assertIn("blocking_handler", {name for _, _, name in stats})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.stores import MemoryStore  # noqa: E402
+
+try:
+    import httpx
+    from a2a.types import PushNotificationConfig, Task, TaskState, TaskStatus
+
+    from a2a_runtime.push import PushNotifier, check_webhook
+    from a2a_runtime.task_store import SharedPushConfigStore
+except ImportError:
+    PushNotifier = None
+
+
+def task(state):
+    return Task(id="t1", context_id="c1", status=TaskStatus(state=state))
+
+
+@unittest.skipIf(PushNotifier is None, "needs a2a-sdk")
+class TestCheckWebhook(unittest.IsolatedAsyncioTestCase):
+
+    async def test_refuses_internal_targets(self):
+        for url in (
+            "ftp://8.8.8.8/hook",
+            "http:///hook",
+            "http://127.0.0.1:8080/hook",
+            "http://10.0.0.5/hook",
+            "http://169.254.169.254/latest/meta-data",
+            "http://[::1]/hook",
+        ):
+            with self.subTest(url=url), self.assertRaises(ValueError):
+                await check_webhook(url)
+        await check_webhook("https://8.8.8.8/hook")
+
+    async def test_allowed_hosts(self):
+        allowed = ["127.0.0.1", "*.example.com"]
+        await check_webhook("http://127.0.0.1:9099/hook", allowed)
+        await check_webhook("https://hooks.example.com/a2a", allowed)
+        with self.assertRaises(ValueError):
+            await check_webhook("https://8.8.8.8/hook", allowed)
+
+
+@unittest.skipIf(PushNotifier is None, "needs a2a-sdk")
+class TestPushNotifier(unittest.IsolatedAsyncioTestCase):
+
+    async def test_sends_in_the_background_to_allowed_webhooks(self):
+        release = asyncio.Event()
+        posted = []
+
+        async def handler(request):
+            await release.wait()
+            posted.append(str(request.url))
+            return httpx.Response(200)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        configs = SharedPushConfigStore(MemoryStore())
+        for config_id, url in (
+            ("public", "https://8.8.8.8/hook"),
+            ("internal", "http://10.0.0.5/hook"),
+        ):
+            await configs.set_info("t1", PushNotificationConfig(id=config_id, url=url))
+        notifier = PushNotifier(client, configs)
+        # Returns while the webhook is still answering.
+        await asyncio.wait_for(notifier.send_notification(task(TaskState.completed)), 1)
+        self.assertEqual(posted, [])
+        release.set()
+        await notifier.close()
+        await client.aclose()
+        self.assertEqual(posted, ["https://8.8.8.8/hook"])
+
+    async def test_notifies_each_state_once(self):
+        posted = []
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: posted.append(request) or httpx.Response(200)
+            )
+        )
+        configs = SharedPushConfigStore(MemoryStore())
+        await configs.set_info("t1", PushNotificationConfig(url="https://8.8.8.8/"))
+        notifier = PushNotifier(client, configs)
+        for state in (TaskState.working, TaskState.completed, TaskState.completed):
+            await notifier.send_notification(task(state))
+        await notifier.close()
+        await client.aclose()
+        self.assertEqual(len(posted), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.registry import AgentRegistry, static_url  # noqa: E402
+from a2a_runtime.stores import MemoryStore  # noqa: E402
+
+
+class TestRegistry(unittest.IsolatedAsyncioTestCase):
+
+    def test_static_url_from_port_plan_and_env(self):
+        self.assertEqual(static_url("weathertime_agent"), "http://127.0.0.1:8084")
+        env = {"A2A_AGENT_URL_WEATHERTIME_AGENT": "http://weather:80"}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(static_url("weathertime_agent"), "http://weather:80")
+        with self.assertRaises(KeyError):
+            static_url("unknown_agent")
+
+    async def test_endpoints_fall_back_to_static_url(self):
+        registry = AgentRegistry(MemoryStore())
+        self.assertEqual(
+            await registry.endpoints("helloworld_agent"), ["http://127.0.0.1:8083"]
+        )
+        self.assertEqual(await AgentRegistry(None).endpoints("unknown_agent"), [])
+
+    async def test_only_ready_replicas_are_returned(self):
+        registry = AgentRegistry(MemoryStore())
+        await registry.register("helloworld_agent", "http://b:8083", {"name": "hw"})
+        await registry.register("helloworld_agent", "http://a:8083")
+        await registry.register("helloworld_agent", "http://c:8083", ready=False)
+        await registry.register("helloworld_agent_v2", "http://d:8083")
+        self.assertEqual(
+            await registry.endpoints("helloworld_agent"),
+            ["http://a:8083", "http://b:8083"],
+        )
+        entries = await registry.entries("helloworld_agent")
+        self.assertIn({"name": "hw"}, [e["card"] for e in entries])
+
+    async def test_registrations_expire(self):
+        registry = AgentRegistry(MemoryStore(), ttl=0.01)
+        await registry.register("rand_agent", "http://a:8087")
+        await asyncio.sleep(0.02)
+        self.assertEqual(await registry.entries("rand_agent"), [])
+
+    async def test_heartbeat_deregisters_when_cancelled(self):
+        registry = AgentRegistry(MemoryStore(), ttl=30)
+        task = asyncio.create_task(
+            registry.heartbeat("rand_agent", "http://a:8087", None, lambda: True)
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(len(await registry.entries("rand_agent")), 1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.assertEqual(await registry.entries("rand_agent"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import routing_eval  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+SPECS = [
+    (
+        "poly-python/agents/poly_master/routing_eval.json",
+        ["primecheck_agent", "primegenerator_agent", "rand_agent"],
+    ),
+    (
+        "src/agents/a2a_master_agent/routing_eval.json",
+        ["events_agent", "helloworld_agent", "weathertime_agent"],
+    ),
+]
+
+
+def result(variant, correct, latency_ms, llm_calls=1, route=("rand_agent",)):
+    return {
+        "variant": variant,
+        "prompt": "Give me a random number",
+        "expected": ["rand_agent"],
+        "route": list(route),
+        "correct": correct,
+        "latency_ms": latency_ms,
+        "llm_calls": llm_calls,
+        "prompt_tokens": 300,
+        "error": None,
+    }
+
+
+class TestRoutingEval(unittest.TestCase):
+
+    def test_shipped_specs_name_real_sub_agents(self):
+        for path, sub_agents in SPECS:
+            with self.subTest(path=path):
+                spec = routing_eval.load_spec(os.path.join(ROOT, path))
+                routing_eval.check_routes(spec, sub_agents)
+                self.assertIn("baseline", spec["variants"])
+
+    def test_load_spec_rejects_cases_without_route(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump({"cases": [{"prompt": "hi"}]}, f)
+            f.flush()
+            with self.assertRaises(ValueError):
+                routing_eval.load_spec(f.name)
+
+    def test_check_routes_rejects_unknown_agents(self):
+        spec = {"stubs": {}, "cases": [{"prompt": "hi", "route": ["nope_agent"]}]}
+        with self.assertRaisesRegex(ValueError, "nope_agent"):
+            routing_eval.check_routes(spec, ["rand_agent"])
+
+    def test_observed_route(self):
+        authors = ["master_agent", "rand_agent", "rand_agent", "primecheck_agent"]
+        self.assertEqual(
+            routing_eval.observed_route(authors, "master_agent"),
+            ["rand_agent", "primecheck_agent"],
+        )
+        self.assertEqual(
+            routing_eval.observed_route(["master_agent"], "master_agent"), []
+        )
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(routing_eval.percentile(values, 50), 50)
+        self.assertEqual(routing_eval.percentile(values, 95), 95)
+        self.assertEqual(routing_eval.percentile([7.0], 95), 7.0)
+        self.assertEqual(routing_eval.percentile([], 50), 0.0)
+
+    def test_summarize_and_report(self):
+        results = [
+            result("baseline", True, 900, llm_calls=2),
+            result("baseline", False, 1100, llm_calls=2, route=()),
+            result("lite", True, 400),
+            result("lite", True, 500),
+        ]
+        summary = routing_eval.summarize(results)
+        self.assertEqual(summary["baseline"]["accuracy"], 0.5)
+        self.assertEqual(summary["baseline"]["llm_calls"], 2)
+        self.assertEqual(summary["lite"]["accuracy"], 1.0)
+        self.assertEqual(summary["lite"]["p95_ms"], 500)
+        report = routing_eval.format_report(summary, results)
+        self.assertIn("Misrouted:", report)
+        self.assertIn("(master), want rand_agent", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
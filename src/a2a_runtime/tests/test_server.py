@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import server  # noqa: E402
+
+try:
+    from google.adk.agents import Agent
+except ImportError:
+    Agent = None
+
+
+def route_paths(app):
+    return {getattr(route, "path", None) for route in app.routes}
+
+
+class TestDebugEndpoints(unittest.TestCase):
+
+    def test_off_by_default(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertFalse(server.debug_endpoints_enabled())
+        with mock.patch.dict(os.environ, {"A2A_DEBUG_ENDPOINTS": "0"}):
+            self.assertFalse(server.debug_endpoints_enabled())
+        with mock.patch.dict(os.environ, {"A2A_DEBUG_ENDPOINTS": "1"}):
+            self.assertTrue(server.debug_endpoints_enabled())
+
+    @unittest.skipIf(Agent is None, "needs google-adk")
+    def test_routes_follow_the_setting(self):
+        agent = Agent(name="debug_agent", model="gemini-2.0-flash")
+        for value, expected in (("0", False), ("1", True)):
+            with self.subTest(A2A_DEBUG_ENDPOINTS=value), mock.patch.dict(
+                os.environ, {"A2A_DEBUG_ENDPOINTS": value}
+            ):
+                paths = route_paths(server.build_app(agent, port=8080))
+                self.assertIn("/healthz", paths)
+                self.assertEqual("/debug/sessions" in paths, expected)
+                self.assertEqual("/debug/loop" in paths, expected)
+                self.assertEqual("/debug/profile" in paths, expected)
+
+
+class TestAdmission(unittest.TestCase):
+
+    @unittest.skipIf(Agent is None, "needs google-adk")
+    def test_extra_post_routes_are_admitted_with_deadlines(self):
+        from starlette.routing import Route
+
+        from a2a_runtime.admission import AdmissionMiddleware
+        from a2a_runtime.deadline import DeadlineMiddleware
+
+        async def bulk(request):
+            pass
+
+        agent = Agent(name="bulk_agent", model="gemini-2.0-flash")
+        app = server.build_app(
+            agent, port=8080, routes=[Route("/bulk", bulk, methods=["POST"])]
+        )
+        for cls in (AdmissionMiddleware, DeadlineMiddleware):
+            (middleware,) = [m for m in app.user_middleware if m.cls is cls]
+            self.assertEqual(middleware.kwargs["paths"], ("/", "/bulk"))
+
+
+def blocking_tool(city: str) -> dict:
+    """Looks up a city."""
+    return {"city": city}
+
+
+class TestOffload(unittest.TestCase):
+
+    @unittest.skipIf(Agent is None, "needs google-adk")
+    def test_one_tree_serves_everything(self):
+        agent = Agent(name="root", model="gemini-2.0-flash", tools=[blocking_tool])
+        runner = mock.Mock(wraps=server.build_runner)
+        prober = mock.Mock(wraps=server.TopologyProber)
+        with mock.patch.dict(os.environ, {"A2A_TOOL_OFFLOAD": "thread"}), mock.patch(
+            "a2a_runtime.server.build_runner", runner
+        ), mock.patch("a2a_runtime.server.TopologyProber", prober):
+            server.build_app(agent, port=8080)
+        served = runner.call_args.args[0]
+        self.assertIsNot(served, agent)
+        self.assertIs(prober.call_args.args[0], served)
+        self.assertIs(agent.tools[0], blocking_tool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.stores import MemoryStore  # noqa: E402
+
+try:
+    from google.adk.events.event import Event
+    from google.adk.events.event_actions import EventActions
+
+    from a2a_runtime.session_service import (
+        BoundedSessionService,
+        SharedSessionService,
+    )
+except ImportError:
+    BoundedSessionService = SharedSessionService = None
+
+
+class SlowStore(MemoryStore):
+    """Yields on every call, like a store across the network."""
+
+    async def get(self, key):
+        await asyncio.sleep(0)
+        return await super().get(key)
+
+    async def set(self, key, value, ttl=None):
+        await asyncio.sleep(0)
+        await super().set(key, value, ttl)
+
+    async def append(self, key, value, ttl=None):
+        await asyncio.sleep(0)
+        return await super().append(key, value, ttl)
+
+
+@unittest.skipIf(SharedSessionService is None, "needs google-adk")
+class TestSessionStats(unittest.TestCase):
+
+    def test_stats_count_all_but_sample_few(self):
+        async def scenario(service):
+            for user in ("u1", "u2", "u3"):
+                await service.create_session(app_name="app", user_id=user)
+            return await service.stats(limit=2)
+
+        for service in (
+            BoundedSessionService(),
+            SharedSessionService(MemoryStore()),
+        ):
+            with self.subTest(service=type(service).__name__):
+                count, sample = asyncio.run(scenario(service))
+                self.assertEqual(count, 3)
+                self.assertEqual(len(sample), 2)
+                self.assertEqual(sample[0]["events"], 0)
+
+
+@unittest.skipIf(BoundedSessionService is None, "needs google-adk")
+class TestBoundedSessionService(unittest.TestCase):
+
+    def test_append_to_an_evicted_session_does_not_track_it(self):
+        async def scenario():
+            service = BoundedSessionService(max_sessions=1)
+            old = await service.create_session(app_name="app", user_id="u1")
+            await service.create_session(app_name="app", user_id="u2")
+            await service.append_event(old, Event(author="user"))
+            return service
+
+        service = asyncio.run(scenario())
+        self.assertEqual([key[1] for key in service._access], ["u2"])
+
+
+@unittest.skipIf(SharedSessionService is None, "needs google-adk")
+class TestSharedSessionService(unittest.TestCase):
+
+    def test_replicas_do_not_lose_each_others_events(self):
+        async def scenario():
+            store = SlowStore()
+            replicas = [SharedSessionService(store), SharedSessionService(store)]
+            created = await replicas[0].create_session(
+                app_name="app", user_id="u1", state={"start": 1}
+            )
+
+            async def append(i):
+                replica = replicas[i % 2]
+                session = await replica.get_session(
+                    app_name="app", user_id="u1", session_id=created.id
+                )
+                await replica.append_event(
+                    session,
+                    Event(
+                        author="user",
+                        invocation_id=f"inv{i}",
+                        actions=EventActions(state_delta={f"k{i}": i, "temp:x": i}),
+                    ),
+                )
+
+            await asyncio.gather(*(append(i) for i in range(10)))
+            return await replicas[1].get_session(
+                app_name="app", user_id="u1", session_id=created.id
+            )
+
+        session = asyncio.run(scenario())
+        self.assertEqual(
+            sorted(event.invocation_id for event in session.events),
+            sorted(f"inv{i}" for i in range(10)),
+        )
+        self.assertEqual(session.state, {"start": 1, **{f"k{i}": i for i in range(10)}})
+
+    def test_delete_drops_the_events(self):
+        async def scenario():
+            store = MemoryStore()
+            service = SharedSessionService(store)
+            session = await service.create_session(app_name="app", user_id="u1")
+            await service.append_event(session, Event(author="user"))
+            await service.delete_session(
+                app_name="app", user_id="u1", session_id=session.id
+            )
+            return await store.keys("")
+
+        self.assertEqual(asyncio.run(scenario()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
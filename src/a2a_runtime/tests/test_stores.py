@@ -0,0 +1,246 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.stores import (  # noqa: E402
+    KeyValueStore,
+    MemoryStore,
+    RedisStore,
+    SQLiteStore,
+    StoreError,
+    dumps,
+    loads,
+    open_store,
+    pack,
+    unpack,
+)
+
+
+async def _serve_resp(reader, writer, data, delay=0.0, max_commands=None):
+    """Tiny RESP server understanding the commands RedisStore sends.
+
+    Replies after ``delay`` seconds, and hangs up after ``max_commands``.
+    """
+    served = 0
+    while max_commands is None or served < max_commands:
+        served += 1
+        line = await reader.readline()
+        if not line:
+            break
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        command = args[0].upper()
+        if command == b"SET":
+            data[args[1]] = args[2]
+            reply = b"+OK\r\n"
+        elif command == b"GET":
+            value = data.get(args[1])
+            reply = (
+                b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            )
+        elif command == b"RPUSH":
+            data.setdefault(args[1], []).append(args[2])
+            reply = b":%d\r\n" % len(data[args[1]])
+        elif command in (b"PEXPIRE", b"PERSIST"):
+            reply = b":1\r\n"
+        elif command == b"LRANGE":
+            values = data.get(args[1], [])
+            reply = b"*%d\r\n" % len(values) + b"".join(
+                b"$%d\r\n%s\r\n" % (len(v), v) for v in values
+            )
+        elif command == b"DEL":
+            reply = b":%d\r\n" % (data.pop(args[1], None) is not None)
+        elif command == b"SCAN":
+            prefix = args[3].rstrip(b"*")
+            keys = [k for k in data if k.startswith(prefix)]
+            reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(
+                b"$%d\r\n%s\r\n" % (len(k), k) for k in keys
+            )
+        else:
+            reply = b"-ERR unknown command\r\n"
+        await asyncio.sleep(delay)
+        writer.write(reply)
+        await writer.drain()
+    writer.close()
+
+
+class StoreContract:
+    """Behaviour every backend must share."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def test_set_get_delete(self):
+        async def scenario():
+            store = await self.make_store()
+            await store.set("task:1", b"one")
+            self.assertEqual(await store.get("task:1"), b"one")
+            await store.delete("task:1")
+            self.assertIsNone(await store.get("task:1"))
+            await store.close()
+
+        asyncio.run(scenario())
+
+    def test_keys_by_prefix(self):
+        async def scenario():
+            store = await self.make_store()
+            await store.set("session:app:u1:a", b"1")
+            await store.set("session:app:u2:b", b"2")
+            await store.set("task:x", b"3")
+            keys = sorted(await store.keys("session:app:"))
+            self.assertEqual(keys, ["session:app:u1:a", "session:app:u2:b"])
+            await store.close()
+
+        asyncio.run(scenario())
+
+    def test_append_keeps_every_value(self):
+        async def scenario():
+            store = await self.make_store()
+            await asyncio.gather(
+                *(store.append("events:s1", b"%d" % i, ttl=60) for i in range(5))
+            )
+            self.assertEqual(await store.append("events:s1", b"last"), 6)
+            values = await store.get_list("events:s1")
+            self.assertEqual(sorted(values[:5]), [b"0", b"1", b"2", b"3", b"4"])
+            self.assertEqual(values[5], b"last")
+            self.assertEqual(await store.keys("events:"), ["events:s1"])
+            await store.delete("events:s1")
+            self.assertEqual(await store.get_list("events:s1"), [])
+            await store.close()
+
+        asyncio.run(scenario())
+
+
+class TestMemoryStore(StoreContract, unittest.TestCase):
+
+    async def make_store(self):
+        return MemoryStore()
+
+    def test_ttl_eviction(self):
+        async def scenario():
+            store = MemoryStore()
+            await store.set("a", b"1", ttl=0.01)
+            await store.set("b", b"2", ttl=0.01)
+            await store.append("c", b"3", ttl=0.01)
+            await asyncio.sleep(0.02)
+            self.assertIsNone(await store.get("a"))
+            self.assertEqual(await store.purge_expired(), 2)
+            self.assertEqual(await store.get_list("c"), [])
+            self.assertEqual(await store.keys(""), [])
+
+        asyncio.run(scenario())
+
+
+class TestSQLiteStore(StoreContract, unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "a2a.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    async def make_store(self):
+        return SQLiteStore(self.path)
+
+    def test_ttl_eviction_and_sharing(self):
+        async def scenario():
+            writer, reader = SQLiteStore(self.path), SQLiteStore(self.path)
+            await writer.set("shared", b"yes")
+            await writer.set("short", b"1", ttl=0.01)
+            await writer.append("list", b"a", ttl=0.01)
+            await reader.append("list", b"b", ttl=0.01)
+            self.assertEqual(await reader.get("shared"), b"yes")
+            self.assertEqual(await writer.get_list("list"), [b"a", b"b"])
+            await asyncio.sleep(0.02)
+            self.assertIsNone(await reader.get("short"))
+            self.assertEqual(await reader.get_list("list"), [])
+            self.assertEqual(await writer.purge_expired(), 2)
+            self.assertEqual(await writer.append("list", b"c"), 1)
+            await writer.close()
+            await reader.close()
+
+        asyncio.run(scenario())
+
+    def test_prefix_is_not_a_pattern(self):
+        async def scenario():
+            store = SQLiteStore(self.path)
+            await store.set("a_b", b"1")
+            await store.set("axb", b"2")
+            self.assertEqual(await store.keys("a_"), ["a_b"])
+            await store.close()
+
+        asyncio.run(scenario())
+
+
+class TestRedisStore(StoreContract, unittest.TestCase):
+
+    async def make_store(self, **kwargs):
+        self.data = {}
+        server = await asyncio.start_server(
+            lambda r, w: _serve_resp(r, w, self.data, **kwargs), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        return RedisStore(port=port)
+
+    def test_cancelled_command_does_not_leak_its_reply(self):
+        async def scenario():
+            store = await self.make_store(delay=0.05)
+            await store.set("a", b"AAA")
+            await store.set("b", b"BBB")
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(store.get("a"), 0.01)
+            self.assertEqual(await store.get("b"), b"BBB")
+            await store.close()
+
+        asyncio.run(scenario())
+
+    def test_reconnects_after_server_hangs_up(self):
+        async def scenario():
+            store = await self.make_store(max_commands=1)
+            await store.set("a", b"AAA")
+            # The server hung up after SET, so GET must reconnect.
+            self.assertEqual(await store.get("a"), b"AAA")
+            await store.close()
+
+        asyncio.run(scenario())
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_pack_compresses_large_values(self):
+        payload = b'{"history":' + b'"hello world",' * 200 + b"0}"
+        packed = pack(payload)
+        self.assertLess(len(packed), len(payload))
+        self.assertEqual(unpack(packed), payload)
+
+    def test_dumps_roundtrip(self):
+        value = {"a": [1, 2, 3], "b": "x" * 1000}
+        self.assertEqual(loads(dumps(value)), value)
+
+    def test_incomplete_store_fails_on_creation(self):
+        class GetOnly(KeyValueStore):
+            async def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+    def test_open_store(self):
+        self.assertIsInstance(open_store("memory://"), MemoryStore)
+        redis = open_store("redis://:secret@cache:6380/2")
+        self.assertEqual((redis._host, redis._port, redis._db), ("cache", 6380, 2))
+        self.assertEqual(redis._password, "secret")
+        with self.assertRaises(StoreError):
+            open_store("mongodb://localhost")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime import usage  # noqa: E402
+from a2a_runtime.usage import RequestUsage, Usage  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestUsage(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.request = RequestUsage(clock=self.clock)
+        self.addCleanup(usage.reset_usage, usage.set_usage(self.request))
+        usage.token_prices.cache_clear()
+        self.addCleanup(usage.token_prices.cache_clear)
+
+    def test_records_model_calls_per_agent(self):
+        usage.record_model_call("master", prompt=100, completion=20, cached=40)
+        usage.record_model_call("master", prompt=50, completion=10)
+        report = self.request.to_dict()
+        self.assertEqual(report["agents"]["master"]["prompt_tokens"], 150)
+        self.assertEqual(report["agents"]["master"]["cached_tokens"], 40)
+        self.assertEqual(report["total"]["llm_calls"], 2)
+        self.assertNotIn("cost_usd", report["total"])
+
+    def test_hops_add_to_total_and_keep_their_paths(self):
+        usage.record_model_call("master", prompt=100, completion=20)
+        remote = {
+            "total": {"prompt_tokens": 30, "completion_tokens": 5, "llm_calls": 2},
+            "hops": {"prime": {"prompt_tokens": 10, "completion_tokens": 1}},
+        }
+        usage.record_hop("weather", remote, task_id="t1")
+        # The same task reported twice, e.g. by streaming updates.
+        usage.record_hop("weather", remote, task_id="t1")
+        report = self.request.to_dict()
+        self.assertEqual(report["hops"]["weather"]["prompt_tokens"], 30)
+        self.assertEqual(report["hops"]["weather/prime"]["prompt_tokens"], 10)
+        self.assertEqual(report["total"]["prompt_tokens"], 130)
+        self.assertEqual(report["total"]["llm_calls"], 3)
+
+    def test_agent_time(self):
+        self.request.agent_started("inv", "master")
+        self.clock.now += 2.5
+        self.assertEqual(self.request.agent_finished("inv", "master"), 2.5)
+        self.assertIsNone(self.request.agent_finished("inv", "master"))
+        self.assertEqual(self.request.to_dict()["total"]["seconds"], 2.5)
+
+    def test_cost_uses_cached_price(self):
+        os.environ["A2A_TOKEN_PRICES"] = "prompt=1,completion=10,cached=0.25"
+        self.addCleanup(os.environ.pop, "A2A_TOKEN_PRICES")
+        cost = Usage(
+            prompt_tokens=1_000_000, completion_tokens=100_000, cached_tokens=400_000
+        ).cost()
+        self.assertAlmostEqual(cost, 0.6 + 0.1 + 1.0)
+
+    def test_metrics_without_a_request(self):
+        self.addCleanup(usage.reset_usage, usage.set_usage(None))
+        before = usage._LLM_TOKENS.get(agent="adk_web", kind="prompt")
+        usage.record_model_call("adk_web", prompt=7, completion=1)
+        after = usage._LLM_TOKENS.get(agent="adk_web", kind="prompt")
+        self.assertEqual(after - before, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from a2a_runtime.warmup import (  # noqa: E402
+    WarmupState,
+    iter_agents,
+    resolve_remote_cards,
+)
+
+
+class FakeRemoteAgent:
+
+    def __init__(self, name, failures=0):
+        self.name = name
+        self.sub_agents = []
+        self.failures = failures
+
+    async def _ensure_resolved(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection refused")
+
+
+class FakeMasterAgent:
+
+    def __init__(self, sub_agents):
+        self.name = "master_agent"
+        self.sub_agents = sub_agents
+
+
+class TestWarmup(unittest.TestCase):
+
+    def test_iter_agents_walks_tree(self):
+        master = FakeMasterAgent([FakeRemoteAgent("a"), FakeRemoteAgent("b")])
+        names = [agent.name for agent in iter_agents(master)]
+        self.assertEqual(names, ["master_agent", "a", "b"])
+
+    def test_resolve_remote_cards_retries(self):
+        master = FakeMasterAgent([FakeRemoteAgent("a", failures=2)])
+        state = WarmupState()
+        asyncio.run(resolve_remote_cards(master, state, attempts=3, delay=0))
+        self.assertEqual(state.remotes["a"]["status"], "resolved")
+        self.assertEqual(state.remotes["a"]["attempts"], 3)
+
+    def test_resolve_remote_cards_gives_up(self):
+        master = FakeMasterAgent([FakeRemoteAgent("a", failures=5)])
+        state = WarmupState()
+        asyncio.run(resolve_remote_cards(master, state, attempts=2, delay=0))
+        self.assertEqual(state.remotes["a"]["status"], "unresolved")
+        self.assertFalse(state.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
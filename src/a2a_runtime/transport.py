@@ -0,0 +1,358 @@
+"""This module defines the httpx transports used for calls to remote agents.
+
+Each transport wraps an inner transport, so behaviours compose into a chain
+for every ``RemoteA2aAgent`` built by ``a2a_runtime.remote``.
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Awaitable, Callable, Optional, Sequence, Union
+
+import httpx
+
+from a2a_runtime.admission import AdmissionController
+from a2a_runtime.breaker import CircuitBreaker
+from a2a_runtime.deadline import (
+    DEADLINE_HEADER,
+    format_header,
+    record_expired,
+    remaining,
+)
+from a2a_runtime.health import HealthTracker
+from a2a_runtime.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_HEDGES = REGISTRY.counter(
+    "a2a_hedged_requests_total", "Hedged calls sent to a replica.", ["downstream"]
+)
+_HEDGE_WINS = REGISTRY.counter(
+    "a2a_hedge_wins_total", "Hedged calls that answered first.", ["downstream"]
+)
+
+
+class ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that runs a callback once the body is closed.
+
+    Streaming (SSE) responses are consumed after ``handle_async_request``
+    returns, so per-call bookkeeping must wait for the body to close.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable) -> None:
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                on_close, self._on_close = self._on_close, None
+                on_close()
+
+
+def with_on_close(response: httpx.Response, on_close: Callable) -> httpx.Response:
+    """Returns ``response`` with ``on_close`` called when its body closes."""
+    if isinstance(response.stream, httpx.ByteStream):
+        # Already in memory (e.g. mocked); httpx never closes these streams.
+        on_close()
+        return response
+    response.stream = ReleasingStream(response.stream, on_close)
+    return response
+
+
+class LimitedTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent calls to one downstream agent."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, controller: AdmissionController
+    ) -> None:
+        self._transport = transport
+        self.controller = controller
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.controller.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.controller.release()
+            raise
+        return with_on_close(response, self.controller.release)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CircuitOpenError(httpx.ConnectError):
+    """Raised instead of calling a downstream whose circuit breaker is open."""
+
+
+class BreakerTransport(httpx.AsyncBaseTransport):
+    """Fails calls fast while the downstream's ``CircuitBreaker`` is open.
+
+    Transport errors and 502, 503 and 504 responses count as failures.
+    Cancelled calls, such as those cut short by a deadline, count as neither.
+    """
+
+    FAILURE_STATUSES = frozenset({502, 503, 504})
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker
+    ) -> None:
+        self._transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{self.breaker.name} is unavailable; retry in "
+                f"{self.breaker.retry_in():.0f}s",
+                request=request,
+            )
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            self.breaker.record(None)
+            raise
+        except BaseException:
+            self.breaker.record(False)
+            raise
+        self.breaker.record(response.status_code not in self.FAILURE_STATUSES)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class DeadlineTransport(httpx.AsyncBaseTransport):
+    """Forwards the request deadline and enforces it on outgoing calls."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        left = remaining()
+        if left is None:
+            return await self._transport.handle_async_request(request)
+        if left <= 0:
+            record_expired("client")
+            raise httpx.ConnectTimeout("Deadline exceeded", request=request)
+        request.headers[DEADLINE_HEADER] = format_header(left)
+        try:
+            return await asyncio.wait_for(
+                self._transport.handle_async_request(request), left
+            )
+        except asyncio.TimeoutError:
+            record_expired("client")
+            raise httpx.ReadTimeout("Deadline exceeded", request=request) from None
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LatencyWindow:
+    """Keeps the most recent latencies to estimate a percentile."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: collections.deque = collections.deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def same_origin(url: httpx.URL, base_url: str) -> bool:
+    target = httpx.URL(base_url)
+    return (url.scheme, url.host, url.port) == (
+        target.scheme,
+        target.host,
+        target.port,
+    )
+
+
+def retarget(request: httpx.Request, base_url: str) -> httpx.Request:
+    """Copies ``request`` to the same path on another replica."""
+    target = httpx.URL(base_url)
+    url = request.url.copy_with(
+        scheme=target.scheme, host=target.host, port=target.port
+    )
+    headers = request.headers.copy()
+    headers["host"] = url.netloc.decode("ascii")
+    return httpx.Request(
+        request.method,
+        url,
+        headers=headers,
+        content=request.content,
+        extensions=request.extensions,
+    )
+
+
+class HedgingTransport(httpx.AsyncBaseTransport):
+    """Sends a second copy of slow calls to a replica; the first answer wins.
+
+    A call is hedged once it has taken longer than the ``percentile`` of
+    recent latencies, so roughly ``1 - percentile`` of calls are duplicated.
+    No call is hedged until ``min_samples`` latencies have been observed.
+    Only configure replicas for agents whose work is safe to run twice: the
+    losing copy is cancelled, but the replica may already have started it.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        name: str,
+        replicas: Union[Sequence[str], Callable[[], Sequence[str]]],
+        percentile: float = 0.95,
+        min_samples: int = 20,
+    ) -> None:
+        self._transport = transport
+        self.name = name
+        self.replicas = replicas if callable(replicas) else list(replicas)
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies = LatencyWindow()
+        self._next_replica = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.percentile)
+
+    def candidates(self, request: httpx.Request) -> list[str]:
+        """Returns the replicas other than the one ``request`` targets."""
+        replicas = self.replicas() if callable(self.replicas) else self.replicas
+        return [url for url in replicas if not same_origin(request.url, url)]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.hedge_delay()
+        candidates = self.candidates(request) if request.method == "POST" else []
+        if delay is None or not candidates:
+            return await self._timed(request)
+
+        replica = candidates[self._next_replica % len(candidates)]
+        try:
+            copy = retarget(request, replica)
+        except httpx.RequestNotRead:
+            # Streaming uploads cannot be replayed.
+            return await self._timed(request)
+
+        primary = asyncio.create_task(self._timed(request))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            _HEDGES.inc(downstream=self.name)
+            self._next_replica += 1
+            hedge = asyncio.create_task(self._timed(copy))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winners = [
+                    task
+                    for task in (primary, hedge)
+                    if task in done and task.exception() is None
+                ]
+                if winners:
+                    for extra in winners[1:]:
+                        await extra.result().aclose()
+                    if winners[0] is hedge:
+                        _HEDGE_WINS.inc(downstream=self.name)
+                    return winners[0].result()
+            # Both copies failed; report the primary's error.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        self.latencies.add(time.monotonic() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class BalancedTransport(httpx.AsyncBaseTransport):
+    """Spreads calls over the replicas of one agent by passive health.
+
+    ``resolve`` returns the replica base URLs and is consulted at most every
+    ``refresh`` seconds. ``a2a_runtime.health.HealthTracker`` picks the
+    replica for each call and ejects outliers.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        name: str,
+        resolve: Callable[[], Awaitable[list[str]]],
+        refresh: float = 5.0,
+        health: Optional[HealthTracker] = None,
+    ) -> None:
+        self._transport = transport
+        self.name = name
+        self._resolve = resolve
+        self.refresh = refresh
+        self.health = health or HealthTracker(name)
+        self._resolved_at: Optional[float] = None
+
+    @property
+    def endpoints(self) -> list[str]:
+        return list(self.health.endpoints)
+
+    async def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._resolved_at is not None and now - self._resolved_at < self.refresh:
+            return
+        self._resolved_at = now
+        try:
+            self.health.sync(await self._resolve())
+        except Exception as e:
+            # Keep routing to the last known replicas.
+            logger.warning("Could not resolve replicas of %s: %s", self.name, e)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._refresh()
+        url = self.health.choose()
+        if url is None:
+            return await self._transport.handle_async_request(request)
+        if not same_origin(request.url, url):
+            try:
+                request = retarget(request, url)
+            except httpx.RequestNotRead:
+                return await self._transport.handle_async_request(request)
+
+        self.health.start(url)
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            # Lost to a deadline or a hedge: not an error, but at least this slow.
+            self.health.finish(url, time.monotonic() - started, ok=True)
+            raise
+        except BaseException:
+            self.health.finish(url, None, ok=False)
+            raise
+        latency = time.monotonic() - started
+        ok = response.status_code < 500 and response.status_code != 429
+        return with_on_close(response, lambda: self.health.finish(url, latency, ok=ok))
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,230 @@
+"""This module accounts LLM token usage per request, per agent and per hop.
+
+``a2a_runtime.plugins.TokenUsagePlugin`` records every model response's
+``usage_metadata`` against the agent that made the call, and the time spent
+in each agent. ``a2a_runtime.executor.DeadlineAgentExecutor`` keeps a
+``RequestUsage`` per A2A request in a context variable and attaches it to the
+final task status as ``metadata["token_usage"]``::
+
+    {
+        "total": {"prompt_tokens": 812, "completion_tokens": 95, ...},
+        "agents": {"root_agent": {...}},
+        "hops": {"weathertime_agent": {...}},
+    }
+
+Masters read the same metadata from their sub-agents' tasks. ``hops`` holds
+what each sub-agent reported, and deeper delegation paths are joined with
+``/`` (``a/b`` is what ``b`` used while serving ``a``). ``total`` includes the
+hops. The same numbers feed the ``a2a_llm_*`` and ``a2a_hop_*`` metrics.
+
+``A2A_TOKEN_PRICES`` (for example ``prompt=0.30,completion=2.50,cached=0.075``,
+in USD per million tokens) adds an estimated ``cost_usd`` to each entry.
+Cached tokens are part of the prompt tokens and are charged at the cached
+price instead.
+"""
+
+import contextvars
+import dataclasses
+import functools
+import os
+import time
+from typing import Any, Optional
+
+from a2a_runtime.metrics import REGISTRY
+
+USAGE_METADATA_KEY = "token_usage"
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+_usage: contextvars.ContextVar[Optional["RequestUsage"]] = contextvars.ContextVar(
+    "a2a_usage", default=None
+)
+
+_LLM_TOKENS = REGISTRY.counter(
+    "a2a_llm_tokens_total",
+    "Tokens used by this agent's model calls.",
+    ["agent", "kind"],
+)
+_LLM_CALLS = REGISTRY.counter(
+    "a2a_llm_calls_total", "Model calls made by this agent.", ["agent"]
+)
+_HOP_TOKENS = REGISTRY.counter(
+    "a2a_hop_tokens_total", "Tokens reported by sub-agents, by path.", ["hop", "kind"]
+)
+_AGENT_SECONDS = REGISTRY.histogram(
+    "a2a_agent_duration_seconds", "Time spent running each agent.", ["agent"]
+)
+_REQUEST_TOKENS = REGISTRY.histogram(
+    "a2a_request_tokens",
+    "Tokens used per request, including sub-agents.",
+    ["agent"],
+    buckets=TOKEN_BUCKETS,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def token_prices() -> dict[str, float]:
+    """Returns USD per million tokens by kind, from ``A2A_TOKEN_PRICES``."""
+    prices = {}
+    for item in os.environ.get("A2A_TOKEN_PRICES", "").split(","):
+        if "=" in item:
+            kind, price = item.split("=", 1)
+            prices[kind.strip()] = float(price)
+    return prices
+
+
+@dataclasses.dataclass
+class Usage:
+    """Token counts and time of one agent, hop or request."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    llm_calls: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "Usage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.llm_calls += other.llm_calls
+        self.seconds += other.seconds
+
+    def cost(self) -> Optional[float]:
+        """Returns the estimated cost in USD, or None without prices."""
+        prices = token_prices()
+        if not prices:
+            return None
+        uncached = self.prompt_tokens - self.cached_tokens
+        return (
+            uncached * prices.get("prompt", 0)
+            + self.cached_tokens * prices.get("cached", prices.get("prompt", 0))
+            + self.completion_tokens * prices.get("completion", 0)
+        ) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dataclasses.asdict(self)
+        data["seconds"] = round(self.seconds, 3)
+        cost = self.cost()
+        if cost is not None:
+            data["cost_usd"] = round(cost, 6)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Usage":
+        return cls(**{f.name: data.get(f.name, 0) for f in dataclasses.fields(cls)})
+
+
+class RequestUsage:
+    """Token usage of one A2A request, by agent and by sub-agent hop."""
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self.started = clock()
+        self.agents: dict[str, Usage] = {}
+        self.hops: dict[str, Usage] = {}
+        self._running: dict[tuple[str, str], float] = {}
+        self._seen_tasks: set[str] = set()
+
+    def agent_started(self, invocation_id: str, agent: str) -> None:
+        self._running[(invocation_id, agent)] = self._clock()
+
+    def agent_finished(self, invocation_id: str, agent: str) -> Optional[float]:
+        """Returns the seconds the agent ran, if its start was seen."""
+        started = self._running.pop((invocation_id, agent), None)
+        if started is None:
+            return None
+        elapsed = self._clock() - started
+        self.agents.setdefault(agent, Usage()).seconds += elapsed
+        return elapsed
+
+    def first_report(self, task_id: str) -> bool:
+        """Returns True the first time a sub-agent task is reported."""
+        if task_id in self._seen_tasks:
+            return False
+        self._seen_tasks.add(task_id)
+        return True
+
+    def total(self) -> Usage:
+        total = Usage()
+        for usage in self.agents.values():
+            total.add(usage)
+        for path, usage in self.hops.items():
+            if "/" not in path:
+                total.add(usage)
+        total.seconds = self._clock() - self.started
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total().to_dict(),
+            "agents": {name: u.to_dict() for name, u in self.agents.items()},
+            "hops": {path: u.to_dict() for path, u in self.hops.items()},
+        }
+
+
+def set_usage(usage: RequestUsage) -> contextvars.Token:
+    return _usage.set(usage)
+
+
+def reset_usage(token: contextvars.Token) -> None:
+    _usage.reset(token)
+
+
+def current_usage() -> Optional[RequestUsage]:
+    return _usage.get()
+
+
+def record_model_call(
+    agent: str, prompt: int, completion: int, cached: int = 0
+) -> None:
+    """Records one model call of ``agent`` in the metrics and the request."""
+    _LLM_CALLS.inc(agent=agent)
+    for kind, count in (
+        ("prompt", prompt),
+        ("completion", completion),
+        ("cached", cached),
+    ):
+        if count:
+            _LLM_TOKENS.inc(count, agent=agent, kind=kind)
+    usage = _usage.get()
+    if usage is not None:
+        entry = usage.agents.setdefault(agent, Usage())
+        entry.add(Usage(prompt, completion, cached, llm_calls=1))
+
+
+def record_agent_time(agent: str, seconds: float) -> None:
+    _AGENT_SECONDS.observe(seconds, agent=agent)
+
+
+def record_hop(hop: str, report: dict[str, Any], task_id: Optional[str] = None) -> None:
+    """Records the ``token_usage`` metadata a sub-agent returned.
+
+    Args:
+        hop (str): The sub-agent's name.
+        report (dict): The sub-agent's ``token_usage`` metadata.
+        task_id (str): The sub-agent's task; a task is only counted once.
+    """
+    usage = _usage.get()
+    if usage is not None and task_id is not None and not usage.first_report(task_id):
+        return
+    paths = {hop: report.get("total", {})}
+    for path, nested in report.get("hops", {}).items():
+        paths[f"{hop}/{path}"] = nested
+    for path, data in paths.items():
+        reported = Usage.from_dict(data)
+        for kind in ("prompt", "completion", "cached"):
+            count = getattr(reported, f"{kind}_tokens")
+            if count:
+                _HOP_TOKENS.inc(count, hop=path, kind=kind)
+        if usage is not None:
+            usage.hops.setdefault(path, Usage()).add(reported)
+
+
+def finish_request(agent: str, usage: RequestUsage) -> dict[str, Any]:
+    """Records the request's total in the metrics and returns its metadata."""
+    report = usage.to_dict()
+    total = report["total"]
+    _REQUEST_TOKENS.observe(
+        total["prompt_tokens"] + total["completion_tokens"], agent=agent
+    )
+    return report
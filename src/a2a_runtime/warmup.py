@@ -0,0 +1,138 @@
+"""This module pre-warms an ADK agent tree before it serves its first request."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Tracks warm-up progress and backs the readiness endpoint."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.steps: dict[str, dict] = {}
+        self.remotes: dict[str, dict] = {}
+
+    def record(self, name: str, started: float, error: Exception = None) -> None:
+        """Records the outcome of one warm-up step."""
+        self.steps[name] = {
+            "status": "error" if error else "ok",
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        if error:
+            self.steps[name]["error"] = str(error)
+
+    def to_dict(self) -> dict:
+        """Returns the JSON body served by ``/readyz``."""
+        return {
+            "status": "ready" if self.ready else "warming",
+            "steps": self.steps,
+            "remotes": self.remotes,
+        }
+
+
+def iter_agents(agent: Any) -> Iterator[Any]:
+    """Yields ``agent`` and all of its sub-agents, depth first."""
+    yield agent
+    for sub_agent in getattr(agent, "sub_agents", None) or []:
+        yield from iter_agents(sub_agent)
+
+
+def is_remote(agent: Any) -> bool:
+    """Returns True for agents that delegate over A2A (``RemoteA2aAgent``)."""
+    return hasattr(agent, "_ensure_resolved")
+
+
+def warm_model_client(agent: Any) -> None:
+    """Resolves the model string once and creates its API client.
+
+    ``LlmAgent.canonical_model`` builds a new ``BaseLlm`` from the model string
+    on every call, so the first request would otherwise also pay for client
+    construction. Pinning the resolved instance keeps its cached client.
+    """
+    if isinstance(getattr(agent, "model", None), str) and agent.model:
+        agent.model = agent.canonical_model
+    client = getattr(agent.model, "api_client", None)
+    logger.debug("Model client for %s ready: %s", agent.name, type(client).__name__)
+
+
+async def warm_tool_schemas(agent: Any) -> int:
+    """Generates the function declarations of the agent's tools once.
+
+    Returns:
+        int: The number of tools that produced a declaration.
+    """
+    count = 0
+    for tool in await agent.canonical_tools():
+        if tool._get_declaration() is not None:
+            count += 1
+    return count
+
+
+async def warm_up_agent(root_agent: Any, state: WarmupState) -> None:
+    """Runs the local warm-up steps and marks ``state`` ready.
+
+    Failures are recorded instead of raised: the agent still serves requests,
+    it simply pays the remaining cost on the first one.
+    """
+    for agent in iter_agents(root_agent):
+        if not hasattr(agent, "canonical_model"):
+            continue
+        started = time.perf_counter()
+        try:
+            warm_model_client(agent)
+            state.record(f"{agent.name}.model_client", started)
+        except Exception as e:
+            logger.warning("Model client warm-up failed for %s: %s", agent.name, e)
+            state.record(f"{agent.name}.model_client", started, e)
+
+        started = time.perf_counter()
+        try:
+            await warm_tool_schemas(agent)
+            state.record(f"{agent.name}.tool_schemas", started)
+        except Exception as e:
+            logger.warning("Tool schema warm-up failed for %s: %s", agent.name, e)
+            state.record(f"{agent.name}.tool_schemas", started, e)
+
+    state.ready = True
+    logger.info("Agent %s is warm: %s", root_agent.name, state.steps)
+
+
+async def resolve_remote_cards(
+    root_agent: Any, state: WarmupState, attempts: int = 10, delay: float = 1.0
+) -> None:
+    """Resolves the agent cards of all remote sub-agents in the background.
+
+    Sub-agents are often started after the master, so each card is retried
+    with exponential backoff. Remote resolution does not gate readiness; a
+    remote that never resolves is resolved lazily on first use as before.
+    """
+
+    async def resolve(agent: Any) -> None:
+        state.remotes[agent.name] = {"status": "resolving"}
+        wait = delay
+        for attempt in range(1, attempts + 1):
+            started = time.perf_counter()
+            try:
+                await agent._ensure_resolved()
+                state.remotes[agent.name] = {
+                    "status": "resolved",
+                    "ms": round((time.perf_counter() - started) * 1000, 1),
+                    "attempts": attempt,
+                }
+                return
+            except Exception as e:
+                state.remotes[agent.name] = {
+                    "status": "unresolved",
+                    "attempts": attempt,
+                    "error": str(e),
+                }
+            await asyncio.sleep(wait)
+            wait = min(wait * 2, 30.0)
+        logger.warning("Could not pre-resolve remote agent %s", agent.name)
+
+    remotes = [agent for agent in iter_agents(root_agent) if is_remote(agent)]
+    await asyncio.gather(*(resolve(agent) for agent in remotes))
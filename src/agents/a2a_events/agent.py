@@ -1,9 +1,7 @@
 """This module defines a simple agent that can get events in NYC."""
 
 from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from google.adk.tools import google_search
-import uvicorn
 
 root_agent = Agent(
     name="events_agent",
@@ -15,6 +13,15 @@ root_agent = Agent(
 )
 
 if __name__ == "__main__":
-    a2a_app = to_a2a(root_agent, port=8082)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8082)
+    import os
+    import sys
+
+    # Make the shared src/a2a_runtime helpers importable when run as a script.
+    sys.path.append(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    )
+    from a2a_runtime.server import serve
+
+    # serve() binds host='0.0.0.0' to allow external access. Dashboards poll
+    # the same query, so identical concurrent requests share one search.
+    serve(root_agent, port=8082, coalesce=True)
@@ -1,7 +1,6 @@
 """This module defines a simple agent that returns a "hello world" message."""
 
 from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 
 
 def get_hello_world() -> dict:
@@ -18,8 +17,14 @@ root_agent = Agent(
 )
 
 if __name__ == "__main__":
-    import uvicorn
+    import os
+    import sys
 
-    a2a_app = to_a2a(root_agent, port=8083)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8083)
+    # Make the shared src/a2a_runtime helpers importable when run as a script.
+    sys.path.append(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    )
+    from a2a_runtime.server import serve
+
+    # serve() binds host='0.0.0.0' to allow external access.
+    serve(root_agent, port=8083)
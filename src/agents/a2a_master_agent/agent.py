@@ -1,38 +1,61 @@
-from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
-from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools import load_memory
-from google.adk.tools.tool_context import ToolContext
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 import os
-import uvicorn
+import sys
+
+from google.adk.agents.llm_agent import LlmAgent
+
+# The shared src/a2a_runtime helpers, when this folder sits in the repository.
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if os.path.isdir(os.path.join(_SRC, "a2a_runtime")) and _SRC not in sys.path:
+    sys.path.append(_SRC)
+
+try:
+    # Sub-agents are resolved by name; see a2a_runtime.registry for the port plan.
+    from a2a_runtime.remote import remote_agent
+except ImportError:
+    # adk deploy copies only this folder, so the port plan is not available:
+    # each sub-agent's URL has to be configured.
+    from google.adk.agents.remote_a2a_agent import (
+        AGENT_CARD_WELL_KNOWN_PATH,
+        RemoteA2aAgent,
+    )
+
+    def remote_agent(name: str, description: str) -> RemoteA2aAgent:
+        variable = f"A2A_AGENT_URL_{name.upper()}"
+        url = os.environ.get(variable)
+        if not url:
+            raise RuntimeError(
+                f"a2a_runtime is not importable: set {variable} to the URL of {name}"
+            )
+        return RemoteA2aAgent(
+            name=name,
+            description=description,
+            agent_card=url.split(",")[0].rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH,
+        )
 
 # master is running on 8081
 
-ev_agent = RemoteA2aAgent(
+ev_agent = remote_agent(
     name="events_agent",
     description="Events Agent",
-    agent_card=(
-        f"http://127.0.0.1:8082/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
-hw_agent = RemoteA2aAgent(
+hw_agent = remote_agent(
     name="helloworld_agent",
     description="Hello World Agent",
-    agent_card=(
-        f"http://127.0.0.1:8083/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
-wt_agent = RemoteA2aAgent(
+wt_agent = remote_agent(
     name="weathertime_agent",
     description="Weather and Time Agent",
-    agent_card=(
-        f"http://127.0.0.1:8084/{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
 )
 
+# Bulk query names served by POST /bulk, mapped to weathertime_agent's tools.
+WEATHERTIME_QUERIES = {
+    "weather": "get_weather",
+    "time": "get_current_time",
+    "sunrise": "get_sunrise_sunset_time",
+}
+
 root_agent = LlmAgent(
     name="master_agent",
     model="gemini-2.5-flash",
@@ -45,7 +68,8 @@ root_agent = LlmAgent(
 )
 
 if __name__ == "__main__":
-    a2a_app = to_a2a(root_agent, port=8081)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8081)
+    from a2a_runtime.bulk import bulk_route
+    from a2a_runtime.server import serve
 
+    # serve() binds host='0.0.0.0' to allow external access.
+    serve(root_agent, port=8081, routes=[bulk_route(wt_agent, WEATHERTIME_QUERIES)])
@@ -3,8 +3,6 @@
 import datetime
 from zoneinfo import ZoneInfo
 from google.adk.agents import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
-import uvicorn
 
 
 def get_weather(city: str) -> dict:
@@ -87,6 +85,15 @@ root_agent = Agent(
 )
 
 if __name__ == "__main__":
-    a2a_app = to_a2a(root_agent, port=8084)
-    # Use host='0.0.0.0' to allow external access.
-    uvicorn.run(a2a_app, host="0.0.0.0", port=8084)
+    import os
+    import sys
+
+    # Make the shared src/a2a_runtime helpers importable when run as a script.
+    sys.path.append(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    )
+    from a2a_runtime.server import serve
+
+    # serve() binds host='0.0.0.0' to allow external access.
+    # bulk_tools lets the master's /bulk endpoint call the tools directly.
+    serve(root_agent, port=8084, bulk_tools=True)